@@ -0,0 +1,235 @@
+"""
+Batch evaluation of many positions at once with NumPy, for labelling training positions and scoring candidate moves.
+
+A position is encoded as 91 int8 piece codes in POSITIONS order: 0 for an empty hexagon, the PIECE_TYPES number
+(1 pawn to 6 king) for a white piece and its negation for a black piece, as HexagonalChessEnv._piece_to_int.
+A batch is an (N, 91) array of encoded positions.
+
+The scores are relative to white and in Evaluate's piece values:
+- batch_scores: the material and piece-square sums, the same as Evaluate.static_score of the boards.
+- batch_mobility: the empty hexagons the knights, bishops, rooks, queens and kings can move to, white minus black.
+- batch_king_safety: the own pieces next to the kings minus the enemy pieces next to them, white minus black.
+The features are computed from precomputed hex adjacency tables: the knight leaps and king steps of Tables.py, padded
+to rectangles with an extra hexagon (index 91) off the board that is never empty, and the next hexagon of every
+hexagon in every slider direction. The features work hexagon by hexagon on (91, N) arrays.
+"""
+import numpy as np
+
+from CONST import *
+from Tables import KNIGHT_LEAPS, KING_STEPS
+from Piece import Pawn, Knight, Bishop, Rook, Queen, King
+
+OFF_BOARD = len(POSITIONS)
+# The offset of the piece codes in the rows of SCORE_TABLE, so -6 (a black king) is row 0
+CODE_OFFSET = 6
+
+def _score_table():
+    """
+    Builds the score of every piece code on every hexagon, the piece value plus its piece-square bonus.
+
+    Returns:
+        np.ndarray: An (13, 91) int32 array indexed by piece code plus CODE_OFFSET and POS_IDX index.
+    """
+    table = np.zeros((2 * CODE_OFFSET + 1, len(POSITIONS)), dtype=np.int32)
+    for piece_class in (Pawn, Knight, Bishop, Rook, Queen, King):
+        for color, sign in (('white', 1), ('black', -1)):
+            kind = piece_class.KINDS[color]
+            table[sign * kind.type_code + CODE_OFFSET] = np.add(kind.value, kind.square_scores)
+    return table
+
+def _pad(targets):
+    """
+    Pads the targets of every hexagon to the same length with OFF_BOARD.
+
+    Args:
+        targets (tuple): For each hexagon, the tuple of target indices.
+
+    Returns:
+        np.ndarray: An (91, longest) array of target indices.
+    """
+    length = max(len(hexagon_targets) for hexagon_targets in targets)
+    return np.array([tuple(hexagon_targets) + (OFF_BOARD,) * (length - len(hexagon_targets))
+                     for hexagon_targets in targets], dtype=np.intp)
+
+def _slider_levels(directions):
+    """
+    Groups the rays of every hexagon in every direction by their length, for _slider_moves.
+
+    A ray is numbered direction index * 91 + hexagon index. The ray of the next hexagon in the same direction is one
+    hexagon shorter, so the rays of one length can be counted from the rays of the length before.
+
+    Args:
+        directions (list): The (row, col) steps of the rays.
+
+    Returns:
+        list: Per length from 1 up, a tuple of the ray numbers, the ray numbers of their next hexagons and the
+              indices of their next hexagons.
+    """
+    lengths = {}
+    for direction_index, (row_step, col_step) in enumerate(directions):
+        for index, (row, col) in enumerate(POSITIONS):
+            next_index = POS_IDX.get((row + row_step, col + col_step))
+            if next_index is None:
+                continue
+            length = 1
+            while (row + (length + 1) * row_step, col + (length + 1) * col_step) in POS_IDX:
+                length += 1
+            number = direction_index * len(POSITIONS) + index
+            next_number = direction_index * len(POSITIONS) + next_index
+            lengths.setdefault(length, []).append((number, next_number, next_index))
+    return [tuple(np.array(column, dtype=np.intp) for column in zip(*lengths[length])) for length in sorted(lengths)]
+
+SCORE_TABLE = _score_table()
+HEXAGON_INDICES = np.arange(len(POSITIONS))
+KNIGHT_TARGETS = _pad(KNIGHT_LEAPS)
+KING_TARGETS = _pad(KING_STEPS)
+# The rook directions first, then the bishop directions
+SLIDER_LEVELS = _slider_levels(ROOK_DIRECTIONS + BISHOP_DIRECTIONS)
+# The number of positions the features are computed for at once, so the intermediate arrays stay in the cache
+CHUNK_SIZE = 2048
+
+def encode_position(hexboard):
+    """
+    Encodes the position of a board, see the module docstring.
+
+    Args:
+        hexboard (HexBoard): The board, HexBoard or BitBoard.
+
+    Returns:
+        np.ndarray: A (91,) int8 array of piece codes.
+    """
+    codes = np.zeros(len(POSITIONS), dtype=np.int8)
+    for color, sign in (('white', 1), ('black', -1)):
+        for location in hexboard.get_pieces_locations(color):
+            codes[POS_IDX[location]] = sign * hexboard.get_piece(*location).kind.type_code
+    return codes
+
+def encode_positions(hexboards):
+    """
+    Encodes the positions of boards into a batch.
+
+    Args:
+        hexboards (iterable): The boards.
+
+    Returns:
+        np.ndarray: An (N, 91) int8 array of piece codes.
+    """
+    return np.array([encode_position(hexboard) for hexboard in hexboards], dtype=np.int8).reshape(-1, len(POSITIONS))
+
+def batch_scores(positions):
+    """
+    Returns the material and piece-square score of every position of a batch.
+
+    Args:
+        positions (np.ndarray): An (N, 91) int8 array of encoded positions.
+
+    Returns:
+        np.ndarray: An (N,) int32 array of scores, relative to white.
+    """
+    rows = positions.astype(np.intp) + CODE_OFFSET
+    return SCORE_TABLE[rows, HEXAGON_INDICES].sum(axis=1, dtype=np.int32)
+
+def _empty_hexagons(positions):
+    """
+    Returns whether every hexagon of every position is empty, hexagon by hexagon, with a last row for OFF_BOARD that
+    is never empty. The features work on the hexagon rows, so a gather of hexagons copies contiguous rows.
+
+    Returns:
+        np.ndarray: A (92, N) int16 array of 0 and 1.
+    """
+    empty = np.zeros((OFF_BOARD + 1, len(positions)), dtype=np.int16)
+    empty[:OFF_BOARD] = positions.T == 0
+    return empty
+
+def _slider_moves(empty):
+    """
+    Returns the number of empty hexagons a rook and a bishop on every hexagon can move to.
+
+    The run of empty hexagons along a ray is the run of the ray of the next hexagon plus one if the next hexagon is
+    empty, and 0 if it is not. The rays are counted from the shortest up, see _slider_levels.
+
+    Args:
+        empty (np.ndarray): The (92, N) empty hexagons, see _empty_hexagons.
+
+    Returns:
+        tuple: The (91, N) int16 arrays of rook and bishop move counts.
+    """
+    directions = len(ROOK_DIRECTIONS) + len(BISHOP_DIRECTIONS)
+    runs = np.zeros((directions * OFF_BOARD, empty.shape[1]), dtype=np.int16)
+    for numbers, next_numbers, next_indices in SLIDER_LEVELS:
+        runs[numbers] = empty[next_indices] * (1 + runs[next_numbers])
+    runs = runs.reshape(directions, OFF_BOARD, -1)
+    rook_directions = len(ROOK_DIRECTIONS)
+    return runs[:rook_directions].sum(axis=0), runs[rook_directions:].sum(axis=0)
+
+def batch_mobility(positions):
+    """
+    Returns the mobility of every position of a batch: the number of empty hexagons the knights, bishops, rooks,
+    queens and kings can move to, with every move counted once per piece, white minus black. Pawns, captures and
+    checks are not taken into account.
+
+    Args:
+        positions (np.ndarray): An (N, 91) int8 array of encoded positions.
+
+    Returns:
+        np.ndarray: An (N,) int32 array of mobility differences.
+    """
+    if len(positions) > CHUNK_SIZE:
+        return np.concatenate([batch_mobility(positions[start:start + CHUNK_SIZE])
+                               for start in range(0, len(positions), CHUNK_SIZE)])
+    empty = _empty_hexagons(positions)
+    rook_moves, bishop_moves = _slider_moves(empty)
+    no_moves = np.zeros_like(rook_moves)
+    # The moves of every piece type on every hexagon, by PIECE_TYPES number
+    moves_by_type = np.stack((
+        no_moves,
+        no_moves,
+        empty[KNIGHT_TARGETS].sum(axis=1, dtype=np.int16),
+        bishop_moves,
+        rook_moves,
+        rook_moves + bishop_moves,
+        empty[KING_TARGETS].sum(axis=1, dtype=np.int16)
+    ))
+    codes = positions.T
+    moves = np.take_along_axis(moves_by_type, np.abs(codes).astype(np.intp)[np.newaxis], axis=0)[0]
+    return (np.sign(codes) * moves).sum(axis=0, dtype=np.int32)
+
+def batch_king_safety(positions):
+    """
+    Returns the king safety of every position of a batch: per king the number of its own pieces on the hexagons
+    next to it minus the number of enemy pieces there, white minus black.
+
+    Args:
+        positions (np.ndarray): An (N, 91) int8 array of encoded positions.
+
+    Returns:
+        np.ndarray: An (N,) int32 array of king safety differences.
+    """
+    signs = np.zeros((OFF_BOARD + 1, len(positions)), dtype=np.int16)
+    signs[:OFF_BOARD] = np.sign(positions.T)
+    # The pieces next to every hexagon, white minus black
+    neighbours = signs[KING_TARGETS].sum(axis=1, dtype=np.int32)
+    # A black king counts its own pieces negatively, and black's safety is subtracted, so both signs cancel out
+    kings = np.abs(positions.T) == King.KINDS['white'].type_code
+    return (kings * neighbours).sum(axis=0, dtype=np.int32)
+
+def evaluate_batch(positions, mobility_weight=0, king_safety_weight=0):
+    """
+    Returns the score of every position of a batch: the material and piece-square score, plus the weighted mobility
+    and king safety features if their weights are not 0.
+
+    Args:
+        positions (np.ndarray): An (N, 91) array of encoded positions, converted to int8.
+        mobility_weight (int): The score of one move of mobility (default: 0).
+        king_safety_weight (int): The score of one point of king safety (default: 0).
+
+    Returns:
+        np.ndarray: An (N,) int32 array of scores, relative to white.
+    """
+    positions = np.asarray(positions, dtype=np.int8).reshape(-1, len(POSITIONS))
+    scores = batch_scores(positions)
+    if mobility_weight:
+        scores += mobility_weight * batch_mobility(positions)
+    if king_safety_weight:
+        scores += king_safety_weight * batch_king_safety(positions)
+    return scores
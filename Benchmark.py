@@ -0,0 +1,1069 @@
+import argparse
+import multiprocessing
+import pickle
+import random
+import time
+import tracemalloc
+
+from HexBoard import HexBoard
+from BitBoard import BitBoard
+from Reference import ReferenceHexBoard
+from Perft import load_position, perft, compare_with_reference
+from Zobrist import compute_key
+from Move import packed_move
+from Evaluate import Evaluate, static_score
+import Player
+from Player import Agent
+import PuzzleStore
+from BoardPool import BoardPool
+from CONST import MOVE_LIMIT
+from Search import Search, MATE_SCORE, MAX_SEARCH_DEPTH
+from TranspositionTable import TranspositionTable
+from MoveOrdering import order_captures_first
+from EvalCache import EvalCache, PawnHashTable
+import numpy as np
+from BatchEvaluate import encode_position, batch_scores, evaluate_batch, SCORE_TABLE, CODE_OFFSET
+
+POSITIONS_TO_BENCHMARK = ["default"] + [str(puzzle) for puzzle in range(1, 13)]
+PUZZLES = [str(puzzle) for puzzle in range(1, 13)]
+
+class ScanningHexBoard(HexBoard):
+    """
+    A HexBoard that looks up pieces and kings by scanning the full grid, as before the piece index sets.
+    """
+    get_pieces_locations = ReferenceHexBoard.get_pieces_locations
+    get_king_location = ReferenceHexBoard.get_king_location
+
+    def get_pseudo_legal_moves(self, color):
+        legal_moves = []
+        for row, col in self.get_pieces_locations(color):
+            legal_moves += self.get_piece(row, col)._get_legal_moves(row, col, self)
+        return legal_moves
+
+class MakeUnmakeHexBoard(HexBoard):
+    """
+    A HexBoard that tests every pseudo-legal move by making it, as before the pin-aware get_legal_moves.
+    """
+    def get_legal_moves(self, color):
+        return self._filter_legal_moves(self.get_pseudo_legal_moves(color), color)
+
+class PinFilterHexBoard(HexBoard):
+    """
+    A HexBoard that filters the pseudo-legal moves with the checks and pins also in check, as before the evasion generator.
+    """
+    def get_legal_moves(self, color):
+        king_indices = self.king_indices[color]
+        if len(king_indices) != 1:
+            return super().get_legal_moves(color)
+        king_index = next(iter(king_indices))
+        checkers, check_lines, pins = self.find_checks_and_pins(king_index, color)
+        evasions = None if not checkers else check_lines[0] if len(checkers) == 1 else ()
+        return self._filter_pinned_moves(self.get_pseudo_legal_moves(color), king_index, color, evasions, pins)
+
+class ListGameOverHexBoard(HexBoard):
+    """
+    A HexBoard that detects the end of the game with full move lists, as before has_legal_move.
+    """
+    def is_game_over(self, color):
+        if self.in_check('white') and len(self.get_legal_moves('white')) == 0:
+            return (True, 'black')
+        if self.in_check('black') and len(self.get_legal_moves('black')) == 0:
+            return (True, 'white')
+        if len(self.get_legal_moves(color)) == 0:
+            return (True, 'remise')
+        return (False, "")
+
+def timed_perft(board_class, depth):
+    """
+    Runs perft from white on every benchmark position.
+
+    Args:
+        board_class (type): The board class to run perft on.
+        depth (int): The perft depth.
+
+    Returns:
+        tuple: The node counts per position and the elapsed time in seconds.
+    """
+    boards = [load_position(position, board_class) for position in POSITIONS_TO_BENCHMARK]
+    start_time = time.perf_counter()
+    counts = [perft(hexboard, 'white', depth) for hexboard in boards]
+    return counts, time.perf_counter() - start_time
+
+def benchmark_movegen(depth):
+    """
+    Compares the perft nodes/sec of the table driven move generator with the reference generator.
+
+    Args:
+        depth (int): The perft depth.
+    """
+    reference_counts, reference_time = timed_perft(ReferenceHexBoard, depth)
+    counts, elapsed_time = timed_perft(HexBoard, depth)
+    if counts != reference_counts:
+        raise AssertionError(f"Perft mismatch: {counts} != {reference_counts}")
+
+    nodes = sum(counts)
+    print(f"perft({depth}) over {len(POSITIONS_TO_BENCHMARK)} positions: {nodes} nodes")
+    print(f"reference: {reference_time:.3f}s, {nodes / reference_time:.0f} nodes/sec")
+    print(f"tables:    {elapsed_time:.3f}s, {nodes / elapsed_time:.0f} nodes/sec")
+    print(f"speedup:   {reference_time / elapsed_time:.2f}x")
+
+def time_per_call(function, repeat):
+    """
+    Returns the mean wall time of a function call in microseconds.
+    """
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start_time) / repeat * 1e6
+
+def benchmark_legal_moves(depth, repeat=200):
+    """
+    Compares the get_legal_moves latency with grid scans and with the piece index sets on every puzzle.
+
+    Args:
+        depth (int): Unused, all benchmarks take the same arguments.
+        repeat (int): The number of calls to average over (default: 200).
+    """
+    print(f"{'puzzle':>6} {'scan (us)':>10} {'indexed (us)':>13} {'speedup':>8}")
+    for puzzle in PUZZLES:
+        timings = []
+        for board_class in (ScanningHexBoard, HexBoard):
+            hexboard = load_position(puzzle, board_class)
+            timings.append(time_per_call(lambda: hexboard.get_legal_moves('white'), repeat))
+        print(f"{puzzle:>6} {timings[0]:>10.1f} {timings[1]:>13.1f} {timings[0] / timings[1]:>7.2f}x")
+
+def benchmark_in_check(depth, repeat=2000):
+    """
+    Verifies the reverse-attack in_check against the reference with a lockstep perft,
+    then compares the in_check latency of both on every benchmark position.
+
+    Args:
+        depth (int): The depth of the lockstep perft.
+        repeat (int): The number of calls to average over (default: 2000).
+    """
+    for position in POSITIONS_TO_BENCHMARK:
+        hexboard = load_position(position)
+        reference_board = load_position(position, ReferenceHexBoard)
+        nodes = compare_with_reference(hexboard, reference_board, 'white', depth)
+        print(f"{position:>8}: perft({depth}) = {nodes}, identical to the reference")
+
+    print(f"{'position':>8} {'generate (us)':>14} {'reverse (us)':>13} {'speedup':>8}")
+    for position in POSITIONS_TO_BENCHMARK:
+        timings = []
+        for board_class in (ReferenceHexBoard, HexBoard):
+            hexboard = load_position(position, board_class)
+            timings.append(time_per_call(lambda: (hexboard.in_check('white'), hexboard.in_check('black')), repeat))
+        print(f"{position:>8} {timings[0]:>14.1f} {timings[1]:>13.1f} {timings[0] / timings[1]:>7.2f}x")
+
+def benchmark_bitboard(depth):
+    """
+    Checks the BitBoard backend against HexBoard with a lockstep perft on every benchmark position,
+    then compares the perft nodes/sec of both backends.
+
+    Args:
+        depth (int): The perft depth.
+    """
+    for position in POSITIONS_TO_BENCHMARK:
+        bitboard = load_position(position, BitBoard)
+        hexboard = load_position(position)
+        nodes = compare_with_reference(bitboard, hexboard, 'white', depth, ordered=False)
+        print(f"{position:>8}: perft({depth}) = {nodes}, identical to HexBoard")
+
+    counts, hexboard_time = timed_perft(HexBoard, depth)
+    bitboard_counts, bitboard_time = timed_perft(BitBoard, depth)
+    if counts != bitboard_counts:
+        raise AssertionError(f"Perft mismatch: {bitboard_counts} != {counts}")
+
+    nodes = sum(counts)
+    print(f"hexboard: {hexboard_time:.3f}s, {nodes / hexboard_time:.0f} nodes/sec")
+    print(f"bitboard: {bitboard_time:.3f}s, {nodes / bitboard_time:.0f} nodes/sec")
+    print(f"speedup:  {hexboard_time / bitboard_time:.2f}x")
+
+def benchmark_zobrist(depth, repeat=200):
+    """
+    Verifies the incremental Zobrist keys against full recomputes over a perft of every benchmark position,
+    then reports the cost of make/unmake with and without the incremental state.
+
+    Args:
+        depth (int): The depth of the verifying perft.
+        repeat (int): The number of make/unmake rounds over the legal moves to average over (default: 200).
+    """
+    HexBoard.debug_zobrist = True
+    try:
+        for position in POSITIONS_TO_BENCHMARK:
+            hexboard = load_position(position)
+            nodes = perft(hexboard, 'white', depth)
+            print(f"{position:>8}: perft({depth}) = {nodes}, incremental keys match the recompute")
+    finally:
+        HexBoard.debug_zobrist = False
+
+    def make_unmake(hexboard, moves):
+        for move in moves:
+            hexboard.move_piece(move)
+            hexboard.undo_move(move)
+
+    print(f"{'position':>8} {'plain (ns)':>11} {'hashed (ns)':>12} {'overhead':>9} {'recompute (ns)':>15}")
+    for position in POSITIONS_TO_BENCHMARK:
+        timings = []
+        for board_class in (ReferenceHexBoard, HexBoard):
+            hexboard = load_position(position, board_class)
+            moves = hexboard.get_legal_moves('white')
+            timings.append(time_per_call(lambda: make_unmake(hexboard, moves), repeat) * 1000 / len(moves))
+        recompute = time_per_call(lambda: compute_key(hexboard.cells, hexboard.side_to_move), repeat) * 1000
+        print(f"{position:>8} {timings[0]:>11.0f} {timings[1]:>12.0f} {timings[1] - timings[0]:>9.0f} {recompute:>15.0f}")
+    print("plain: make/unmake on the grid only, hashed: with piece index sets and the incremental Zobrist key")
+
+class DictMove():
+    """
+    A move with a __dict__ and coordinate tuples, as before the packed move codes.
+    """
+    def __init__(self, piece, initial, target, enemy_piece=None):
+        self.piece = piece
+        self.initial = initial
+        self.target = target
+        self.enemy_piece = enemy_piece
+
+def traced_bytes(function):
+    """
+    Returns the result of a function call and the bytes it allocated that are still alive, measured with tracemalloc.
+    """
+    tracemalloc.start()
+    try:
+        result = function()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+def benchmark_moves(depth):
+    """
+    Reports the memory of a generated move, the size of the pickled root moves sent to the search workers,
+    and the perft nodes/sec of both backends.
+
+    Args:
+        depth (int): The perft depth.
+    """
+    boards = [load_position(position) for position in POSITIONS_TO_BENCHMARK]
+    moves = [move for hexboard in boards for color in ('white', 'black') for move in hexboard.get_legal_moves(color)]
+    _, packed_bytes = traced_bytes(lambda: [packed_move(move.piece, move.code, move.enemy_piece) for move in moves])
+    _, dict_bytes = traced_bytes(lambda: [DictMove(move.piece, move.initial, move.target, move.enemy_piece) for move in moves])
+    print(f"{len(moves)} legal moves over {len(POSITIONS_TO_BENCHMARK)} positions and both colors")
+    print(f"allocated per move: {dict_bytes / len(moves):.0f} B with __dict__, {packed_bytes / len(moves):.0f} B packed")
+
+    object_bytes = code_bytes = 0
+    for hexboard in boards:
+        root_moves = hexboard.get_legal_moves('white')
+        object_bytes += len(pickle.dumps([move for move in root_moves]))
+        code_bytes += len(pickle.dumps([move.code for move in root_moves]))
+    print(f"pickled root moves: {object_bytes} B as Move objects, {code_bytes} B as move codes")
+
+    for board_class in (HexBoard, BitBoard):
+        counts, elapsed_time = timed_perft(board_class, depth)
+        print(f"{board_class.__name__}: perft({depth}) {sum(counts)} nodes, {sum(counts) / elapsed_time:.0f} nodes/sec")
+
+def build_default_board():
+    """
+    Builds a HexBoard with the default setup, without loading a random puzzle as HexBoard() does.
+    """
+    hexboard = HexBoard.__new__(HexBoard)
+    hexboard.hexboard = [[None for _ in range(11)] for _ in range(21)]
+    hexboard._create_board()
+    hexboard._setup_pieces()
+    return hexboard
+
+def benchmark_boards(depth, repeat=500):
+    """
+    Reports the memory of a board with the default setup, and the time to build, pickle and unpickle it.
+
+    Args:
+        depth (int): Unused, all benchmarks take the same arguments.
+        repeat (int): The number of calls to average over (default: 500).
+    """
+    hexboard, board_bytes = traced_bytes(build_default_board)
+    data = pickle.dumps(hexboard)
+    print(f"memory per board: {board_bytes} B, pickled: {len(data)} B")
+    print(f"build:    {time_per_call(build_default_board, repeat):.1f} us")
+    print(f"pickle:   {time_per_call(lambda: pickle.dumps(hexboard), repeat):.1f} us")
+    print(f"unpickle: {time_per_call(lambda: pickle.loads(data), repeat):.1f} us")
+
+def benchmark_pins(depth, repeat=200):
+    """
+    Verifies the pin-aware get_legal_moves against the reference with a lockstep perft on every benchmark position,
+    then compares its legal moves/sec and perft nodes/sec with making and unmaking every pseudo-legal move.
+
+    Args:
+        depth (int): The perft depth.
+        repeat (int): The number of get_legal_moves calls per position and color to average over (default: 200).
+    """
+    for position in POSITIONS_TO_BENCHMARK:
+        hexboard = load_position(position)
+        reference_board = load_position(position, ReferenceHexBoard)
+        nodes = compare_with_reference(hexboard, reference_board, 'white', depth)
+        print(f"{position:>8}: perft({depth}) = {nodes}, identical to the reference")
+
+    print(f"{'position':>8} {'make/unmake (moves/s)':>22} {'pin-aware (moves/s)':>20} {'speedup':>8}")
+    for position in POSITIONS_TO_BENCHMARK:
+        rates = []
+        for board_class in (MakeUnmakeHexBoard, HexBoard):
+            hexboard = load_position(position, board_class)
+            count = len(hexboard.get_legal_moves('white')) + len(hexboard.get_legal_moves('black'))
+            elapsed = time_per_call(lambda: (hexboard.get_legal_moves('white'), hexboard.get_legal_moves('black')), repeat)
+            rates.append(count / elapsed * 1e6)
+        print(f"{position:>8} {rates[0]:>22.0f} {rates[1]:>20.0f} {rates[1] / rates[0]:>7.2f}x")
+
+    counts, make_unmake_time = timed_perft(MakeUnmakeHexBoard, depth)
+    pin_counts, pin_time = timed_perft(HexBoard, depth)
+    if counts != pin_counts:
+        raise AssertionError(f"Perft mismatch: {pin_counts} != {counts}")
+    nodes = sum(counts)
+    print(f"perft({depth}) make/unmake: {make_unmake_time:.3f}s, {nodes / make_unmake_time:.0f} nodes/sec")
+    print(f"perft({depth}) pin-aware:   {pin_time:.3f}s, {nodes / pin_time:.0f} nodes/sec")
+
+def find_check_lines(hexboard, color, depth, line=()):
+    """
+    Returns the move code sequences from a position to the positions within depth plies where the side to move is in check.
+    """
+    lines = [line] if line and hexboard.in_check(color) else []
+    if depth > 0:
+        for move in hexboard.get_legal_moves(color):
+            hexboard.move_piece(move)
+            lines += find_check_lines(hexboard, 'black' if color == 'white' else 'white', depth - 1, line + (move.code,))
+            hexboard.undo_move(move)
+    return lines
+
+def benchmark_evasions(depth, repeat=20):
+    """
+    Compares the get_legal_moves latency of the evasion generator with filtering all pseudo-legal moves, on every
+    position in check within depth plies of each puzzle.
+
+    Args:
+        depth (int): The number of plies to search for positions in check.
+        repeat (int): The number of calls per position to average over (default: 20).
+    """
+    print(f"{'puzzle':>6} {'in check':>9} {'filter (us)':>12} {'evasions (us)':>14} {'speedup':>8}")
+    for puzzle in PUZZLES:
+        lines = find_check_lines(load_position(puzzle), 'white', depth)
+        timings = []
+        for board_class in (PinFilterHexBoard, HexBoard):
+            hexboard = load_position(puzzle, board_class)
+            elapsed = 0
+            for line in lines:
+                moves = []
+                for code in line:
+                    moves.append(hexboard.decode_move(code))
+                    hexboard.move_piece(moves[-1])
+                color = 'black' if len(line) % 2 else 'white'
+                elapsed += time_per_call(lambda: hexboard.get_legal_moves(color), repeat)
+                for move in reversed(moves):
+                    hexboard.undo_move(move)
+            timings.append(elapsed / max(len(lines), 1))
+        speedup = f"{timings[0] / timings[1]:>7.2f}x" if lines else ""
+        print(f"{puzzle:>6} {len(lines):>9} {timings[0]:>12.1f} {timings[1]:>14.1f} {speedup}")
+
+def evaluate_with_class(hexboard, color):
+    return Evaluate(hexboard).evaluate(color)
+
+def evaluate_leaves(hexboard, color, depth, evaluate=evaluate_with_class):
+    """
+    Evaluates every leaf of the legal move tree of the given depth, as min_max does.
+
+    Returns:
+        tuple: The number of leaves and the summed evaluation time in seconds.
+    """
+    if depth == 0:
+        start_time = time.perf_counter()
+        evaluate(hexboard, color)
+        return 1, time.perf_counter() - start_time
+    leaves, elapsed_time = 0, 0
+    for move in hexboard.get_legal_moves(color):
+        hexboard.move_piece(move)
+        counts = evaluate_leaves(hexboard, 'black' if color == 'white' else 'white', depth - 1, evaluate)
+        hexboard.undo_move(move)
+        leaves += counts[0]
+        elapsed_time += counts[1]
+    return leaves, elapsed_time
+
+def benchmark_leaf_eval(depth):
+    """
+    Compares the cost of Evaluate.evaluate per leaf with game-over detection through full move lists and
+    through has_legal_move, on the leaves of a perft tree of every benchmark position.
+
+    Args:
+        depth (int): The depth of the trees.
+    """
+    print(f"{'position':>8} {'leaves':>7} {'lists (us)':>11} {'lazy (us)':>10} {'speedup':>8}")
+    for position in POSITIONS_TO_BENCHMARK:
+        timings = []
+        for board_class in (ListGameOverHexBoard, HexBoard):
+            leaves, elapsed_time = evaluate_leaves(load_position(position, board_class), 'white', depth)
+            timings.append(elapsed_time / leaves * 1e6)
+        print(f"{position:>8} {leaves:>7} {timings[0]:>11.1f} {timings[1]:>10.1f} {timings[0] / timings[1]:>7.2f}x")
+
+class ScanningEvaluate(Evaluate):
+    """
+    The evaluation as before the incremental scores: the end of the game is always detected, and the material is
+    summed over the pieces on the board.
+    """
+    def evaluate(self, color):
+        score = self.terminal_score(color)
+        if score is not None:
+            return score
+        score = 0
+        for piece_color in ('white', 'black'):
+            for row, col in self.hexboard.get_pieces_locations(piece_color):
+                score += self.hexboard.get_piece(row, col).value
+        return score
+
+def benchmark_eval(depth):
+    """
+    Compares the nanoseconds per leaf of the evaluation summing the material over the board, of Evaluate.evaluate
+    with the incremental scores, and of the static score alone as the search uses it, on the leaves of a perft tree
+    of every benchmark position and both boards.
+
+    Args:
+        depth (int): The depth of the trees.
+    """
+    evaluations = {
+        "scan": lambda hexboard, color: ScanningEvaluate(hexboard).evaluate(color),
+        "evaluate": evaluate_with_class,
+        "static": lambda hexboard, color: static_score(hexboard)
+    }
+    for board_class in (HexBoard, BitBoard):
+        print(f"{board_class.__name__}")
+        print(f"{'position':>8} {'leaves':>7} " + " ".join(f"{name + ' (ns)':>14}" for name in evaluations))
+        totals = [0.0] * len(evaluations)
+        all_leaves = 0
+        for position in POSITIONS_TO_BENCHMARK:
+            timings = []
+            for index, evaluate in enumerate(evaluations.values()):
+                leaves, elapsed_time = evaluate_leaves(load_position(position, board_class), 'white', depth, evaluate)
+                timings.append(elapsed_time / leaves * 1e9)
+                totals[index] += elapsed_time
+            all_leaves += leaves
+            print(f"{position:>8} {leaves:>7} " + " ".join(f"{timing:>14.0f}" for timing in timings))
+        print(f"{'mean':>8} {all_leaves:>7} " + " ".join(f"{total / all_leaves * 1e9:>14.0f}" for total in totals))
+
+def play_games(board_class, games, move_limit=40, seed=0):
+    """
+    Plays games on every puzzle with the calls of the Deep.py training loop: white plays a random legal move through
+    the actions, black plays the min_max move, and every move is followed by the game over tests of
+    HexagonalChessEnv.step.
+
+    Args:
+        board_class (type): The board class, with or without a position cache.
+        games (int): The number of games per puzzle.
+        move_limit (int): The maximum number of moves per game (default: 40).
+        seed (int): The seed of the random white moves, so every board class plays the same games (default: 0).
+
+    Returns:
+        tuple: The number of moves, the elapsed time in seconds, and the summed stats of the position caches.
+    """
+    random.seed(seed)
+    minmax = Agent()
+    minmax._init_("black", "min_max")
+    moves, elapsed_time = 0, 0
+    hits, misses = 0, 0
+    for puzzle in PUZZLES:
+        for _ in range(games):
+            hexboard = load_position(puzzle, board_class)
+            current_player = 'white'
+            start_time = time.perf_counter()
+            for _ in range(move_limit):
+                if current_player == 'white':
+                    legal_moves = hexboard.get_legal_moves(current_player)
+                    if not legal_moves:
+                        break
+                    action = random.choice(hexboard.legal_moves_to_actions(legal_moves))
+                    move = hexboard.action_to_move(action)
+                else:
+                    if not hexboard.has_legal_move(current_player):
+                        break
+                    move = minmax.find_min_max_move(hexboard, current_player, False)
+                hexboard.move_piece(move, final=True)
+                moves += 1
+                if hexboard.is_game_over(current_player)[0] or hexboard.is_game_over('black')[0]:
+                    break
+                current_player = 'black' if current_player == 'white' else 'white'
+            elapsed_time += time.perf_counter() - start_time
+            if hexboard.position_cache is not None:
+                stats = hexboard.position_cache.stats()
+                hits += stats['hits']
+                misses += stats['misses']
+    return moves, elapsed_time, (hits, misses)
+
+class CachedHexBoard(HexBoard):
+    """
+    A HexBoard with a position cache of 4096 results, which HexBoard has off by default.
+    """
+    position_cache_size = 4096
+
+def benchmark_cache(depth):
+    """
+    Compares the time per move of the Deep.py game loop with and without the position cache, with the min_max search
+    depth of CONST.DEPTH and one ply deeper.
+
+    Args:
+        depth (int): The number of games per puzzle.
+    """
+    search_depth = Player.DEPTH
+    print(f"{'search':>6} {'moves':>6} {'uncached (us)':>14} {'cached (us)':>12} {'speedup':>8} {'hit rate':>9}")
+    try:
+        for min_max_depth in (search_depth, search_depth + 1):
+            # find_min_max_move searches to the DEPTH of the Player module
+            Player.DEPTH = min_max_depth
+            moves, uncached_time, _ = play_games(HexBoard, depth)
+            cached_moves, cached_time, (hits, misses) = play_games(CachedHexBoard, depth)
+            assert cached_moves == moves, "the position cache changed the games"
+            print(f"{min_max_depth:>6} {moves:>6} {uncached_time / moves * 1e6:>14.1f} {cached_time / moves * 1e6:>12.1f} "
+                  f"{uncached_time / cached_time:>7.2f}x {hits / max(hits + misses, 1):>9.1%}")
+    finally:
+        Player.DEPTH = search_depth
+
+class ExcelHexBoard(HexBoard):
+    """
+    A HexBoard that sets up the default position and then reads its puzzle from the Excel file on every construction,
+    as before the puzzle store.
+    """
+
+    def __init__(self):
+        self.hexboard = [[None for _ in range(11)] for _ in range(21)]
+        self._create_board()
+        self._setup_pieces()
+        self.random_puzzle = random.randint(1, 12)
+        self.load_puzzle(str(self.random_puzzle))
+
+    def load_puzzle(self, puzzle):
+        # Forget the compiled records, so the puzzle is read from its Excel file
+        PuzzleStore._records = {}
+        super().load_puzzle(puzzle)
+
+class ConstructingPool():
+    """
+    A stand-in for BoardPool that builds a new board for every episode, as HexagonalChessEnv.reset() did before the
+    board pool.
+    """
+
+    def __init__(self, board_class):
+        self.board_class = board_class
+
+    def acquire(self, position):
+        hexboard = self.board_class.__new__(self.board_class)
+        hexboard.hexboard = [[None for _ in range(11)] for _ in range(21)]
+        hexboard.load_puzzle(str(position))
+        return hexboard
+
+    def release(self, hexboard):
+        pass
+
+def play_episodes(env, episodes, seed=0):
+    """
+    Plays episodes with the calls of the Deep.py training loop, without the network: white plays a random legal
+    action and black plays the min_max move, for at most MOVE_LIMIT moves.
+
+    Args:
+        env (HexagonalChessEnv): The environment.
+        episodes (int): The number of episodes.
+        seed (int): The seed of the puzzles and the random white moves (default: 0).
+
+    Returns:
+        tuple: The number of moves and the elapsed time in seconds.
+    """
+    random.seed(seed)
+    minmax = Agent()
+    minmax._init_("black", "min_max")
+    moves = 0
+    start_time = time.perf_counter()
+    for _ in range(episodes):
+        env.reset()
+        done = False
+        move_counter = 0
+        while not done and move_counter < MOVE_LIMIT:
+            if env.current_player == "white":
+                legal_moves = env.hexboard.get_legal_moves(env.current_player)
+                if not legal_moves:
+                    break
+                action = random.choice(env.hexboard.legal_moves_to_actions(legal_moves))
+                action = env.hexboard.action_to_move(action)
+            else:
+                if not env.hexboard.has_legal_move(env.current_player):
+                    break
+                action = minmax.find_min_max_move(env.hexboard, env.current_player, False)
+            _, _, done, _ = env.step(action)
+            move_counter += 1
+        moves += move_counter
+    return moves, time.perf_counter() - start_time
+
+def benchmark_reset(depth, repeat=200, episodes=200):
+    """
+    Compares HexagonalChessEnv.reset() and the episodes/sec of the Deep.py loop when every reset builds a board that
+    reads its puzzle from the Excel file, builds a board from the in-memory puzzle store, or resets a pooled board
+    in place.
+
+    Args:
+        depth (int): Unused, all benchmarks take the same arguments.
+        repeat (int): The number of resets to average over (default: 200).
+        episodes (int): The number of episodes to play (default: 200).
+    """
+    # Imported here, gym is only needed by this benchmark
+    from HexagonalChessEnv import HexagonalChessEnv
+    env = HexagonalChessEnv()
+    pools = {
+        "excel": ConstructingPool(ExcelHexBoard),
+        "store": ConstructingPool(HexBoard),
+        "pool": BoardPool(HexBoard, range(1, 13))
+    }
+    print(f"{'reset':>6} {'reset (us)':>11} {'moves':>6} {'episodes/sec':>13}")
+    played_moves = None
+    for name, pool in pools.items():
+        env.board_pool = pool
+        PuzzleStore._records = None
+        reset_time = time_per_call(env.reset, repeat)
+        moves, elapsed_time = play_episodes(env, episodes)
+        assert played_moves in (None, moves), "the board pool changed the games"
+        played_moves = moves
+        print(f"{name:>6} {reset_time:>11.1f} {moves:>6} {episodes / elapsed_time:>13.1f}")
+
+def benchmark_notation(depth, repeat=1000):
+    """
+    Compares reading and writing a position as text notation with pickling the board and with loading the puzzle,
+    on every benchmark position.
+
+    Args:
+        depth (int): Unused, all benchmarks take the same arguments.
+        repeat (int): The number of calls to average over (default: 1000).
+    """
+    print(f"{'position':>8} {'chars':>5} {'to (us)':>8} {'from (us)':>10} {'pickle (us)':>12} {'unpickle (us)':>14} {'puzzle (us)':>12}")
+    for position in POSITIONS_TO_BENCHMARK:
+        hexboard = load_position(position)
+        notation = hexboard.to_notation()
+        data = pickle.dumps(hexboard)
+        if position == "default":
+            puzzle_time = time_per_call(build_default_board, repeat)
+        else:
+            puzzle_time = time_per_call(lambda: hexboard.load_puzzle(position), repeat)
+        print(f"{position:>8} {len(notation):>5} {time_per_call(hexboard.to_notation, repeat):>8.1f} "
+              f"{time_per_call(lambda: HexBoard.from_notation(notation), repeat):>10.1f} "
+              f"{time_per_call(lambda: pickle.dumps(hexboard), repeat):>12.1f} "
+              f"{time_per_call(lambda: pickle.loads(data), repeat):>14.1f} {puzzle_time:>12.1f}")
+
+def benchmark_search(depth, budgets=(50, 250)):
+    """
+    Reports the depth reached by the iterative deepening search within a time budget, and by how much it overshoots
+    the budget, on every benchmark position.
+
+    Args:
+        depth (int): Unused, all benchmarks take the same arguments.
+        budgets (tuple): The time budgets in milliseconds (default: (50, 250)).
+    """
+    print(f"{'position':>8} {'budget (ms)':>12} {'depth':>6} {'nodes':>7} {'time (ms)':>10} {'nodes/sec':>10}")
+    overshoot = 0
+    for position in POSITIONS_TO_BENCHMARK:
+        for budget in budgets:
+            result = Search(load_position(position)).iterative_deepening('white', budget)
+            elapsed_ms = result.elapsed_time * 1000
+            overshoot = max(overshoot, elapsed_ms - budget)
+            print(f"{position:>8} {budget:>12} {result.depth:>6} {result.nodes:>7} {elapsed_ms:>10.1f} "
+                  f"{result.nodes / result.elapsed_time:>10.0f}")
+    print(f"largest overshoot: {overshoot:.1f} ms")
+
+def benchmark_tt(depth):
+    """
+    Compares the nodes searched to a fixed depth without a transposition table, with a table per replacement policy,
+    and with a small table that has to replace entries, on every benchmark position.
+
+    Args:
+        depth (int): The search depth in plies.
+    """
+    tables = {
+        "depth": lambda: TranspositionTable(16, 'depth'),
+        "always": lambda: TranspositionTable(16, 'always'),
+        "depth 64KB": lambda: TranspositionTable(1 / 16, 'depth'),
+        "always 64KB": lambda: TranspositionTable(1 / 16, 'always')
+    }
+    print(f"{'position':>8} {'no table':>9} " + " ".join(f"{name:>11}" for name in tables))
+    totals = [0] * (len(tables) + 1)
+    stats = {name: [0, 0, 0, 0] for name in tables}
+    for position in POSITIONS_TO_BENCHMARK:
+        hexboard = load_position(position)
+        result = Search(hexboard).iterative_deepening('white', None, depth)
+        nodes = [result.nodes]
+        for name, new_table in tables.items():
+            table = new_table()
+            table_result = Search(hexboard, table).iterative_deepening('white', None, depth)
+            assert table_result.score == result.score, f"{position}: the table changed the score"
+            nodes.append(table_result.nodes)
+            table_stats = table.stats()
+            stats[name][0] += table_stats['probes']
+            stats[name][1] += table_stats['hits']
+            stats[name][2] += table_stats['cutoffs']
+            stats[name][3] = max(stats[name][3], table_stats['fill'])
+        totals = [total + count for total, count in zip(totals, nodes)]
+        print(f"{position:>8} {nodes[0]:>9} " + " ".join(f"{count:>11}" for count in nodes[1:]))
+    print(f"{'total':>8} {totals[0]:>9} " + " ".join(f"{count:>11}" for count in totals[1:]))
+    for name, (probes, hits, cutoffs, fill) in stats.items():
+        print(f"{name:>10}: {totals[0] / totals[list(tables).index(name) + 1]:.2f}x fewer nodes, "
+              f"hit rate {hits / max(probes, 1):.1%}, {cutoffs} cutoffs, fill up to {fill:.1%}")
+
+def benchmark_ordering(depth):
+    """
+    Compares the nodes and time to search to a fixed depth with the moves in generation order and with the move
+    ordering, each without and with a transposition table, on every benchmark position. Also reports the nodes of
+    min_max at the same depth, with its captures-first ordering.
+
+    Args:
+        depth (int): The search depth in plies.
+    """
+    configurations = {
+        "unordered": (False, False),
+        "ordered": (False, True),
+        "tt": (True, False),
+        "tt+ordered": (True, True)
+    }
+    print(f"{'position':>8} " + " ".join(f"{name:>11}" for name in configurations) + f" {'min_max':>8}")
+    totals = {name: [0, 0] for name in configurations}
+    min_max_total = 0
+    minmax = Agent()
+    minmax._init_("white", "min_max")
+    for position in POSITIONS_TO_BENCHMARK:
+        hexboard = load_position(position)
+        nodes = []
+        scores = set()
+        for name, (use_table, ordering) in configurations.items():
+            table = TranspositionTable() if use_table else None
+            result = Search(hexboard, table, ordering).iterative_deepening('white', None, depth)
+            scores.add(result.score)
+            nodes.append(result.nodes)
+            totals[name][0] += result.nodes
+            totals[name][1] += result.elapsed_time
+        assert len(scores) == 1, f"{position}: the ordering changed the score"
+        minmax.nodes_explored = 0
+        for move in hexboard.get_legal_moves('white'):
+            minmax.min_max_worker((move.code, hexboard, True, depth - 1, float("-inf"), float("inf"), True))
+        min_max_total += minmax.nodes_explored
+        print(f"{position:>8} " + " ".join(f"{count:>11}" for count in nodes) + f" {minmax.nodes_explored:>8}")
+    print(f"{'total':>8} " + " ".join(f"{nodes:>11}" for nodes, _ in totals.values()) + f" {min_max_total:>8}")
+    print(f"{'time (s)':>8} " + " ".join(f"{elapsed_time:>11.2f}" for _, elapsed_time in totals.values()))
+
+def reference_score(position, move, depth):
+    """
+    Returns the score for white of a white move in a position, searched by the opponent to a depth with quiescence
+    and without the selective search.
+    """
+    hexboard = load_position(position)
+    hexboard.move_piece(hexboard.decode_move(move.code))
+    search = Search(hexboard, null_move=False, reductions=False, futility=False)
+    return -search.iterative_deepening('black', None, depth).score
+
+def benchmark_quiescence(depth):
+    """
+    Compares the moves chosen at depths 1 to depth without and with the quiescence search on every benchmark position.
+    A move is scored by a reference search of depth plies after it, so a move that loses material just beyond the
+    horizon of its search scores low. The scores are summed over the positions without a forced mate, the moves that
+    mate or get mated are counted. Also reports the nodes of the main search and of the quiescence search.
+
+    Args:
+        depth (int): The deepest search depth in plies, and the depth of the reference search.
+    """
+    print(f"{'depth':>5} {'quiescence':>10} {'score':>8} {'mates':>5} {'mated':>5} {'nodes':>8} {'q nodes':>8} {'time (s)':>8}")
+    for search_depth in range(1, depth + 1):
+        for quiescence in (False, True):
+            score_total, mates, mated, nodes, quiescence_nodes, elapsed_time = 0, 0, 0, 0, 0, 0.0
+            for position in POSITIONS_TO_BENCHMARK:
+                hexboard = load_position(position)
+                result = Search(hexboard, None, True, quiescence).iterative_deepening('white', None, search_depth)
+                nodes += result.nodes
+                quiescence_nodes += result.quiescence_nodes
+                elapsed_time += result.elapsed_time
+                score = reference_score(position, result.move, depth)
+                if score >= MATE_SCORE - MAX_SEARCH_DEPTH:
+                    mates += 1
+                elif score <= -(MATE_SCORE - MAX_SEARCH_DEPTH):
+                    mated += 1
+                else:
+                    score_total += score
+            print(f"{search_depth:>5} {str(quiescence):>10} {score_total:>8} {mates:>5} {mated:>5} {nodes:>8} "
+                  f"{quiescence_nodes:>8} {elapsed_time:>8.2f}")
+
+def benchmark_pvs(depth):
+    """
+    Compares the nodes and time to search to a fixed depth with full window alpha-beta, with the principal variation
+    search, with aspiration windows, and with both, each with a transposition table, on every benchmark position.
+    Also reports how often a null window search had to be repeated, and how many root searches were repeated
+    because the score fell outside the aspiration window.
+
+    Args:
+        depth (int): The search depth in plies.
+    """
+    configurations = {
+        "alpha-beta": (False, False),
+        "pvs": (True, False),
+        "aspiration": (False, True),
+        "pvs+asp": (True, True)
+    }
+    print(f"{'position':>8} " + " ".join(f"{name:>11}" for name in configurations))
+    totals = {name: [0, 0.0, 0, 0, 0] for name in configurations}
+    for position in POSITIONS_TO_BENCHMARK:
+        hexboard = load_position(position)
+        nodes = []
+        scores = set()
+        for name, (pvs, aspiration) in configurations.items():
+            search = Search(hexboard, TranspositionTable(), True, True, pvs, aspiration)
+            result = search.iterative_deepening('white', None, depth)
+            scores.add(result.score)
+            nodes.append(result.nodes + result.quiescence_nodes)
+            total = totals[name]
+            total[0] += result.nodes + result.quiescence_nodes
+            total[1] += result.elapsed_time
+            total[2] += search.null_window_searches
+            total[3] += search.researches
+            total[4] += search.aspiration_researches
+        assert len(scores) == 1, f"{position}: the window changed the score"
+        print(f"{position:>8} " + " ".join(f"{count:>11}" for count in nodes))
+    print(f"{'total':>8} " + " ".join(f"{total[0]:>11}" for total in totals.values()))
+    print(f"{'time (s)':>8} " + " ".join(f"{total[1]:>11.2f}" for total in totals.values()))
+    for name, (_, _, null_windows, researches, aspiration_researches) in totals.items():
+        print(f"{name:>10}: {null_windows} null window searches, {researches / max(null_windows, 1):.1%} "
+              f"re-searched, {aspiration_researches} aspiration re-searches")
+
+def benchmark_selective(depth):
+    """
+    A/B comparison of the selective search: searches every benchmark position to a fixed depth without it, with each
+    of null move pruning, late move reductions and futility pruning alone, and with all three, each with a
+    transposition table. Reports the nodes, including the quiescence nodes, and the time, and per configuration the
+    number of puzzles solved (a mate found for white) and the positions whose root score differs from the full width
+    search.
+
+    Args:
+        depth (int): The search depth in plies.
+    """
+    configurations = {
+        "full width": (False, False, False),
+        "null move": (True, False, False),
+        "reductions": (False, True, False),
+        "futility": (False, False, True),
+        "all": (True, True, True)
+    }
+    print(f"{'position':>8} " + " ".join(f"{name:>11}" for name in configurations))
+    totals = {name: [0, 0.0, 0, []] for name in configurations}
+    counters = {name: [0, 0, 0, 0] for name in configurations}
+    for position in POSITIONS_TO_BENCHMARK:
+        hexboard = load_position(position)
+        nodes = []
+        full_width_score = None
+        for name, (null_move, reductions, futility) in configurations.items():
+            search = Search(hexboard, TranspositionTable(), null_move=null_move, reductions=reductions,
+                            futility=futility)
+            result = search.iterative_deepening('white', None, depth)
+            if full_width_score is None:
+                full_width_score = result.score
+            total = totals[name]
+            total[0] += result.nodes + result.quiescence_nodes
+            total[1] += result.elapsed_time
+            if position != "default" and result.score >= MATE_SCORE - MAX_SEARCH_DEPTH:
+                total[2] += 1
+            if result.score != full_width_score:
+                total[3].append(position)
+            counter = counters[name]
+            counter[0] += search.null_move_cutoffs
+            counter[1] += search.reduced_searches
+            counter[2] += search.reduction_researches
+            counter[3] += search.futility_prunes
+            nodes.append(result.nodes + result.quiescence_nodes)
+        print(f"{position:>8} " + " ".join(f"{count:>11}" for count in nodes))
+    print(f"{'total':>8} " + " ".join(f"{total[0]:>11}" for total in totals.values()))
+    print(f"{'time (s)':>8} " + " ".join(f"{total[1]:>11.2f}" for total in totals.values()))
+    print(f"{'solved':>8} " + " ".join(f"{total[2]:>11}" for total in totals.values()))
+    full_width_nodes = totals["full width"][0]
+    for name, (nodes, _, _, changed) in totals.items():
+        null_move_cutoffs, reduced_searches, reduction_researches, futility_prunes = counters[name]
+        print(f"{name:>10}: {full_width_nodes / nodes:.2f}x fewer nodes, score changed in "
+              f"{', '.join(changed) if changed else 'no position'}; {null_move_cutoffs} null move cutoffs, "
+              f"{reduced_searches} reduced searches ({reduction_researches} re-searched), "
+              f"{futility_prunes} futility prunes")
+
+def collect_leaves(hexboard, color, depth, leaves):
+    """
+    Appends the encoded positions of the leaves of the legal move tree of the given depth to leaves.
+    """
+    if depth == 0:
+        leaves.append(encode_position(hexboard))
+        return
+    for move in hexboard.get_legal_moves(color):
+        hexboard.move_piece(move)
+        collect_leaves(hexboard, 'black' if color == 'white' else 'white', depth - 1, leaves)
+        hexboard.undo_move(move)
+
+def score_positions_one_by_one(positions):
+    """
+    Scores a batch one position at a time in Python, as Evaluate scores one board at a time.
+    """
+    table = SCORE_TABLE.tolist()
+    return [sum(table[code + CODE_OFFSET][index] for index, code in enumerate(position))
+            for position in positions.tolist()]
+
+def benchmark_batch(depth, sizes=(1, 1000, 100000)):
+    """
+    Reports the positions per second of the batch evaluator for batches of the leaves of the perft trees of every
+    benchmark position, repeated up to the batch size: the material and piece-square score, the score with the
+    mobility and king safety features, and the same score one position at a time in Python.
+
+    Args:
+        depth (int): The depth of the trees.
+        sizes (tuple): The batch sizes (default: (1, 1000, 100000)).
+    """
+    leaves = []
+    for position in POSITIONS_TO_BENCHMARK:
+        collect_leaves(load_position(position), 'white', depth, leaves)
+    leaves = np.array(leaves, dtype=np.int8)
+    evaluations = {
+        "scores": batch_scores,
+        "features": lambda positions: evaluate_batch(positions, 1, 1),
+        "one by one": score_positions_one_by_one
+    }
+    print(f"{len(leaves)} leaves")
+    print(f"{'size':>7} " + " ".join(f"{name + ' (pos/s)':>20}" for name in evaluations))
+    for size in sizes:
+        positions = np.resize(leaves, (size, leaves.shape[1]))
+        assert (batch_scores(positions) == score_positions_one_by_one(positions)).all()
+        repeat = max(1, 10000 // size)
+        rates = [size / time_per_call(lambda: evaluate(positions), repeat) * 1e6 for evaluate in evaluations.values()]
+        print(f"{size:>7} " + " ".join(f"{rate:>20.0f}" for rate in rates))
+
+def benchmark_eval_cache(depth):
+    """
+    Compares the time of the min_max move of white on every benchmark position without caches, with the eval cache,
+    with the pawn hash table and with both, kept over the positions as an agent keeps them over its moves. Reports
+    the hit rates of the caches.
+
+    Args:
+        depth (int): The search depth in plies, the root moves and CONST.DEPTH plies below them.
+    """
+    configurations = {
+        "none": (False, False),
+        "eval cache": (True, False),
+        "pawn table": (False, True),
+        "both": (True, True)
+    }
+    search_depth = Player.DEPTH
+    print(f"{'caches':>10} {'time (s)':>9} {'speedup':>8} {'eval hits':>10} {'pawn hits':>10}")
+    try:
+        # find_min_max_move searches to the DEPTH of the Player module below the root moves
+        Player.DEPTH = depth - 1
+        chosen_moves = None
+        base_time = None
+        for name, (use_eval_cache, use_pawn_table) in configurations.items():
+            minmax = Agent()
+            minmax._init_("white", "min_max")
+            minmax.eval_cache = EvalCache() if use_eval_cache else None
+            minmax.pawn_table = PawnHashTable() if use_pawn_table else None
+            moves = []
+            start_time = time.perf_counter()
+            for position in POSITIONS_TO_BENCHMARK:
+                moves.append(minmax.find_min_max_move(load_position(position), 'white', False).code)
+            elapsed_time = time.perf_counter() - start_time
+            if chosen_moves is None:
+                chosen_moves, base_time = moves, elapsed_time
+            assert moves == chosen_moves, f"{name}: the caches changed the moves"
+            rates = [f"{table.stats()['hit_rate']:>10.1%}" if table is not None else f"{'-':>10}"
+                     for table in (minmax.eval_cache, minmax.pawn_table)]
+            print(f"{name:>10} {elapsed_time:>9.2f} {base_time / elapsed_time:>7.2f}x " + " ".join(rates))
+    finally:
+        Player.DEPTH = search_depth
+
+def find_move_with_new_pool(minmax, hexboard):
+    """
+    Finds the min_max move of white with a new process pool per move that gets the board and the agent pickled with
+    every root move, as find_min_max_move did before the engine pool.
+    """
+    moves = order_captures_first(hexboard.get_legal_moves('white'))
+    args = [(move.code, hexboard, True, Player.DEPTH, float("-inf"), float("inf"), True) for move in moves]
+    with multiprocessing.Pool() as pool:
+        results = pool.map(minmax.min_max_worker, args)
+    return max(results, key=lambda x: x[1])[0]
+
+def benchmark_parallel(depth):
+    """
+    Compares the time of the min_max move of white on every benchmark position searched serially, with a new process
+    pool per move and with the engine pool on 1 up to all cores, and reports the speedup against the serial search.
+
+    Args:
+        depth (int): The search depth in plies, the root moves and CONST.DEPTH plies below them.
+    """
+    cores = multiprocessing.cpu_count()
+    search_depth = Player.DEPTH
+    print(f"{cores} cores")
+    print(f"{'search':>16} {'time (s)':>9} {'speedup':>8} {'nodes':>8}")
+    try:
+        Player.DEPTH = depth - 1
+        boards = [load_position(position) for position in POSITIONS_TO_BENCHMARK]
+        minmax = Agent()
+        minmax._init_("white", "min_max")
+
+        start_time = time.perf_counter()
+        nodes = 0
+        serial_moves = []
+        for hexboard in boards:
+            serial_moves.append(minmax.find_min_max_move(hexboard, 'white', False).code)
+            nodes += minmax.nodes_explored
+        serial_time = time.perf_counter() - start_time
+        print(f"{'serial':>16} {serial_time:>9.2f} {1:>7.2f}x {nodes:>8}")
+
+        start_time = time.perf_counter()
+        moves = [find_move_with_new_pool(minmax, hexboard) for hexboard in boards]
+        elapsed_time = time.perf_counter() - start_time
+        assert moves == serial_moves, "the pool per move changed the moves"
+        print(f"{'pool per move':>16} {elapsed_time:>9.2f} {serial_time / elapsed_time:>7.2f}x {'-':>8}")
+
+        processes = 1
+        while True:
+            pooled = Agent()
+            pooled._init_("white", "min_max")
+            # The pool is started once, outside the timed moves
+            pooled.start_engine_pool(processes)
+            start_time = time.perf_counter()
+            nodes = 0
+            moves = []
+            for hexboard in boards:
+                moves.append(pooled.find_min_max_move(hexboard, 'white', True).code)
+                nodes += pooled.nodes_explored
+            elapsed_time = time.perf_counter() - start_time
+            pooled.close_engine_pool()
+            assert moves == serial_moves, f"the engine pool with {processes} processes changed the moves"
+            print(f"{f'engine pool x{processes}':>16} {elapsed_time:>9.2f} {serial_time / elapsed_time:>7.2f}x {nodes:>8}")
+            if processes == cores:
+                break
+            processes = min(processes * 2, cores)
+    finally:
+        Player.DEPTH = search_depth
+
+BENCHMARKS = {
+    "movegen": benchmark_movegen,
+    "legal_moves": benchmark_legal_moves,
+    "in_check": benchmark_in_check,
+    "bitboard": benchmark_bitboard,
+    "zobrist": benchmark_zobrist,
+    "moves": benchmark_moves,
+    "boards": benchmark_boards,
+    "pins": benchmark_pins,
+    "evasions": benchmark_evasions,
+    "leaf_eval": benchmark_leaf_eval,
+    "eval": benchmark_eval,
+    "batch": benchmark_batch,
+    "eval_cache": benchmark_eval_cache,
+    "parallel": benchmark_parallel,
+    "cache": benchmark_cache,
+    "reset": benchmark_reset,
+    "notation": benchmark_notation,
+    "search": benchmark_search,
+    "tt": benchmark_tt,
+    "ordering": benchmark_ordering,
+    "quiescence": benchmark_quiescence,
+    "pvs": benchmark_pvs,
+    "selective": benchmark_selective
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hexagonal chess performance benchmarks.")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--depth", type=int, default=2)
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args.depth)
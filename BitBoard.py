@@ -0,0 +1,701 @@
+"""
+Bitboard backend for the hexagonal chess board.
+
+Occupancy is stored per color and per piece kind as Python ints with one bit per hexagon, bit i being the hexagon
+POSITIONS[i]. Slider attacks are looked up per direction in tables indexed by the occupancy of the ray.
+"""
+import random
+
+from CONST import *
+from Tables import *
+from Piece import *
+from Move import *
+from HexBoard import HexBoard, default_pieces, read_puzzle
+from Zobrist import PAWN_KEYS, BLACK_TO_MOVE_KEY
+
+PIECE_NAMES = {
+    'white': ('p', 'n', 'b', 'r', 'q', 'k'),
+    'black': ('P', 'N', 'B', 'R', 'Q', 'K')
+}
+
+def _mask(indices):
+    """
+    Returns the bitmask with the bits of the given hexagon indices set.
+    """
+    mask = 0
+    for index in indices:
+        mask |= 1 << index
+    return mask
+
+def _build_slider_lookups(rays):
+    """
+    Builds the occupancy indexed attack lookups of a slider for every hexagon.
+
+    Args:
+        rays (tuple): The slider rays of every hexagon, see Tables.
+
+    Returns:
+        tuple: For each hexagon, a tuple of (ray mask, lookup) pairs, one per ray. The lookup maps every subset of
+               the ray mask (the occupied hexagons on the ray) to the mask of hexagons attacked along the ray.
+    """
+    lookups = []
+    for hexagon_rays in rays:
+        hexagon_lookups = []
+        for ray in hexagon_rays:
+            lookup = {}
+            for subset in range(1 << len(ray)):
+                occupancy = 0
+                attacks = 0
+                blocked = False
+                for bit, target in enumerate(ray):
+                    if subset >> bit & 1:
+                        occupancy |= 1 << target
+                    if not blocked:
+                        attacks |= 1 << target
+                        blocked = bool(subset >> bit & 1)
+                lookup[occupancy] = attacks
+            hexagon_lookups.append((_mask(ray), lookup))
+        lookups.append(tuple(hexagon_lookups))
+    return tuple(lookups)
+
+ROOK_LOOKUPS = _build_slider_lookups(ROOK_RAYS)
+BISHOP_LOOKUPS = _build_slider_lookups(BISHOP_RAYS)
+ROOK_REACH = tuple(_mask(target for ray in rays for target in ray) for rays in ROOK_RAYS)
+BISHOP_REACH = tuple(_mask(target for ray in rays for target in ray) for rays in BISHOP_RAYS)
+QUEEN_REACH = tuple(rook | bishop for rook, bishop in zip(ROOK_REACH, BISHOP_REACH))
+KNIGHT_MASKS = tuple(_mask(targets) for targets in KNIGHT_LEAPS)
+KING_MASKS = tuple(_mask(targets) for targets in KING_STEPS)
+PAWN_CAPTURE_MASKS = {color: tuple(_mask(targets) for targets in PAWN_CAPTURES[color]) for color in PAWN_CAPTURES}
+PROMOTION_MASK = _mask(POS_IDX[hexagon] for hexagon in PAWN_PROMOTION_HEXAGONS)
+
+def slider_attacks(lookups, occupied):
+    """
+    Returns the mask of hexagons attacked by a slider.
+
+    Args:
+        lookups (tuple): The (ray mask, lookup) pairs of the slider's hexagon.
+        occupied (int): The mask of all occupied hexagons.
+
+    Returns:
+        int: The mask of attacked hexagons, including the first occupied hexagon of every ray.
+    """
+    attacks = 0
+    for ray_mask, lookup in lookups:
+        attacks |= lookup[occupied & ray_mask]
+    return attacks
+
+def iterate_bits(mask):
+    """
+    Yields the indices of the set bits of a mask, lowest first.
+    """
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+class BitBoard():
+    """
+    Represents a hexagonal chess board as bitboards.
+
+    Exposes the same API as HexBoard, so it can be used by Player.Agent, Evaluate and HexagonalChessEnv.
+    The Piece objects are kept in a list indexed by POS_IDX, so moves still carry the moving and captured pieces.
+
+    Attributes:
+    - masks: A dictionary from piece name ('p', 'n', 'b', 'r', 'q', 'k' for white, upper case for black) to the mask of those pieces.
+    - colors: Per color, the mask of hexagons occupied by that color.
+    - occupied: The mask of all occupied hexagons.
+    - squares: A list of the pieces on the board, indexed by POS_IDX, None for empty hexagons.
+    - side_to_move: The color to move, white after setting up a position and toggled by every move.
+    - zobrist_key: The 64-bit Zobrist key of the position, the same as the key of a HexBoard with the position.
+    - pawn_key: The 64-bit key of the pawn placement, see HexBoard.
+    - material, positional: The sums of the piece values and piece-square bonuses, relative to white, see HexBoard.
+    - random_puzzle: An integer representing the randomly generated puzzle number.
+    - reset_position, reset_pieces: The position and pieces of the last reset_to, see HexBoard.reset_to.
+    """
+    reset_position = None
+    reset_pieces = ()
+
+    def __init__(self):
+        """
+        Initializes a new instance of the BitBoard class with a random puzzle, like HexBoard.
+        """
+        self.random_puzzle = random.randint(1, 12)
+        self.load_puzzle(str(self.random_puzzle))
+
+    def _create_board(self):
+        """
+        Clears the board.
+        """
+        self.masks = {name: 0 for name in PIECE_NAMES['white'] + PIECE_NAMES['black']}
+        self.colors = {'white': 0, 'black': 0}
+        self.occupied = 0
+        self.squares = [None] * len(POSITIONS)
+        self.side_to_move = 'white'
+        self.zobrist_key = 0
+        self.pawn_key = 0
+        self.material = 0
+        self.positional = 0
+
+    def _place(self, index, piece):
+        """
+        Puts a piece on an empty hexagon.
+        """
+        bit = 1 << index
+        self.squares[index] = piece
+        self.masks[piece.name] |= bit
+        self.colors[piece.color] |= bit
+        self.occupied |= bit
+        self.zobrist_key ^= piece.zobrist_keys[index]
+        self.material += piece.value
+        self.positional += piece.square_scores[index]
+        if piece.name in PAWN_KEYS:
+            self.pawn_key ^= PAWN_KEYS[piece.name][index]
+
+    def _remove(self, index, piece):
+        """
+        Removes a piece from its hexagon.
+        """
+        bit = 1 << index
+        self.squares[index] = None
+        self.masks[piece.name] ^= bit
+        self.colors[piece.color] ^= bit
+        self.occupied ^= bit
+        self.zobrist_key ^= piece.zobrist_keys[index]
+        self.material -= piece.value
+        self.positional -= piece.square_scores[index]
+        if piece.name in PAWN_KEYS:
+            self.pawn_key ^= PAWN_KEYS[piece.name][index]
+
+    def _setup_pieces(self):
+        """
+        Sets up the default position, see HexBoard._setup_pieces.
+        """
+        for position, piece in default_pieces():
+            self._place(POS_IDX[position], piece)
+
+    def load_puzzle(self, puzzle):
+        """
+        Loads a puzzle, see HexBoard.load_puzzle.
+
+        Parameters:
+        - puzzle (str): The name of the puzzle to load, or the path of a puzzle file.
+        """
+        self._create_board()
+        for position, piece in read_puzzle(puzzle):
+            self._place(POS_IDX[position], piece)
+
+    def reset_to(self, position):
+        """
+        Sets up a position in place, reusing the pieces, see HexBoard.reset_to.
+
+        Parameters:
+        - position (str): "default" or the name of a puzzle.
+        """
+        self._create_board()
+        for index, piece, _ in self._reset_pieces(str(position)):
+            self._place(index, piece)
+
+    @classmethod
+    def for_position(cls, position):
+        """
+        Creates a board with a position, without loading a random puzzle, see HexBoard.for_position.
+
+        Parameters:
+        - position (str): "default" or the name of a puzzle.
+
+        Returns:
+        - BitBoard: The new board.
+        """
+        bitboard = cls.__new__(cls)
+        bitboard.random_puzzle = None
+        bitboard.reset_to(position)
+        return bitboard
+
+    @classmethod
+    def from_hexboard(cls, hexboard):
+        """
+        Creates a BitBoard with the position of a HexBoard, sharing its Piece objects.
+
+        Args:
+            hexboard (HexBoard): The board to copy the position from.
+
+        Returns:
+            BitBoard: The new board.
+        """
+        bitboard = cls.__new__(cls)
+        bitboard._create_board()
+        bitboard.random_puzzle = getattr(hexboard, "random_puzzle", None)
+        for index, hexagon in enumerate(hexboard.cells):
+            if hexagon.piece is not None:
+                bitboard._place(index, hexagon.piece)
+        if hexboard.side_to_move == 'black':
+            bitboard.side_to_move = 'black'
+            bitboard.zobrist_key ^= BLACK_TO_MOVE_KEY
+        return bitboard
+
+    def get_piece(self, row, col):
+        """
+        Get the piece at the specified position on the board.
+
+        Args:
+            row (int): The row index of the position.
+            col (int): The column index of the position.
+
+        Returns:
+            object or None: The piece object at the specified position, or None if there is no piece.
+
+        Raises:
+            ValueError: If the position is invalid (outside the board boundaries).
+        """
+        if row < 0 or row > 20 or col < 0 or col > 10:
+            raise ValueError("Invalid position")
+        index = POS_IDX.get((row, col))
+        return self.squares[index] if index is not None else None
+
+    def get_pieces_locations(self, color):
+        """
+        Returns a list of locations (row, col) of all pieces of the specified color, in board order.
+        """
+        return [POSITIONS[index] for index in iterate_bits(self.colors[color])]
+
+    def get_king_location(self, color):
+        """
+        Returns the location of the king of the specified color, the first one in board order if there are several.
+        None if there is no king.
+        """
+        kings = self.masks[PIECE_NAMES[color][5]]
+        if kings:
+            return POSITIONS[(kings & -kings).bit_length() - 1]
+        return None
+
+    def get_pseudo_legal_moves(self, color, captures_only=False):
+        """
+        Returns a list of pseudo-legal moves for the specified color.
+
+        Parameters:
+        - color (str): The color of the pieces to consider.
+        - captures_only (bool): Whether to only generate captures and promotions (default: False).
+
+        Returns:
+        - list: A list of pseudo-legal moves for the specified color.
+        """
+        moves = []
+        squares = self.squares
+        occupied = self.occupied
+        enemies = self.colors['black' if color == 'white' else 'white']
+        not_own = enemies if captures_only else ~self.colors[color]
+        masks = self.masks
+        pawn, knight, bishop, rook, queen, king = PIECE_NAMES[color]
+
+        pawn_pushes = PAWN_PUSHES[color]
+        pawn_captures = PAWN_CAPTURE_MASKS[color]
+        for index in iterate_bits(masks[pawn]):
+            piece = squares[index]
+            base = index | 1 << MOVED_SHIFT
+            single, double = pawn_pushes[index]
+            if single is not None and not occupied >> single & 1:
+                code = base | single << TARGET_SHIFT
+                if PROMOTION_MASK >> single & 1:
+                    code |= PROMOTION_FLAG
+                    moves.append(packed_move(piece, code, None))
+                elif not captures_only:
+                    moves.append(packed_move(piece, code, None))
+                    # The first-move push mirrors the single push target, as in Pawn._get_legal_moves
+                    if piece.first_move and double is not None and not occupied >> double & 1:
+                        moves.append(packed_move(piece, code, None))
+            for target in iterate_bits(pawn_captures[index] & enemies):
+                enemy_piece = squares[target]
+                code = base | target << TARGET_SHIFT | PIECE_TYPES[enemy_piece.name] << CAPTURED_SHIFT
+                if PROMOTION_MASK >> target & 1:
+                    code |= PROMOTION_FLAG
+                moves.append(packed_move(piece, code, enemy_piece))
+
+        for name in (knight, bishop, rook, queen, king):
+            for index in iterate_bits(masks[name]):
+                if name == knight:
+                    targets = KNIGHT_MASKS[index]
+                elif name == king:
+                    targets = KING_MASKS[index]
+                else:
+                    targets = 0
+                    if name != bishop:
+                        for ray_mask, lookup in ROOK_LOOKUPS[index]:
+                            targets |= lookup[occupied & ray_mask]
+                    if name != rook:
+                        for ray_mask, lookup in BISHOP_LOOKUPS[index]:
+                            targets |= lookup[occupied & ray_mask]
+                piece = squares[index]
+                base = index | PIECE_TYPES[name] << MOVED_SHIFT
+                for target in iterate_bits(targets & not_own):
+                    enemy_piece = squares[target]
+                    if enemy_piece is None:
+                        moves.append(packed_move(piece, base | target << TARGET_SHIFT, None))
+                    else:
+                        code = base | target << TARGET_SHIFT | PIECE_TYPES[enemy_piece.name] << CAPTURED_SHIFT
+                        moves.append(packed_move(piece, code, enemy_piece))
+        return moves
+
+    def get_legal_moves(self, color):
+        """
+        Returns a list of legal moves for the specified color.
+
+        Instead of making every move, the king safety test runs on the occupancy the move would leave behind.
+        When the king is not in check, a move of another piece can only expose the king if the piece leaves one of the
+        king's lines, so moves from hexagons off those lines skip the test.
+        In check, a move of another piece has to land on the check line of a single checker, and in double check only
+        king moves are tested.
+
+        Parameters:
+        - color (str): The color of the player whose legal moves are to be determined.
+
+        Returns:
+        - list: A list of legal moves for the specified color.
+        """
+        return list(self.iter_legal_moves(color))
+
+    def iter_legal_moves(self, color):
+        """
+        Returns an iterator over the legal moves for the specified color, see HexBoard.iter_legal_moves.
+
+        The pseudo-legal moves are generated up front, the king safety tests run as the moves are requested.
+
+        Parameters:
+        - color (str): The color of the player whose legal moves are to be determined.
+
+        Returns:
+        - iterator: The legal moves for the specified color.
+        """
+        kings = self.masks[PIECE_NAMES[color][5]]
+        if not kings:
+            return iter(self.get_pseudo_legal_moves(color))
+        king_index = (kings & -kings).bit_length() - 1
+        checkers, evasions = self._find_checks(king_index, 'black' if color == 'white' else 'white')
+        return self._iter_legal_moves(color, king_index, checkers, evasions)
+
+    def get_capture_moves(self, color):
+        """
+        Returns the legal captures and promotions of the specified color, see HexBoard.get_capture_moves.
+
+        Parameters:
+        - color (str): The color of the player to move.
+
+        Returns:
+        - list: The legal captures and promotions, in board order.
+        """
+        kings = self.masks[PIECE_NAMES[color][5]]
+        if not kings:
+            return self.get_pseudo_legal_moves(color, True)
+        king_index = (kings & -kings).bit_length() - 1
+        checkers, evasions = self._find_checks(king_index, 'black' if color == 'white' else 'white')
+        return list(self._iter_legal_moves(color, king_index, checkers, evasions, True))
+
+    def has_legal_move(self, color):
+        """
+        Checks if the specified color has a legal move, stopping at the first one found.
+
+        Parameters:
+        - color (str): The color of the player to move.
+
+        Returns:
+        - bool: True if the color has at least one legal move, False otherwise.
+        """
+        for _ in self.iter_legal_moves(color):
+            return True
+        return False
+
+    def get_evasion_moves(self, color):
+        """
+        Returns the legal moves of the specified color if its king is in check, see HexBoard.get_evasion_moves.
+
+        Parameters:
+        - color (str): The color of the player to move.
+
+        Returns:
+        - list or None: The legal moves, which are all evasions, or None if the color is not in check.
+        """
+        kings = self.masks[PIECE_NAMES[color][5]]
+        if not kings:
+            return None
+        king_index = (kings & -kings).bit_length() - 1
+        checkers, evasions = self._find_checks(king_index, 'black' if color == 'white' else 'white')
+        if not checkers:
+            return None
+        return list(self._iter_legal_moves(color, king_index, checkers, evasions))
+
+    def _iter_legal_moves(self, color, king_index, checkers, evasions, captures_only=False):
+        """
+        Yields the legal moves of a color, given the checks on its first king.
+
+        Parameters:
+        - color (str): The color of the player to move.
+        - king_index (int): The index of the first king of the color.
+        - checkers (int): The mask of the pieces giving check to the king.
+        - evasions (int): The mask of the checkers and the hexagons between the king and the checking sliders.
+        - captures_only (bool): Whether to only yield captures and promotions (default: False).
+
+        Yields:
+        - Move: The legal moves, in the order of get_pseudo_legal_moves.
+        """
+        moves = self.get_pseudo_legal_moves(color, captures_only)
+        opponent_color = 'black' if color == 'white' else 'white'
+        king = PIECE_NAMES[color][5]
+        kings = self.masks[king]
+        occupied = self.occupied
+        if not checkers:
+            king_lines = QUEEN_REACH[king_index]
+            evasions = -1
+        else:
+            king_lines = 0
+            if checkers & (checkers - 1):
+                evasions = 0
+        for move in moves:
+            code = move.code
+            initial_bit = 1 << (code & SQUARE_MASK)
+            king_move = move.piece.name == king
+            if king_lines and not king_lines & initial_bit and not king_move:
+                yield move
+                continue
+            target_bit = 1 << (code >> TARGET_SHIFT & SQUARE_MASK)
+            if not king_move and not evasions & target_bit:
+                continue
+            own_kings = kings ^ (initial_bit | target_bit) if king_move else kings
+            if not own_kings:
+                yield move
+                continue
+            own_king_index = (own_kings & -own_kings).bit_length() - 1
+            if not self._is_index_attacked(own_king_index, opponent_color, (occupied ^ initial_bit) | target_bit, ~target_bit):
+                yield move
+
+    def _find_checks(self, index, by_color):
+        """
+        Finds the pieces of a color that attack a hexagon, and the hexagons that block or capture them.
+
+        Args:
+            index (int): The index of the hexagon, normally a king.
+            by_color (str): The color of the attacking pieces.
+
+        Returns:
+            tuple: The mask of the attacking pieces, and the mask of the attacking pieces together with the hexagons
+                   between the hexagon and the attacking sliders.
+        """
+        occupied = self.occupied
+        masks = self.masks
+        pawn, knight, bishop, rook, queen, king = PIECE_NAMES[by_color]
+        checkers = (KNIGHT_MASKS[index] & masks[knight] | KING_MASKS[index] & masks[king]
+                    | PAWN_CAPTURE_MASKS['black' if by_color == 'white' else 'white'][index] & masks[pawn])
+        evasions = checkers
+        queens = masks[queen]
+        for lookups, sliders in ((ROOK_LOOKUPS[index], (masks[rook] | queens) & ROOK_REACH[index]),
+                                 (BISHOP_LOOKUPS[index], (masks[bishop] | queens) & BISHOP_REACH[index])):
+            if sliders:
+                for ray_mask, lookup in lookups:
+                    attacks = lookup[occupied & ray_mask]
+                    if attacks & sliders:
+                        checkers |= attacks & sliders
+                        evasions |= attacks
+        return checkers, evasions
+
+    def move_piece(self, move, final=False):
+        """
+        Moves a piece on the board, see HexBoard.move_piece.
+
+        Args:
+            move (Move): The move to make.
+            final (bool, optional): Indicates if this is the final move of the piece. Defaults to False.
+        """
+        piece = move.piece
+        code = move.code
+        initial_index = code & SQUARE_MASK
+        target_index = code >> TARGET_SHIFT & SQUARE_MASK
+        initial_bit = 1 << initial_index
+        target_bit = 1 << target_index
+        squares = self.squares
+        masks = self.masks
+        colors = self.colors
+
+        key = self.zobrist_key ^ BLACK_TO_MOVE_KEY ^ piece.zobrist_keys[initial_index]
+        positional = self.positional - piece.square_scores[initial_index]
+        captured_piece = squares[target_index]
+        if captured_piece is not None:
+            masks[captured_piece.name] ^= target_bit
+            colors[captured_piece.color] ^= target_bit
+            self.occupied ^= target_bit
+            key ^= captured_piece.zobrist_keys[target_index]
+            positional -= captured_piece.square_scores[target_index]
+            self.material -= captured_piece.value
+            if captured_piece.name in PAWN_KEYS:
+                self.pawn_key ^= PAWN_KEYS[captured_piece.name][target_index]
+
+        squares[initial_index] = None
+        squares[target_index] = piece
+        masks[piece.name] ^= initial_bit | target_bit
+        colors[piece.color] ^= initial_bit | target_bit
+        self.occupied ^= initial_bit | target_bit
+
+        if piece.name == 'p' or piece.name == 'P':
+            if final:
+                piece.has_moved = True
+            piece.total_moves += 1
+            pawn_keys = PAWN_KEYS[piece.name]
+            if code & PROMOTION_FLAG:
+                queen = Queen(piece.color)
+                queen.index = piece.index
+                squares[target_index] = queen
+                masks[piece.name] ^= target_bit
+                masks[queen.name] |= target_bit
+                self.material += queen.value - piece.value
+                self.pawn_key ^= pawn_keys[initial_index]
+            else:
+                self.pawn_key ^= pawn_keys[initial_index] ^ pawn_keys[target_index]
+        promoted_piece = squares[target_index]
+        self.zobrist_key = key ^ promoted_piece.zobrist_keys[target_index]
+        self.positional = positional + promoted_piece.square_scores[target_index]
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+
+    def undo_move(self, move):
+        """
+        Undoes a move, see HexBoard.undo_move.
+
+        Args:
+            move (Move): The move to be undone.
+        """
+        piece = move.piece
+        enemy_piece = move.enemy_piece
+        code = move.code
+        initial_index = code & SQUARE_MASK
+        target_index = code >> TARGET_SHIFT & SQUARE_MASK
+        initial_bit = 1 << initial_index
+        target_bit = 1 << target_index
+        squares = self.squares
+        masks = self.masks
+        colors = self.colors
+
+        moved_piece = squares[target_index]
+        masks[moved_piece.name] ^= target_bit
+        masks[piece.name] |= initial_bit
+        key = self.zobrist_key ^ BLACK_TO_MOVE_KEY ^ moved_piece.zobrist_keys[target_index] ^ piece.zobrist_keys[initial_index]
+        positional = self.positional - moved_piece.square_scores[target_index] + piece.square_scores[initial_index]
+        if moved_piece is not piece:
+            self.material -= moved_piece.value - piece.value
+        colors[piece.color] ^= initial_bit | target_bit
+        self.occupied ^= initial_bit | target_bit
+        squares[initial_index] = piece
+        squares[target_index] = enemy_piece
+
+        if enemy_piece is not None:
+            masks[enemy_piece.name] |= target_bit
+            colors[enemy_piece.color] |= target_bit
+            self.occupied |= target_bit
+            key ^= enemy_piece.zobrist_keys[target_index]
+            positional += enemy_piece.square_scores[target_index]
+            self.material += enemy_piece.value
+            if enemy_piece.name in PAWN_KEYS:
+                self.pawn_key ^= PAWN_KEYS[enemy_piece.name][target_index]
+        self.zobrist_key = key
+        self.positional = positional
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+
+        if piece.name == 'p' or piece.name == 'P':
+            pawn_keys = PAWN_KEYS[piece.name]
+            if moved_piece is piece:
+                self.pawn_key ^= pawn_keys[initial_index] ^ pawn_keys[target_index]
+            else:
+                self.pawn_key ^= pawn_keys[initial_index]
+            piece.total_moves -= 1
+            if piece.total_moves == 0:
+                piece.has_moved = False
+
+    def _is_index_attacked(self, index, by_color, occupied=None, remaining=-1):
+        """
+        Checks if the hexagon with the given POS_IDX index is attacked by any piece of the specified color.
+
+        Args:
+            index (int): The index of the hexagon.
+            by_color (str): The color of the attacking pieces.
+            occupied (int, optional): The occupancy to test with, defaults to the current occupancy.
+            remaining (int, optional): A mask of the attacking pieces to consider, used to leave out a captured piece.
+
+        Returns:
+            bool: True if a piece of by_color attacks the hexagon, False otherwise.
+        """
+        if occupied is None:
+            occupied = self.occupied
+        masks = self.masks
+        pawn, knight, bishop, rook, queen, king = PIECE_NAMES[by_color]
+        if KNIGHT_MASKS[index] & masks[knight] & remaining or KING_MASKS[index] & masks[king] & remaining:
+            return True
+        if PAWN_CAPTURE_MASKS['black' if by_color == 'white' else 'white'][index] & masks[pawn] & remaining:
+            return True
+        queens = masks[queen]
+        rooks = (masks[rook] | queens) & remaining & ROOK_REACH[index]
+        if rooks:
+            for ray_mask, lookup in ROOK_LOOKUPS[index]:
+                if lookup[occupied & ray_mask] & rooks:
+                    return True
+        bishops = (masks[bishop] | queens) & remaining & BISHOP_REACH[index]
+        if bishops:
+            for ray_mask, lookup in BISHOP_LOOKUPS[index]:
+                if lookup[occupied & ray_mask] & bishops:
+                    return True
+        return False
+
+    def is_square_attacked(self, square, by_color):
+        """
+        Checks if a hexagon is attacked by any piece of the specified color.
+
+        Args:
+            square (tuple): The (row, col) position of the hexagon.
+            by_color (str): The color of the attacking pieces.
+
+        Returns:
+            bool: True if a piece of by_color attacks the hexagon, False otherwise.
+        """
+        return self._is_index_attacked(POS_IDX[square], by_color)
+
+    def in_check(self, color):
+        """
+        Checks if the specified color is in check.
+
+        Args:
+            color (str): The color of the player to check for check.
+
+        Returns:
+            bool: True if the specified color is in check, False otherwise.
+        """
+        kings = self.masks[PIECE_NAMES[color][5]]
+        if not kings:
+            return False
+        return self._is_index_attacked((kings & -kings).bit_length() - 1, 'black' if color == 'white' else 'white')
+
+    def print_hexboard(self):
+        """
+        Prints the current state of the board, see HexBoard.print_hexboard.
+        """
+        for row in range(21):
+            line = ""
+            for col in range(11):
+                index = POS_IDX.get((row, col))
+                if index is None:
+                    line += " "
+                elif self.squares[index] is not None:
+                    line += self.squares[index].name
+                else:
+                    line += "-"
+            print(line)
+
+    def decode_move(self, code):
+        """
+        Converts a move code back into a Move object on the current position, see HexBoard.decode_move.
+        """
+        return packed_move(self.squares[code & SQUARE_MASK], code, self.squares[code >> TARGET_SHIFT & SQUARE_MASK])
+
+    # Helpers that only use the board API above are shared with HexBoard.
+    # No position cache is kept, so the uncached game over detection is shared rather than is_game_over
+    is_game_over = HexBoard._detect_game_over
+    position_key = HexBoard.position_key
+    _reset_pieces = HexBoard._reset_pieces
+    action_to_tuple = HexBoard.action_to_tuple
+    index_to_piece = HexBoard.index_to_piece
+    legal_moves_to_actions = HexBoard.legal_moves_to_actions
+    action_to_move = HexBoard.action_to_move
+    random_black_move = HexBoard.random_black_move
@@ -0,0 +1,56 @@
+"""
+A pool of prebuilt boards, so the environment does not build a new board for every episode.
+"""
+from HexBoard import HexBoard
+
+class BoardPool():
+    """
+    Keeps free boards per position. A board handed out by acquire is reset to its position in place with reset_to,
+    which reuses its hexagons, its pieces and its position cache, as a board only ever holds the position it was
+    built for.
+
+    Attributes:
+        board_class (type): The board class, HexBoard or BitBoard.
+        free_boards (dict): The free boards per position.
+    """
+
+    def __init__(self, board_class=HexBoard, positions=()):
+        """
+        Creates the pool, with one prebuilt board per position.
+
+        Args:
+            board_class (type): The board class, HexBoard or BitBoard (default: HexBoard).
+            positions (iterable): The positions to prebuild a board for, "default" or puzzle names (default: none).
+        """
+        self.board_class = board_class
+        self.free_boards = {}
+        for position in positions:
+            self.release(board_class.for_position(str(position)))
+
+    def acquire(self, position):
+        """
+        Returns a board with a position and white to move, a free board of that position if there is one.
+
+        Args:
+            position (str): "default" or the name of a puzzle.
+
+        Returns:
+            HexBoard: The board, owned by the caller until it is released.
+        """
+        position = str(position)
+        boards = self.free_boards.get(position)
+        if boards:
+            hexboard = boards.pop()
+            hexboard.reset_to(position)
+            return hexboard
+        return self.board_class.for_position(position)
+
+    def release(self, hexboard):
+        """
+        Returns a board to the pool. Boards that were not set up with reset_to, or of another class, are dropped.
+
+        Args:
+            hexboard (HexBoard): The board, which the caller must not use afterwards.
+        """
+        if type(hexboard) is self.board_class and hexboard.reset_position is not None:
+            self.free_boards.setdefault(hexboard.reset_position, []).append(hexboard)
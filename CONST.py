@@ -1,3 +1,5 @@
+import os
+
 POSITIONS = [
     (0, 5),
     (1, 4), (1, 6),
@@ -29,5 +31,17 @@ PAWN_PROMOTION_HEXAGONS = [(5,0), (4,1), (3,2), (2,3), (1,4), (0,5), (1,6),
                          (15,0), (16,1), (17,2), (18,3), (19,4), (20,5), (19,6),
                          (18,7), (17,8), (16,9), (15,10)]
                                         
+PUZZLE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Puzzles")
+
 DEPTH = 0
 MOVE_LIMIT = 20
+
+ROOK_DIRECTIONS = [(-1, -1), (2, 0), (1, 1), (-1, 1), (-2, 0), (1, -1)]
+BISHOP_DIRECTIONS = [(-3, -1), (-3, 1), (3, -1), (3, 1), (0, 2), (0, -2)]
+QUEEN_DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+KING_DIRECTIONS = QUEEN_DIRECTIONS
+KNIGHT_DIRECTIONS = [
+    (-5, -1), (-4, -2), (-5, 1), (-4, 2),
+    (-1, 3), (1, 3), (1, -3), (-1, -3),
+    (5, -1), (4, -2), (5, 1), (4, 2)
+]
@@ -91,7 +91,7 @@ for i in range(n_games):
                 end_time = time.time()
 
             else:
-                if len(env.hexboard.get_legal_moves(env.current_player)) != 0:
+                if env.hexboard.has_legal_move(env.current_player):
                     action = minmax.find_min_max_move(env.hexboard, env.current_player, False)
                     if action is None:
                         done = True
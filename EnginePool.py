@@ -0,0 +1,171 @@
+"""
+A long-lived pool of engine processes for the min_max agent, see Agent.find_min_max_move.
+
+The pool is created once per game or session instead of once per move. A search sends the workers the notation of
+the position (see Notation.py) and the codes of the root moves instead of pickling the board and the agent per root
+move, and every worker keeps its board and the evaluation caches of its agent between searches.
+
+The root moves are split Young Brothers Wait style: the first root move, the best one by the move ordering, is
+searched alone, and only then are its younger brothers searched in parallel. The best root score found so far is
+shared between the workers, and every worker narrows the window of the root move it starts to it. A root move that
+fails low against a later root move's score and ties with the best score is searched again with the full window, so
+the search picks the same move as a serial search.
+"""
+import multiprocessing
+
+from HexBoard import HexBoard
+from BitBoard import BitBoard
+
+# The state of a worker process, set by _init_worker
+_worker = {}
+
+def _init_worker(agent, best_score):
+    """
+    Sets up a worker process.
+
+    Args:
+        agent (Agent): The min_max agent the worker searches with, a copy per process.
+        best_score (multiprocessing.Value): The best root score found so far in the current search.
+    """
+    _worker['agent'] = agent
+    _worker['best_score'] = best_score
+    _worker['notation'] = None
+    _worker['board'] = None
+
+def _worker_board(notation):
+    """
+    Returns the board of a worker with a position, rebuilt only when the position changes, as the board is back in
+    the position after every root move.
+
+    Args:
+        notation (str): The notation of the position.
+
+    Returns:
+        HexBoard: The board, a BitBoard if the agent uses bitboards.
+    """
+    if _worker['notation'] != notation:
+        hexboard = HexBoard.from_notation(notation)
+        if _worker['agent'].use_bitboard:
+            hexboard = BitBoard.from_hexboard(hexboard)
+        _worker['notation'] = notation
+        _worker['board'] = hexboard
+    return _worker['board']
+
+def _search_root_move(args):
+    """
+    Searches one root move in a worker process, with the window narrowed to the shared best root score.
+
+    A root move that is not better than the best score fails low, with a score that is only a bound, which may equal
+    the best score. A worker can read the best score after a later root move set it, so a root move that fails low
+    can tie with a later one. A better score is exact and becomes the shared best score.
+
+    Args:
+        args (tuple): The notation of the position, the move code, the maximizing flag of the root, the depth, the
+                      use_alpha_beta flag and whether to narrow the window to the shared best score.
+
+    Returns:
+        tuple: The move code, its score, whether the score is exact and the number of nodes searched.
+    """
+    notation, code, maximize, depth, use_alpha_beta, bounded = args
+    agent = _worker['agent']
+    best_score = _worker['best_score']
+    alpha = float("-inf")
+    beta = float("inf")
+    # After a mate the window would be empty, and its bounds meaningless, so the root move gets the full window
+    if use_alpha_beta and bounded and abs(best_score.value) != float("inf"):
+        if maximize:
+            alpha = best_score.value
+        else:
+            beta = best_score.value
+
+    hexboard = _worker_board(notation)
+    move = hexboard.decode_move(code)
+    agent.nodes_explored = 0
+    hexboard.move_piece(move)
+    score = agent.min_max(hexboard, not maximize, depth, alpha, beta, use_alpha_beta)
+    hexboard.undo_move(move)
+
+    # A score beyond the bound is exact, and a full window always gives an exact score
+    exact = score > alpha if maximize else score < beta
+    exact = exact or alpha == float("-inf") and beta == float("inf")
+    with best_score.get_lock():
+        if exact and (score > best_score.value if maximize else score < best_score.value):
+            best_score.value = score
+    return code, score, exact, agent.nodes_explored
+
+class EnginePool():
+    """
+    A pool of worker processes that search the root moves of the min_max agent, kept for a game or session.
+    Close it with close(), or use it as a context manager.
+
+    Attributes:
+        processes (int): The number of worker processes.
+        best_score (multiprocessing.Value): The best root score found so far in the current search.
+        pool (multiprocessing.Pool): The worker processes.
+    """
+
+    def __init__(self, agent, processes=None):
+        """
+        Starts the worker processes.
+
+        Args:
+            agent (Agent): The min_max agent to search with, copied to every worker, so it should not hold the pool.
+            processes (int): The number of worker processes, None for the number of cores (default: None).
+        """
+        self.processes = processes or multiprocessing.cpu_count()
+        self.best_score = multiprocessing.Value('d', 0.0)
+        self.pool = multiprocessing.Pool(self.processes, initializer=_init_worker, initargs=(agent, self.best_score))
+
+    def search(self, hexboard, moves, maximize, depth, use_alpha_beta=True):
+        """
+        Searches the root moves of a position, the first one alone and the others in parallel. A root move whose
+        bound ties with the best score, before the first root move with that exact score, is searched again with the
+        full window, as it may have the best score too and a serial search would pick it.
+
+        Args:
+            hexboard (HexBoard): The board, left unchanged, a HexBoard as it is sent as its notation.
+            moves (list): The legal root moves, best first.
+            maximize (bool): Whether the root maximizes the score.
+            depth (int): The depth of the min_max search below every root move.
+            use_alpha_beta (bool): Whether to use and share alpha-beta bounds (default: True).
+
+        Returns:
+            tuple: The (move code, score, exact) tuples in the order of the moves, where the score of a root move that
+                   is not exact is only an upper bound for a maximizing root and a lower bound otherwise, and the
+                   total number of nodes.
+        """
+        if not moves:
+            return [], 0
+        notation = hexboard.to_notation()
+        self.best_score.value = float("-inf") if maximize else float("inf")
+        args = [(notation, move.code, maximize, depth, use_alpha_beta, True) for move in moves]
+        # The eldest brother first, so its score bounds the searches of the younger brothers
+        results = [self.pool.apply(_search_root_move, (args[0],))]
+        results += self.pool.imap(_search_root_move, args[1:])
+        nodes = sum(result[3] for result in results)
+
+        best = max(score for _, score, _, _ in results) if maximize else min(score for _, score, _, _ in results)
+        for index, (code, score, exact, _) in enumerate(results):
+            if score != best:
+                continue
+            if exact:
+                break
+            code, score, exact, searched = self.pool.apply(_search_root_move, ((*args[index][:5], False),))
+            results[index] = (code, score, exact, searched)
+            nodes += searched
+            if score == best:
+                break
+        return [(code, score, exact) for code, score, exact, _ in results], nodes
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,108 @@
+"""
+Caches of evaluation results by position key, with a memory cap.
+
+EvalCache keeps the score of Evaluate.evaluate by the Zobrist key of the position, so a position reached again
+through another move order is not evaluated again. PawnHashTable keeps the pawn structure score by the pawn key,
+which only depends on the placement of the pawns, so it is shared by all positions with the same pawns.
+"""
+# Bytes per slot: the (key, score) tuple with its ints, measured with tracemalloc, and the pointer in the slot list
+ENTRY_BYTES = 130
+
+class EvalCache():
+    """
+    A hash table of scores by 64-bit key, with one always-replace slot per key hash.
+
+    Attributes:
+        mask (int): The slot count minus one, the slot count is a power of two.
+        slots (list): The (key, score) entries, None for empty slots.
+        filled (int): The number of used slots.
+        probes, hits, stores (int): The counters of probe calls, found entries and store calls.
+    """
+
+    def __init__(self, size_mb=4):
+        """
+        Creates an empty cache.
+
+        Args:
+            size_mb (float): The memory cap in megabytes (default: 4).
+        """
+        slots = 1
+        while slots * 2 * ENTRY_BYTES <= size_mb * 2 ** 20:
+            slots *= 2
+        self.mask = slots - 1
+        self.slots = [None] * slots
+        self.filled = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def probe(self, key):
+        """
+        Returns the score stored for a key.
+
+        Args:
+            key (int): The 64-bit key.
+
+        Returns:
+            int or float or None: The score, or None if there is none.
+        """
+        self.probes += 1
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+        return None
+
+    def store(self, key, score):
+        """
+        Stores the score of a key, replacing the entry in its slot.
+
+        Args:
+            key (int): The 64-bit key.
+            score (int or float): The score.
+        """
+        self.stores += 1
+        index = key & self.mask
+        if self.slots[index] is None:
+            self.filled += 1
+        self.slots[index] = (key, score)
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters.
+        """
+        self.slots = [None] * len(self.slots)
+        self.filled = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def stats(self):
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict: The probes, hits, hit rate, stores, and the fill level as a fraction of the slots.
+        """
+        return {
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+            'stores': self.stores,
+            'fill': self.filled / len(self.slots)
+        }
+
+class PawnHashTable(EvalCache):
+    """
+    An EvalCache of pawn structure scores by pawn key, see HexBoard.pawn_key. Far fewer pawn structures than positions
+    occur in a search, so the default size is smaller.
+    """
+
+    def __init__(self, size_mb=1):
+        """
+        Creates an empty table.
+
+        Args:
+            size_mb (float): The memory cap in megabytes (default: 1).
+        """
+        super().__init__(size_mb)
@@ -1,31 +1,107 @@
+from PieceSquare import promotion_steps
+
+# Pawn structure terms in Evaluate's piece values (a pawn is 10), on the files of the board (the columns)
+DOUBLED_PAWN_PENALTY = 4
+ISOLATED_PAWN_PENALTY = 3
+# The bonus of a passed pawn by the number of pushes to its promotion hexagon
+PASSED_PAWN_BONUS = (0, 20, 15, 10, 7, 5, 3, 2, 2, 2, 2)
+
+def static_score(hexboard):
+    """
+    Returns the score of a position without looking for the end of the game: the material and piece-square sums that
+    the board keeps up to date in move_piece and undo_move, see PieceSquare.py.
+
+    Args:
+        hexboard (HexBoard): The board, HexBoard or BitBoard.
+
+    Returns:
+        int: The score, relative to white.
+    """
+    return hexboard.material + hexboard.positional
+
+def pawn_structure_score(hexboard, pawn_table=None):
+    """
+    Returns the pawn structure score of a position, from the pawn table if it has the pawn key of the position.
+
+    Args:
+        hexboard (HexBoard): The board, HexBoard or BitBoard.
+        pawn_table (PawnHashTable): The cache of pawn structure scores by pawn key, or None (default: None).
+
+    Returns:
+        int: The score, relative to white, see compute_pawn_structure.
+    """
+    if pawn_table is None:
+        return compute_pawn_structure(hexboard)
+    pawn_key = hexboard.pawn_key
+    score = pawn_table.probe(pawn_key)
+    if score is None:
+        score = compute_pawn_structure(hexboard)
+        pawn_table.store(pawn_key, score)
+    return score
+
+def compute_pawn_structure(hexboard):
+    """
+    Computes the pawn structure score of a position, which only depends on the placement of the pawns:
+    - A penalty per pawn on a file behind another pawn of its color (doubled pawns).
+    - A penalty per pawn without a pawn of its color on a neighbouring file (isolated pawns).
+    - A bonus per pawn without an enemy pawn ahead of it on its file or a neighbouring file (passed pawns), larger
+      the closer it is to its promotion hexagon in PAWN_PROMOTION_HEXAGONS.
+
+    Args:
+        hexboard (HexBoard): The board, HexBoard or BitBoard.
+
+    Returns:
+        int: The score, relative to white.
+    """
+    files = {'white': {}, 'black': {}}
+    for color, pawn_name in (('white', 'p'), ('black', 'P')):
+        for row, col in hexboard.get_pieces_locations(color):
+            if hexboard.get_piece(row, col).name == pawn_name:
+                files[color].setdefault(col, []).append(row)
+
+    score = 0
+    for color, enemy, sign in (('white', 'black', 1), ('black', 'white', -1)):
+        own_files = files[color]
+        enemy_files = files[enemy]
+        for col, rows in own_files.items():
+            score -= sign * DOUBLED_PAWN_PENALTY * (len(rows) - 1)
+            if col - 1 not in own_files and col + 1 not in own_files:
+                score -= sign * ISOLATED_PAWN_PENALTY * len(rows)
+            enemy_rows = [row for file in (col - 1, col, col + 1) for row in enemy_files.get(file, ())]
+            for row in rows:
+                # White pawns move to the lower rows, black pawns to the higher rows
+                if all(enemy_row > row if color == 'white' else enemy_row < row for enemy_row in enemy_rows):
+                    score += sign * PASSED_PAWN_BONUS[promotion_steps((row, col), color)]
+    return score
+
 class Evaluate():
     """
     Class to evaluate the score of a given chess position on a hexagonal chessboard.
     """
 
-    def __init__(self, hexboard):
+    def __init__(self, hexboard, eval_cache=None, pawn_table=None):
+        """
+        Args:
+            hexboard (HexBoard): The board, HexBoard or BitBoard.
+            eval_cache (EvalCache): The cache of scores by Zobrist key, kept by the caller (default: None).
+            pawn_table (PawnHashTable): The cache of pawn structure scores by pawn key, kept by the caller
+                                        (default: None).
+        """
         self.hexboard = hexboard
+        self.eval_cache = eval_cache
+        self.pawn_table = pawn_table
         self.evaluation = 0
-        
-        self.pawn_scores = []
-        self.knight_scores = []
-        self.bishop_scores = []
-        self.rook_scores = []
-        self.queen_scores = []
-        self.knight_scores = []
 
-    def evaluate(self, color):
+    def terminal_score(self, color):
         """
-        Evaluate the score of the current chess position for the specified color.
+        Detects the end of the game, which needs a search for a legal move, unlike the static score.
 
         Args:
             color (str): The color of the player to evaluate the score for.
 
         Returns:
-            float: The score of the current chess position for the specified color.
+            float or None: inf if white won, -inf if black won, 0 for a draw, or None if the game is not over.
         """
-        score = 0
-        checkmate = False
         color = 'white' if color == 'black' else 'white'
         checkmate, winner = self.hexboard.is_game_over(color)
 
@@ -36,11 +112,31 @@ class Evaluate():
                 return float("-inf")
             else:
                 return 0
+        return None
+
+    def evaluate(self, color):
+        """
+        Evaluate the score of the current chess position for the specified color.
+        The score is read from the eval cache if it has the position, and stored in it otherwise.
+
+        Args:
+            color (str): The color of the player to evaluate the score for.
+
+        Returns:
+            float: The score of the current chess position for the specified color.
+        """
+        eval_cache = self.eval_cache
+        if eval_cache is not None:
+            key = self.hexboard.zobrist_key
+            score = eval_cache.probe(key)
+            if score is not None:
+                self.evaluation = score
+                return score
 
-        for row in self.hexboard.hexboard:
-            for col in row:
-                if col != None:
-                    if col.get_piece() != None:
-                        score += col.piece.value
-        self.evaluate = score
-        return score
\ No newline at end of file
+        score = self.terminal_score(color)
+        if score is None:
+            score = static_score(self.hexboard) + pawn_structure_score(self.hexboard, self.pawn_table)
+        if eval_cache is not None:
+            eval_cache.store(key, score)
+        self.evaluation = score
+        return score
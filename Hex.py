@@ -1,4 +1,6 @@
 class Hex():
+    __slots__ = ('row', 'col', 'piece')
+
     def __init__(self, row, col, piece):
         """
         Initializes a Hex object with the specified row, column, and piece.
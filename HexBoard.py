@@ -1,9 +1,111 @@
-from openpyxl import load_workbook
 import random
 
 from Hex import Hex
+from Move import *
 from CONST import *
+from Tables import *
 from Piece import *
+from Zobrist import *
+from PieceSquare import compute_scores
+from PositionCache import PositionCache
+from PuzzleStore import puzzle_records
+from Notation import format_notation, parse_notation
+
+def default_pieces():
+    """
+    Creates the pieces of the default setup, black on the top half of the board and white on the bottom half.
+
+    Returns:
+        list: A list of ((row, col), piece) tuples.
+    """
+    return [
+        ((0, 5), Bishop('black')),
+        ((1, 4), Queen('black')),
+        ((1, 6), King('black')),
+        ((2, 3), Knight('black')),
+        ((2, 5), Bishop('black')),
+        ((2, 7), Knight('black')),
+        ((3, 2), Rook('black')),
+        ((3, 8), Rook('black')),
+        ((4, 1), Pawn('black')),
+        ((4, 5), Bishop('black')),
+        ((4, 9), Pawn('black')),
+        ((5, 2), Pawn('black')),
+        ((5, 8), Pawn('black')),
+        ((6, 3), Pawn('black')),
+        ((6, 7), Pawn('black')),
+        ((7, 4), Pawn('black')),
+        ((7, 6), Pawn('black')),
+        ((8, 5), Pawn('black')),
+
+        ((20, 5), Bishop('white')),
+        ((19, 4), Queen('white')),
+        ((19, 6), King('white')),
+        ((18, 3), Knight('white')),
+        ((18, 5), Bishop('white')),
+        ((18, 7), Knight('white')),
+        ((17, 2), Rook('white')),
+        ((17, 8), Rook('white')),
+        ((16, 1), Pawn('white')),
+        ((16, 5), Bishop('white')),
+        ((16, 9), Pawn('white')),
+        ((15, 2), Pawn('white')),
+        ((15, 8), Pawn('white')),
+        ((14, 3), Pawn('white')),
+        ((14, 7), Pawn('white')),
+        ((13, 4), Pawn('white')),
+        ((13, 6), Pawn('white')),
+        ((12, 5), Pawn('white'))
+    ]
+
+def read_puzzle(puzzle):
+    """
+    Creates the pieces of a puzzle from the puzzle store, with the piece indices used by the action space.
+
+    Parameters:
+    - puzzle (str): The name of the puzzle to load, or the path of a puzzle file, see PuzzleStore.puzzle_records.
+
+    Returns:
+    - list: A list of ((row, col), piece) tuples.
+    """
+    class_mapping = {
+    'King': King,
+    'Knight': Knight,
+    'Bishop': Bishop,
+    'Pawn': Pawn,
+    'Queen': Queen,
+    'Rook': Rook
+    }
+    pieces = []
+    king_counter = 0
+    pawn_counter = 1
+    knight_counter = 9
+    bishop_counter = 11
+    rook_counter = 14
+    queen_counter = 16
+    for piece, color, cell, first_move in puzzle_records(puzzle):
+        new_piece = class_mapping[piece](color)
+        if piece == 'Pawn':
+            new_piece.has_moved = not first_move
+            new_piece.index = pawn_counter
+            pawn_counter += 1
+        elif piece == 'Knight':
+            new_piece.index = knight_counter
+            knight_counter += 1
+        elif piece == 'Bishop':
+            new_piece.index = bishop_counter
+            bishop_counter += 1
+        elif piece == 'Rook':
+            new_piece.index = rook_counter
+            rook_counter += 1
+        elif piece == 'Queen':
+            new_piece.index = queen_counter
+            queen_counter += 1
+        elif piece == 'King':
+            new_piece.index = king_counter
+            king_counter += 1
+        pieces.append((POSITIONS[cell], new_piece))
+    return pieces
 
 class HexBoard():
     """
@@ -11,6 +113,19 @@ class HexBoard():
 
     Attributes:
     - hexboard: A 2D list representing the hexagonal chess board.
+    - cells: A list of the Hex objects of the board, indexed by POS_IDX.
+    - piece_indices: Per color, the set of POS_IDX indices occupied by that color's pieces.
+    - king_indices: Per color, the set of POS_IDX indices occupied by that color's kings.
+    - side_to_move: The color to move, white after setting up a position and toggled by every move.
+    - zobrist_key: The 64-bit Zobrist key of the position, see Zobrist.py.
+    - pawn_key: The 64-bit key of the pawn placement, see Zobrist.compute_pawn_key.
+    - material: The sum of the piece values, relative to white.
+    - positional: The sum of the piece-square bonuses, relative to white, see PieceSquare.py.
+    - debug_zobrist: If True, move_piece and undo_move check the incremental key and scores against a full recompute.
+    - position_cache_size: The number of results kept in the position cache, 0 (the default) disables it.
+    - position_cache: The PositionCache of legal moves, check and game over results by position_key, or None.
+    - reset_position: The position of the last reset_to, or None.
+    - reset_pieces: The (index, piece, has_moved) tuples of reset_position, reused by the next reset to it.
     - random_puzzle: An integer representing the randomly generated puzzle number.
 
     Methods:
@@ -23,21 +138,33 @@ class HexBoard():
     - get_pieces_locations(color): Returns a list of locations of the chess pieces of the specified color.
     - get_king_location(color): Returns the location of the king of the specified color.
     - get_pseudo_legal_moves(color): Returns a list of pseudo-legal moves for the chess pieces of the specified color.
+    - position_key(): Returns the key of the piece placement, used by the position cache.
     - get_legal_moves(color): Returns a list of legal moves for the chess pieces of the specified color.
+    - get_capture_moves(color): Returns the legal captures and promotions of the specified color.
     - move_piece(move, final=False): Moves a chess piece to the target position.
     - undo_move(move): Undoes a move by restoring the initial position of the chess piece.
+    - is_square_attacked(square, by_color): Checks if a hexagon is attacked by the specified color.
     - in_check(color): Checks if the king of the specified color is in check.
     - is_game_over(color): Checks if the game is over for the specified color.
     - print_hexboard(): Prints the current state of the hexagonal chess board.
-    - load_puzzle(puzzle): Loads a puzzle from an Excel file and sets up the chess pieces accordingly.
+    - load_puzzle(puzzle): Loads a puzzle from the puzzle store and sets up the chess pieces accordingly.
+    - reset_to(position): Sets up a position in place, reusing the hexagons and the pieces.
+    - for_position(position): Creates a board with a position, without loading a random puzzle.
+    - from_notation(notation): Creates a board from a text notation, see Notation.py.
+    - to_notation(): Returns the text notation of the position.
     """
+    debug_zobrist = False
+    # Off by default: in the Deep.py game loop only 1 to 7% of the lookups hit, so the cache costs more than it saves,
+    # see Benchmark.py cache
+    position_cache_size = 0
+    reset_position = None
+    reset_pieces = ()
+
     def __init__(self):
         """
         Initializes a new instance of the HexBoard class.
         """
         self.hexboard = [[None for _ in range(11)] for _ in range(21)]
-        self._create_board()
-        self._setup_pieces()
         self.random_puzzle = random.randint(1, 12)
         self.load_puzzle(str(self.random_puzzle))
 
@@ -45,11 +172,72 @@ class HexBoard():
         """
         Creates the initial hexagonal board by iterating over predefined positions.
         Each position is assigned a Hex object and added to the hexboard.
+        The same Hex objects are kept in `cells`, indexed by POS_IDX, for the precomputed move tables.
         """
+        self.cells = []
         for position in POSITIONS:
             row, col = position
             hexagon = Hex(row, col, None)
             self.hexboard[row][col] = hexagon
+            self.cells.append(hexagon)
+        self.piece_indices = {'white': set(), 'black': set()}
+        self.king_indices = {'white': set(), 'black': set()}
+        self.side_to_move = 'white'
+        self.zobrist_key = 0
+        self.position_cache = PositionCache(self.position_cache_size) if self.position_cache_size else None
+
+    def __getstate__(self):
+        """
+        Returns the state to pickle, without the position cache.
+        """
+        state = self.__dict__.copy()
+        state['position_cache'] = None
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores a pickled board with an empty position cache, see __getstate__.
+        """
+        self.__dict__.update(state)
+        if self.position_cache_size:
+            self.position_cache = PositionCache(self.position_cache_size)
+
+    def _index_pieces(self):
+        """
+        Rebuilds the piece and king index sets, the Zobrist and pawn keys and the material and positional sums from the
+        pieces on the board.
+        Called after pieces are placed directly on the hexagons, move_piece and undo_move keep them up to date afterwards.
+        """
+        self.piece_indices = {'white': set(), 'black': set()}
+        self.king_indices = {'white': set(), 'black': set()}
+        for index, hexagon in enumerate(self.cells):
+            piece = hexagon.piece
+            if piece is not None:
+                self.piece_indices[piece.color].add(index)
+                if isinstance(piece, King):
+                    self.king_indices[piece.color].add(index)
+        squares = [hexagon.piece for hexagon in self.cells]
+        self.zobrist_key = compute_key(self.cells, self.side_to_move)
+        self.pawn_key = compute_pawn_key(squares)
+        self.material, self.positional = compute_scores(squares)
+
+    def _check_zobrist_key(self):
+        """
+        Checks the incremental Zobrist and pawn keys, material and positional sums against a full recompute, used when
+        debug_zobrist is set.
+
+        Raises:
+            AssertionError: If they differ.
+        """
+        expected_key = compute_key(self.cells, self.side_to_move)
+        if self.zobrist_key != expected_key:
+            raise AssertionError(f"Incremental Zobrist key {self.zobrist_key:016x} != recomputed {expected_key:016x}")
+        squares = [hexagon.piece for hexagon in self.cells]
+        if self.pawn_key != compute_pawn_key(squares):
+            raise AssertionError(f"Incremental pawn key {self.pawn_key:016x} != recomputed {compute_pawn_key(squares):016x}")
+        expected_scores = compute_scores(squares)
+        if (self.material, self.positional) != expected_scores:
+            raise AssertionError(f"Incremental scores {(self.material, self.positional)} != recomputed {expected_scores}")
     
     def _setup_pieces(self):
         """
@@ -63,43 +251,9 @@ class HexBoard():
         Returns:
             None
         """
-        self.hexboard[0][5].piece = Bishop('black')
-        self.hexboard[1][4].piece = Queen('black')
-        self.hexboard[1][6].piece = King('black')
-        self.hexboard[2][3].piece = Knight('black')
-        self.hexboard[2][5].piece = Bishop('black')
-        self.hexboard[2][7].piece = Knight('black')
-        self.hexboard[3][2].piece = Rook('black')
-        self.hexboard[3][8].piece = Rook('black')
-        self.hexboard[4][1].piece = Pawn('black')
-        self.hexboard[4][5].piece = Bishop('black')
-        self.hexboard[4][9].piece = Pawn('black')
-        self.hexboard[5][2].piece = Pawn('black')
-        self.hexboard[5][8].piece = Pawn('black')
-        self.hexboard[6][3].piece = Pawn('black')
-        self.hexboard[6][7].piece = Pawn('black')
-        self.hexboard[7][4].piece = Pawn('black')
-        self.hexboard[7][6].piece = Pawn('black')
-        self.hexboard[8][5].piece = Pawn('black')
-
-        self.hexboard[20][5].piece = Bishop('white')
-        self.hexboard[19][4].piece = Queen('white')
-        self.hexboard[19][6].piece = King('white')
-        self.hexboard[18][3].piece = Knight('white')
-        self.hexboard[18][5].piece = Bishop('white')
-        self.hexboard[18][7].piece = Knight('white')
-        self.hexboard[17][2].piece = Rook('white')
-        self.hexboard[17][8].piece = Rook('white')
-        self.hexboard[16][1].piece = Pawn('white')
-        self.hexboard[16][5].piece = Bishop('white')
-        self.hexboard[16][9].piece = Pawn('white')
-        self.hexboard[15][2].piece = Pawn('white')
-        self.hexboard[15][8].piece = Pawn('white')
-        self.hexboard[14][3].piece = Pawn('white')
-        self.hexboard[14][7].piece = Pawn('white')
-        self.hexboard[13][4].piece = Pawn('white')
-        self.hexboard[13][6].piece = Pawn('white')
-        self.hexboard[12][5].piece = Pawn('white')
+        for (row, col), piece in default_pieces():
+            self.hexboard[row][col].piece = piece
+        self._index_pieces()
 
     def get_piece(self, row, col):
         """
@@ -140,6 +294,7 @@ class HexBoard():
             raise ValueError("Invalid position")
         else:
             self.hexboard[row][col].piece = piece
+            self._index_pieces()
     
     def get_hexagon(self, row, col):
         """
@@ -169,16 +324,9 @@ class HexBoard():
         - color (str): The color of the pieces to search for.
 
         Returns:
-        - list: A list of tuples representing the locations of the pieces.
+        - list: A list of tuples representing the locations of the pieces, in board order.
         """
-        locations = []
-        for row in self.hexboard:
-            for hexagon in row:
-                if hexagon is not None:
-                    if hexagon.piece is not None:
-                        if hexagon.piece.color == color:
-                            locations.append((hexagon.row, hexagon.col))
-        return locations
+        return [POSITIONS[index] for index in sorted(self.piece_indices[color])]
     
     def get_king_location(self, color):
         """
@@ -189,14 +337,13 @@ class HexBoard():
 
         Returns:
         - tuple: A tuple containing the row and column coordinates of the king's location.
+                 If there are several kings of the color, the first one in board order is returned. None if there is no king.
 
         """
-        for row in self.hexboard:
-            for hexagon in row:
-                if hexagon is not None:
-                    if hexagon.piece is not None:
-                        if hexagon.piece.color == color and isinstance(hexagon.piece, King):
-                            return (hexagon.row, hexagon.col)
+        king_indices = self.king_indices[color]
+        if king_indices:
+            return POSITIONS[min(king_indices)]
+        return None
 
     def get_pseudo_legal_moves(self, color):
         """
@@ -210,30 +357,384 @@ class HexBoard():
 
         """
         legal_moves = []
-        locations = self.get_pieces_locations(color) 
-
-        for location in locations:
-            row, col = location
-            piece = self.get_piece(row, col)
-            legal_moves += piece._get_legal_moves(row, col, self)
+        cells = self.cells
+        for index in sorted(self.piece_indices[color]):
+            row, col = POSITIONS[index]
+            legal_moves += cells[index].piece._get_legal_moves(row, col, self)
         return legal_moves
     
+    def position_key(self):
+        """
+        Returns the key of the piece placement, the Zobrist key without the side to move.
+
+        The legal moves, check and game over results of a color only depend on the placement, so they are cached by
+        this key and the color. move_piece and undo_move update the Zobrist key, which moves the board to the entries
+        of the new position, so no entry has to be invalidated.
+
+        Returns:
+        - int: The 64-bit key.
+        """
+        if self.side_to_move == 'black':
+            return self.zobrist_key ^ BLACK_TO_MOVE_KEY
+        return self.zobrist_key
+
     def get_legal_moves(self, color):
         """
         Returns a list of legal moves for the specified color.
 
+        The moves are cached as move codes by position_key and decoded on a hit, so they refer to the pieces on the board.
+        The checkers and pinned pieces are found once along the rays of the king, see find_checks_and_pins.
+        In check the moves come from the evasion generator, see get_evasion_moves. Otherwise a move of another piece is
+        legal if it keeps a pinned piece on its pin line, and only king moves are tested against the board.
+        The double-step of a pawn lands on the single-step hexagon in this game, so it follows the single-step rule.
+
+        Parameters:
+        - color (str): The color of the player whose legal moves are to be determined.
+
+        Returns:
+        - list: A list of legal moves for the specified color, in the order of get_pseudo_legal_moves.
+
+        """
+        cache = self.position_cache
+        if cache is None:
+            return self._generate_legal_moves(color)
+
+        key = (self.position_key(), color)
+        codes = cache.lookup('legal_moves', key)
+        if codes is not None:
+            decode_move = self.decode_move
+            return [decode_move(code) for code in codes]
+        legal_moves = self._generate_legal_moves(color)
+        cache.store('legal_moves', key, tuple([move.code for move in legal_moves]))
+        return legal_moves
+
+    def _generate_legal_moves(self, color):
+        """
+        Generates the legal moves for the specified color, see get_legal_moves.
+
         Parameters:
         - color (str): The color of the player whose legal moves are to be determined.
 
         Returns:
         - list: A list of legal moves for the specified color.
+        """
+        king_indices = self.king_indices[color]
+        if not king_indices:
+            return self.get_pseudo_legal_moves(color)
+        if len(king_indices) > 1:
+            # Only the first king in board order is guarded, which moving another king can change
+            return self._filter_legal_moves(self.get_pseudo_legal_moves(color), color)
+
+        king_index = next(iter(king_indices))
+        checkers, check_lines, pins = self.find_checks_and_pins(king_index, color)
+        if checkers:
+            return list(self._generate_evasions(king_index, color, checkers, check_lines, pins))
+        return self._filter_pinned_moves(self.get_pseudo_legal_moves(color), king_index, color, None, pins)
+
+    def get_capture_moves(self, color):
+        """
+        Returns the legal captures and promotions of the specified color, for the quiescence search.
+
+        Only the captures and promotions are generated, and they are filtered with the checks and pins like
+        get_legal_moves. In check they are taken from the evasions.
+
+        Parameters:
+        - color (str): The color of the player to move.
+
+        Returns:
+        - list: The legal captures and promotions, in board order.
+        """
+        king_indices = self.king_indices[color]
+        if len(king_indices) == 1:
+            king_index = next(iter(king_indices))
+            checkers, check_lines, pins = self.find_checks_and_pins(king_index, color)
+            if checkers:
+                return [move for move in self.get_legal_moves(color) if move.code & CAPTURE_OR_PROMOTION_MASK]
+
+        captures = []
+        cells = self.cells
+        for index in sorted(self.piece_indices[color]):
+            captures += cells[index].piece._get_capture_moves(index, self)
+        if not king_indices:
+            return captures
+        if len(king_indices) > 1:
+            return self._filter_legal_moves(captures, color)
+        return self._filter_pinned_moves(captures, king_index, color, None, pins)
+
+    def get_evasion_moves(self, color):
+        """
+        Returns the legal moves of the specified color if its king is in check.
+
+        Parameters:
+        - color (str): The color of the player to move.
+
+        Returns:
+        - list or None: The legal moves, which are all evasions, or None if the color is not in check.
+
+        """
+        king_indices = self.king_indices[color]
+        if not king_indices:
+            return None
+        if len(king_indices) > 1:
+            if not self.in_check(color):
+                return None
+            return self._filter_legal_moves(self.get_pseudo_legal_moves(color), color)
+
+        king_index = next(iter(king_indices))
+        checkers, check_lines, pins = self.find_checks_and_pins(king_index, color)
+        if not checkers:
+            return None
+        return list(self._generate_evasions(king_index, color, checkers, check_lines, pins))
+
+    def iter_legal_moves(self, color):
+        """
+        Yields the legal moves for the specified color one piece at a time, in the order of get_legal_moves.
+
+        The checks and pins are found when iteration starts, so the board has to be in the same position whenever
+        the next move is requested. Moves may be made and undone in between.
+
+        Parameters:
+        - color (str): The color of the player whose legal moves are to be determined.
+
+        Yields:
+        - Move: The legal moves for the specified color.
+
+        """
+        king_indices = self.king_indices[color]
+        if len(king_indices) == 1:
+            king_index = next(iter(king_indices))
+            checkers, check_lines, pins = self.find_checks_and_pins(king_index, color)
+            if checkers:
+                yield from self._generate_evasions(king_index, color, checkers, check_lines, pins)
+                return
+
+        cells = self.cells
+        for index in sorted(self.piece_indices[color]):
+            row, col = POSITIONS[index]
+            moves = cells[index].piece._get_legal_moves(row, col, self)
+            if len(king_indices) == 1:
+                yield from self._filter_pinned_moves(moves, king_index, color, None, pins)
+            elif king_indices:
+                yield from self._filter_legal_moves(moves, color)
+            else:
+                yield from moves
+
+    def has_legal_move(self, color):
+        """
+        Checks if the specified color has a legal move, stopping at the first one found.
+
+        Parameters:
+        - color (str): The color of the player to move.
+
+        Returns:
+        - bool: True if the color has at least one legal move, False otherwise.
+
+        """
+        cache = self.position_cache
+        if cache is not None:
+            key = (self.position_key(), color)
+            found = cache.lookup('has_legal_move', key)
+            if found is None:
+                found = self._find_legal_move(color)
+                cache.store('has_legal_move', key, found)
+            return found
+        return self._find_legal_move(color)
+
+    def _find_legal_move(self, color):
+        """
+        Tests if the specified color has a legal move, see has_legal_move.
+        """
+        for _ in self.iter_legal_moves(color):
+            return True
+        return False
+
+    def _generate_evasions(self, king_index, color, checkers, check_lines, pins):
+        """
+        Generates the legal moves of a color in check: king moves to hexagons that are not attacked, and for a single
+        checker the captures of the checker and the interpositions on its check line.
+
+        In double check only the king moves. Otherwise the other pieces are only tried on the hexagons of the check line
+        they could reach on an empty board, see Tables.TARGET_ORDER, instead of generating all their moves.
+
+        Parameters:
+        - king_index (int): The POS_IDX index of the king.
+        - color (str): The color in check.
+        - checkers, check_lines, pins: The result of find_checks_and_pins for the king.
+
+        Yields:
+        - Move: The legal moves, in the order of get_pseudo_legal_moves.
+
+        """
+        cells = self.cells
+        opponent_color = 'black' if color == 'white' else 'white'
+        king_hexagon = cells[king_index]
+        king = king_hexagon.piece
+        single_check = len(checkers) == 1
+        if single_check:
+            checker_index = checkers[0]
+            checker = cells[checker_index].piece
+            evasions = check_lines[0]
+        pawn_pushes = PAWN_PUSHES[color]
+        pawn_captures = PAWN_CAPTURES[color]
+
+        for index in sorted(self.piece_indices[color]):
+            if index == king_index:
+                row, col = POSITIONS[index]
+                king_hexagon.piece = None
+                king_moves = [move for move in king._get_legal_moves(row, col, self)
+                              if not self._is_index_attacked(move.code >> TARGET_SHIFT & SQUARE_MASK, opponent_color)]
+                king_hexagon.piece = king
+                yield from king_moves
+                continue
+            if not single_check:
+                continue
+
+            piece = cells[index].piece
+            pin_line = pins.get(index)
+            type_code = piece.kind.type_code
+            base = index | type_code << MOVED_SHIFT
+
+            if type_code == 1:
+                # Pawns push onto an interposition hexagon or capture the checker, in the order of Pawn._get_legal_moves
+                single, double = pawn_pushes[index]
+                if (single is not None and single in evasions and cells[single].piece is None
+                        and (pin_line is None or single in pin_line)):
+                    code = base | single << TARGET_SHIFT
+                    if single in PROMOTION_INDICES:
+                        code |= PROMOTION_FLAG
+                    yield packed_move(piece, code, None)
+                    if piece.first_move and double is not None and cells[double].piece is None:
+                        yield packed_move(piece, code, None)
+                if checker_index in pawn_captures[index] and (pin_line is None or checker_index in pin_line):
+                    code = base | checker_index << TARGET_SHIFT | checker.kind.type_code << CAPTURED_SHIFT
+                    if checker_index in PROMOTION_INDICES:
+                        code |= PROMOTION_FLAG
+                    yield packed_move(piece, code, checker)
+                continue
+
+            order = TARGET_ORDER[type_code][index]
+            targets = [target for target in evasions if target in order]
+            if len(targets) > 1:
+                targets.sort(key=order.__getitem__)
+            for target in targets:
+                if pin_line is not None and target not in pin_line:
+                    continue
+                if type_code != 2 and any(cells[between].piece is not None for between in BETWEEN[index][target]):
+                    continue
+                if target == checker_index:
+                    code = base | target << TARGET_SHIFT | checker.kind.type_code << CAPTURED_SHIFT
+                    yield packed_move(piece, code, checker)
+                else:
+                    yield packed_move(piece, base | target << TARGET_SHIFT, None)
+
+    def _filter_pinned_moves(self, moves, king_index, color, evasions, pins):
+        """
+        Returns the pseudo-legal moves that are legal, given the checks and pins of the king.
+
+        Parameters:
+        - moves (list): The pseudo-legal moves of the color.
+        - king_index (int): The POS_IDX index of the king.
+        - color (str): The color of the player to move.
+        - evasions (tuple or None): The hexagons a move of another piece than the king has to land on, None if not in check.
+        - pins (dict): The pin line per pinned piece, see find_checks_and_pins.
+
+        Returns:
+        - list: The legal moves, in the given order.
 
         """
+        opponent_color = 'black' if color == 'white' else 'white'
         legal_moves = []
-        moves = self.get_pseudo_legal_moves(color)
+        king_hexagon = self.cells[king_index]
+        king = king_hexagon.piece
+        for move in moves:
+            code = move.code
+            initial_index = code & SQUARE_MASK
+            target_index = code >> TARGET_SHIFT & SQUARE_MASK
+            if initial_index == king_index:
+                king_hexagon.piece = None
+                attacked = self._is_index_attacked(target_index, opponent_color)
+                king_hexagon.piece = king
+                if not attacked:
+                    legal_moves.append(move)
+                continue
+            if evasions is not None and target_index not in evasions:
+                continue
+            pin_line = pins.get(initial_index)
+            if pin_line is not None and target_index not in pin_line:
+                continue
+            legal_moves.append(move)
+        return legal_moves
+
+    def find_checks_and_pins(self, king_index, color):
+        """
+        Finds the pieces that give check to a king and the pieces of its color pinned to it.
+
+        Walks the 12 rook and bishop rays out of the king hexagon once. An enemy slider that is the first piece on a ray
+        gives check, and one behind exactly one piece of the king's color pins that piece.
+        Knights, pawns and a king next to the king are checked by looking at the hexagons they would attack from.
+
+        Parameters:
+        - king_index (int): The POS_IDX index of the king.
+        - color (str): The color of the king.
+
+        Returns:
+        - tuple: The indices of the checking pieces, per checking piece the tuple of hexagons that resolve its check
+                 (the checker and the hexagons between it and the king), and a dict from the index of each pinned piece
+                 to the tuple of hexagons it may move to (the hexagons between the king and the pinner, and the pinner).
+        """
+        cells = self.cells
+        checkers = []
+        check_lines = []
+        pins = {}
+
+        for rays, sliders in ((ROOK_RAYS[king_index], (Rook, Queen)), (BISHOP_RAYS[king_index], (Bishop, Queen))):
+            for ray in rays:
+                pinned_index = None
+                for distance, target in enumerate(ray):
+                    piece = cells[target].piece
+                    if piece is None:
+                        continue
+                    if piece.color == color:
+                        if pinned_index is not None:
+                            break
+                        pinned_index = target
+                        continue
+                    if isinstance(piece, sliders):
+                        if pinned_index is None:
+                            checkers.append(target)
+                            check_lines.append(ray[:distance + 1])
+                        else:
+                            pins[pinned_index] = ray[:distance + 1]
+                    break
+
+        for targets, attacker in ((KNIGHT_LEAPS[king_index], Knight), (KING_STEPS[king_index], King),
+                                  (PAWN_CAPTURES[color][king_index], Pawn)):
+            for target in targets:
+                piece = cells[target].piece
+                if piece is not None and piece.color != color and isinstance(piece, attacker):
+                    checkers.append(target)
+                    check_lines.append((target,))
+
+        return checkers, check_lines, pins
+
+    def _filter_legal_moves(self, moves, color):
+        """
+        Returns the moves that do not leave the king in check, by playing every move and testing the king hexagon.
+
+        Parameters:
+        - moves (list): The pseudo-legal moves of the color.
+        - color (str): The color of the player to move.
+
+        Returns:
+        - list: The legal moves, in the given order.
+
+        """
+        legal_moves = []
+        opponent_color = 'black' if color == 'white' else 'white'
         for move in moves:
             self.move_piece(move)
-            if not self.in_check(color):
+            king_location = self.get_king_location(color)
+            if king_location is None or not self.is_square_attacked(king_location, opponent_color):
                 legal_moves.append(move)
             self.undo_move(move)
         return legal_moves
@@ -252,25 +753,57 @@ class HexBoard():
         Raises:
             None
         """
-        initial = move.initial
-        target = move.target
         piece = move.piece
-        enemy_piece = move.enemy_piece
-        initial_row, initial_col = initial
-        target_row, target_col = target
-
-        self.hexboard[initial_row][initial_col].piece = None
-        self.hexboard[target_row][target_col].piece = piece
-
-        if piece.name == 'p' or piece.name == 'P':
+        code = move.code
+        initial_index = code & SQUARE_MASK
+        target_index = code >> TARGET_SHIFT & SQUARE_MASK
+        initial_hexagon = self.cells[initial_index]
+        target_hexagon = self.cells[target_index]
+
+        key = self.zobrist_key ^ BLACK_TO_MOVE_KEY ^ piece.zobrist_keys[initial_index]
+        positional = self.positional - piece.square_scores[initial_index]
+
+        captured_piece = target_hexagon.piece
+        if captured_piece is not None:
+            key ^= captured_piece.zobrist_keys[target_index]
+            positional -= captured_piece.square_scores[target_index]
+            self.material -= captured_piece.value
+            if captured_piece.name in PAWN_KEYS:
+                self.pawn_key ^= PAWN_KEYS[captured_piece.name][target_index]
+            self.piece_indices[captured_piece.color].discard(target_index)
+            if isinstance(captured_piece, King):
+                self.king_indices[captured_piece.color].discard(target_index)
+
+        initial_hexagon.piece = None
+        target_hexagon.piece = piece
+        own_indices = self.piece_indices[piece.color]
+        own_indices.discard(initial_index)
+        own_indices.add(target_index)
+
+        if isinstance(piece, King):
+            king_indices = self.king_indices[piece.color]
+            king_indices.discard(initial_index)
+            king_indices.add(target_index)
+        elif piece.name == 'p' or piece.name == 'P':
             if final:
                 piece.has_moved = True
-            if target in PAWN_PROMOTION_HEXAGONS:
-                piece_index = self.hexboard[target_row][target_col].piece.index
-                self.hexboard[target_row][target_col].piece = Queen(piece.color)
-                self.hexboard[target_row][target_col].piece.index = piece_index
+            pawn_keys = PAWN_KEYS[piece.name]
+            if code & PROMOTION_FLAG:
+                target_hexagon.piece = Queen(piece.color)
+                target_hexagon.piece.index = piece.index
+                self.material += target_hexagon.piece.value - piece.value
+                self.pawn_key ^= pawn_keys[initial_index]
+            else:
+                self.pawn_key ^= pawn_keys[initial_index] ^ pawn_keys[target_index]
             piece.total_moves += 1
 
+        promoted_piece = target_hexagon.piece
+        self.zobrist_key = key ^ promoted_piece.zobrist_keys[target_index]
+        self.positional = positional + promoted_piece.square_scores[target_index]
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+        if self.debug_zobrist:
+            self._check_zobrist_key()
+
     def undo_move(self, move):
         """
         Undoes a move by restoring the initial state of the board.
@@ -281,27 +814,123 @@ class HexBoard():
         Returns:
             None
         """
-        initial = move.initial
-        target = move.target
         piece = move.piece
         enemy_piece = move.enemy_piece
-        initial_row, initial_col = initial
-        target_row, target_col = target
-
-        self.hexboard[initial_row][initial_col].piece = piece
-        self.hexboard[target_row][target_col].piece = None
-
+        code = move.code
+        initial_index = code & SQUARE_MASK
+        target_index = code >> TARGET_SHIFT & SQUARE_MASK
+
+        target_hexagon = self.cells[target_index]
+        moved_piece = target_hexagon.piece
+        key = self.zobrist_key ^ BLACK_TO_MOVE_KEY
+        key ^= moved_piece.zobrist_keys[target_index]
+        key ^= piece.zobrist_keys[initial_index]
+        positional = self.positional - moved_piece.square_scores[target_index] + piece.square_scores[initial_index]
+        if moved_piece is not piece:
+            self.material -= moved_piece.value - piece.value
         if enemy_piece is not None:
-            self.hexboard[target_row][target_col].piece = enemy_piece
+            key ^= enemy_piece.zobrist_keys[target_index]
+            positional += enemy_piece.square_scores[target_index]
+            self.material += enemy_piece.value
+            if enemy_piece.name in PAWN_KEYS:
+                self.pawn_key ^= PAWN_KEYS[enemy_piece.name][target_index]
+        self.zobrist_key = key
+        self.positional = positional
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+
+        self.cells[initial_index].piece = piece
+        target_hexagon.piece = enemy_piece
+        own_indices = self.piece_indices[piece.color]
+        own_indices.discard(target_index)
+        own_indices.add(initial_index)
 
-        if piece.name == 'p' or piece.name == 'P':
-            if target_row == 0 or target_row == 20:
-                self.hexboard[initial_row][initial_col].piece = Pawn(piece.color)
+        if enemy_piece is not None:
+            self.piece_indices[enemy_piece.color].add(target_index)
+            if isinstance(enemy_piece, King):
+                self.king_indices[enemy_piece.color].add(target_index)
+
+        if isinstance(piece, King):
+            king_indices = self.king_indices[piece.color]
+            king_indices.discard(target_index)
+            king_indices.add(initial_index)
+        elif piece.name == 'p' or piece.name == 'P':
+            pawn_keys = PAWN_KEYS[piece.name]
+            if moved_piece is piece:
+                self.pawn_key ^= pawn_keys[initial_index] ^ pawn_keys[target_index]
+            else:
+                self.pawn_key ^= pawn_keys[initial_index]
             piece.total_moves -= 1
 
             if piece.total_moves == 0:
                 piece.has_moved = False
 
+        if self.debug_zobrist:
+            self._check_zobrist_key()
+
+    def is_square_attacked(self, square, by_color):
+        """
+        Checks if a hexagon is attacked by any piece of the specified color.
+
+        Looks outward from the hexagon along the slider rays, knight leaps, king steps and pawn capture hexagons,
+        stopping every ray at the first piece it meets.
+
+        Args:
+            square (tuple): The (row, col) position of the hexagon.
+            by_color (str): The color of the attacking pieces.
+
+        Returns:
+            bool: True if a piece of by_color attacks the hexagon, False otherwise.
+        """
+        return self._is_index_attacked(POS_IDX[square], by_color)
+
+    def _is_index_attacked(self, index, by_color):
+        """
+        Checks if a hexagon is attacked by any piece of the specified color, see is_square_attacked.
+
+        Args:
+            index (int): The POS_IDX index of the hexagon.
+            by_color (str): The color of the attacking pieces.
+
+        Returns:
+            bool: True if a piece of by_color attacks the hexagon, False otherwise.
+        """
+        cells = self.cells
+
+        for ray in ROOK_RAYS[index]:
+            for target in ray:
+                piece = cells[target].piece
+                if piece is not None:
+                    if piece.color == by_color and isinstance(piece, (Rook, Queen)):
+                        return True
+                    break
+
+        for ray in BISHOP_RAYS[index]:
+            for target in ray:
+                piece = cells[target].piece
+                if piece is not None:
+                    if piece.color == by_color and isinstance(piece, (Bishop, Queen)):
+                        return True
+                    break
+
+        for target in KNIGHT_LEAPS[index]:
+            piece = cells[target].piece
+            if piece is not None and piece.color == by_color and isinstance(piece, Knight):
+                return True
+
+        for target in KING_STEPS[index]:
+            piece = cells[target].piece
+            if piece is not None and piece.color == by_color and isinstance(piece, King):
+                return True
+
+        # A pawn attacks the hexagon from where a pawn of the other color would capture
+        pawn_sources = PAWN_CAPTURES['black' if by_color == 'white' else 'white'][index]
+        for target in pawn_sources:
+            piece = cells[target].piece
+            if piece is not None and piece.color == by_color and isinstance(piece, Pawn):
+                return True
+
+        return False
+
     def in_check(self, color):
         """
         Checks if the specified color is in check.
@@ -312,20 +941,26 @@ class HexBoard():
         Returns:
             bool: True if the specified color is in check, False otherwise.
         """
+        cache = self.position_cache
+        if cache is not None:
+            key = (self.position_key(), color)
+            checked = cache.lookup('in_check', key)
+            if checked is None:
+                checked = self._is_checked(color)
+                cache.store('in_check', key, checked)
+            return checked
+        return self._is_checked(color)
+
+    def _is_checked(self, color):
+        """
+        Tests if the king of the specified color is attacked, see in_check.
+        """
         king_location = self.get_king_location(color)
+        if king_location is None:
+            return False
 
         opponent_color = 'black' if color == 'white' else 'white'
-        opponent_locations = self.get_pieces_locations(opponent_color)
-
-        for location in opponent_locations:
-            piece = self.get_piece(*location)
-            if piece is not None:
-                legal_moves = piece._get_legal_moves(*location, self)
-                for move in legal_moves:
-                    if move.target == king_location:
-                        return True
-
-        return False
+        return self.is_square_attacked(king_location, opponent_color)
  
     def is_game_over(self, color):
         """
@@ -339,17 +974,29 @@ class HexBoard():
                    If the game is over, the boolean value is True and the string can be 'black' (if white is in checkmate), 'white' (if black is in checkmate),
                    or 'remise' (if the game is a draw). If the game is not over, the boolean value is False and the string is an empty string.
         """
-        if self.in_check('white'):
-            legal_moves = self.get_legal_moves('white')
-            if len(legal_moves) == 0:
-                return (True, 'black')
-
-        if self.in_check('black'):
-            legal_moves = self.get_legal_moves('black')
-            if len(legal_moves) == 0:
-                return (True, 'white')
-        
-        if len(self.get_legal_moves(color)) == 0:
+        cache = self.position_cache
+        if cache is not None:
+            key = (self.position_key(), color)
+            result = cache.lookup('game_over', key)
+            if result is None:
+                result = self._detect_game_over(color)
+                cache.store('game_over', key, result)
+            return result
+        return self._detect_game_over(color)
+
+    def _detect_game_over(self, color):
+        """
+        Detects the end of the game for the specified color, see is_game_over.
+        """
+        # One check test per side, and one test for a legal move per side in check and for the color
+        checked = []
+        for side, winner in (('white', 'black'), ('black', 'white')):
+            if self.in_check(side):
+                if not self.has_legal_move(side):
+                    return (True, winner)
+                checked.append(side)
+
+        if color not in checked and not self.has_legal_move(color):
             return (True, 'remise')
 
         return (False, "")
@@ -376,64 +1023,113 @@ class HexBoard():
 
     def load_puzzle(self, puzzle):
         """
-        Loads a puzzle from an Excel file and populates the hexagonal chess board with the puzzle's pieces.
+        Loads a puzzle from the puzzle store and populates the hexagonal chess board with the puzzle's pieces, see PuzzleStore.py.
 
         Parameters:
-        - puzzle (str): The name of the puzzle to load.
+        - puzzle (str): The name of the puzzle to load, or the path of a puzzle file.
 
         Returns:
         - None
         """
-        class_mapping = {
-        'King': King,
-        'Knight': Knight,
-        'Bishop': Bishop,
-        'Pawn': Pawn,
-        'Queen': Queen,
-        'Rook': Rook
-        }
         self._create_board()
-        filepath = f"puzzles/{puzzle}.xlsx"
-        workbook = load_workbook(filepath, data_only=True)
-        data = []
-        king_counter = 0
-        pawn_counter = 1
-        knight_counter = 9
-        bishop_counter = 11
-        rook_counter = 14
-        queen_counter = 16
-        i=0
-        for row in workbook.active.iter_rows(values_only=True):
-            if i != 0:
-                data.append(row)
-            i+=1
-        for row in data:
-            piece, color, row, col, first_move = row
-            self.hexboard[row][col].piece = class_mapping[piece](color)
-            if piece == 'Pawn':
-                if first_move == 'True':
-                    self.hexboard[row][col].piece.has_moved = False
-                    self.hexboard[row][col].piece.index = pawn_counter
-                    pawn_counter += 1
-                else:
-                    self.hexboard[row][col].piece.has_moved = True
-                    self.hexboard[row][col].piece.index = pawn_counter
-                    pawn_counter += 1
-            elif piece == 'Knight':
-                self.hexboard[row][col].piece.index = knight_counter
-                knight_counter += 1
-            elif piece == 'Bishop':
-                self.hexboard[row][col].piece.index = bishop_counter
-                bishop_counter += 1
-            elif piece == 'Rook':
-                self.hexboard[row][col].piece.index = rook_counter
-                rook_counter += 1
-            elif piece == 'Queen':
-                self.hexboard[row][col].piece.index = queen_counter
-                queen_counter += 1
-            elif piece == 'King':
-                self.hexboard[row][col].piece.index = king_counter
-                king_counter += 1
+        for (row, col), piece in read_puzzle(puzzle):
+            self.hexboard[row][col].piece = piece
+        self._index_pieces()
+
+    def _reset_pieces(self, position):
+        """
+        Returns the pieces of a position for reset_to, reusing the piece objects of the last reset to the same position.
+        The pawns get back the state they had when the position was set up.
+
+        Parameters:
+        - position (str): "default" or the name of a puzzle.
+
+        Returns:
+        - list: A list of (POS_IDX index, piece, has_moved) tuples, has_moved is None for other pieces than pawns.
+        """
+        if position != self.reset_position:
+            pieces = default_pieces() if position == "default" else read_puzzle(position)
+            self.reset_pieces = [(POS_IDX[location], piece, piece.has_moved if isinstance(piece, Pawn) else None)
+                                 for location, piece in pieces]
+            self.reset_position = position
+        else:
+            for _, piece, has_moved in self.reset_pieces:
+                if has_moved is not None:
+                    piece.has_moved = has_moved
+                    piece.total_moves = 0
+                    piece.en_passant = False
+        return self.reset_pieces
+
+    def reset_to(self, position):
+        """
+        Sets up a position in place, with white to move.
+
+        The hexagons and the position cache are kept, and so are the pieces when the board was last reset to the same
+        position. This is much cheaper than building a new board, see BoardPool.py.
+
+        Parameters:
+        - position (str): "default" or the name of a puzzle.
+        """
+        for hexagon in self.cells:
+            hexagon.piece = None
+        cells = self.cells
+        for index, piece, _ in self._reset_pieces(str(position)):
+            cells[index].piece = piece
+        self.side_to_move = 'white'
+        self._index_pieces()
+
+    @classmethod
+    def for_position(cls, position):
+        """
+        Creates a board with a position, without loading a random puzzle as HexBoard() does.
+
+        Parameters:
+        - position (str): "default" or the name of a puzzle.
+
+        Returns:
+        - HexBoard: The new board.
+        """
+        hexboard = cls.__new__(cls)
+        hexboard.hexboard = [[None for _ in range(11)] for _ in range(21)]
+        hexboard._create_board()
+        hexboard.random_puzzle = None
+        hexboard.reset_to(position)
+        return hexboard
+
+    @classmethod
+    def from_notation(cls, notation):
+        """
+        Creates a board from a text notation, see Notation.py.
+
+        Parameters:
+        - notation (str): The notation of the position.
+
+        Returns:
+        - HexBoard: The board with the position and side to move of the notation.
+
+        Raises:
+        - ValueError: If the notation is malformed.
+        """
+        pieces, side_to_move = parse_notation(notation)
+        hexboard = cls.__new__(cls)
+        hexboard.hexboard = [[None for _ in range(11)] for _ in range(21)]
+        hexboard._create_board()
+        hexboard.random_puzzle = None
+        cells = hexboard.cells
+        for index, piece in pieces:
+            cells[index].piece = piece
+        hexboard.side_to_move = side_to_move
+        hexboard._index_pieces()
+        return hexboard
+
+    def to_notation(self):
+        """
+        Returns the text notation of the position, see Notation.py.
+
+        Returns:
+        - str: The notation.
+        """
+        return format_notation([hexagon.piece for hexagon in self.cells], self.side_to_move)
 
     def action_to_tuple(self, output):
         """
@@ -505,8 +1201,21 @@ class HexBoard():
             piece = self.get_piece(row, col)
             if piece != None:
                 if piece.index == index:
-                    return Move(piece, location, target)
+                    return Move(piece, location, target, self.get_piece(*target))
                 
+    def decode_move(self, code):
+        """
+        Converts a move code back into a Move object on the current position.
+
+        Parameters:
+        - code (int): The move code, see Move.encode_move.
+
+        Returns:
+        - Move: The move, with the piece and the enemy piece taken from the board.
+
+        """
+        return packed_move(self.cells[code & SQUARE_MASK].piece, code, self.cells[code >> TARGET_SHIFT & SQUARE_MASK].piece)
+
     def random_black_move(self):
         """
         Selects a random legal move for the black player.
@@ -1,7 +1,10 @@
+import random
 import gym
 from gym import spaces
 import numpy as np
 from HexBoard import HexBoard
+from BitBoard import BitBoard
+from BoardPool import BoardPool
 from CONST import POSITIONS
 
 class HexagonalChessEnv(gym.Env):
@@ -12,6 +15,8 @@ class HexagonalChessEnv(gym.Env):
 
     Attributes:
         hexboard (HexBoard): The hexagonal chess board.
+        board_class (type): The board backend, HexBoard or BitBoard.
+        board_pool (BoardPool): The prebuilt boards of the puzzles, reset in place for every episode.
         valid_positions (list): List of valid positions on the hexagonal chess board.
         position_to_index (dict): Mapping of positions to their corresponding indices.
         index_to_position (dict): Mapping of indices to their corresponding positions.
@@ -20,18 +25,27 @@ class HexagonalChessEnv(gym.Env):
         current_player (str): The current player ('white' or 'black').
 
     Methods:
-        __init__(): Initializes the HexagonalChessEnv object.
+        __init__(use_bitboard=False): Initializes the HexagonalChessEnv object.
         reset(): Resets the environment to its initial state.
+        _acquire_board(): Takes a board with a random puzzle from the board pool.
         step(action): Takes a step in the environment given an action.
         _get_observation(): Returns the current observation of the environment.
         _piece_to_int(piece): Converts a chess piece object to an integer representation.
         render(): Renders the current state of the hexagonal chess board.
     """
 
-    def __init__(self):
+    def __init__(self, use_bitboard=False):
+        """
+        Initializes the environment.
+
+        Args:
+            use_bitboard (bool): Whether to use the BitBoard backend instead of HexBoard (default: False).
+        """
         super(HexagonalChessEnv, self).__init__()
 
-        self.hexboard = HexBoard()
+        self.board_class = BitBoard if use_bitboard else HexBoard
+        self.board_pool = BoardPool(self.board_class, range(1, 13))
+        self.hexboard = self._acquire_board()
         
         self.valid_positions = POSITIONS
         self.position_to_index = {pos: idx for idx, pos in enumerate(self.valid_positions)}
@@ -51,11 +65,24 @@ class HexagonalChessEnv(gym.Env):
         Returns:
             observation (np.ndarray): The initial observation of the environment.
         """
-        self.hexboard = HexBoard()
+        self.board_pool.release(self.hexboard)
+        self.hexboard = self._acquire_board()
         self.current_player = 'white'
         observation = self._get_observation()
         return observation
 
+    def _acquire_board(self):
+        """
+        Takes a board with a random puzzle from the board pool.
+
+        Returns:
+            HexBoard: The board, with its puzzle number in random_puzzle.
+        """
+        puzzle = random.randint(1, 12)
+        hexboard = self.board_pool.acquire(puzzle)
+        hexboard.random_puzzle = puzzle
+        return hexboard
+
     def step(self, action):
         """
         Takes a step in the environment given an action.
@@ -101,13 +128,10 @@ class HexagonalChessEnv(gym.Env):
         """
         board_state = np.zeros(1092)
         pieces = ["p", "k", "b", "r", "q", "k", "P", "K", "B", "R", "Q", "K"]
-        for piece in pieces:
-            for row in self.hexboard.hexboard:
-                for hexagon in row:
-                    if hexagon is not None:
-                        if hexagon.piece is not None:
-                            if hexagon.piece.name == piece:
-                                board_state[self.position_to_index[(hexagon.row, hexagon.col)]] = 1
+        for color in ('white', 'black'):
+            for location in self.hexboard.get_pieces_locations(color):
+                if self.hexboard.get_piece(*location).name in pieces:
+                    board_state[self.position_to_index[location]] = 1
         return board_state
 
     def _piece_to_int(self, piece):
@@ -55,6 +55,7 @@ class Main():
 
                 print(move)
                 self.hexboard.print_hexboard()
+            self.player1.close_engine_pool()
             self.__init__()
 
         end_time = time.time()
@@ -1,27 +1,117 @@
+from CONST import POSITIONS, POS_IDX, PAWN_PROMOTION_HEXAGONS
+
+# Layout of a packed move code, hexagons are POS_IDX indices:
+# bits 0-6 initial hexagon, bits 7-13 target hexagon, bits 14-16 moved type, bits 17-19 captured type, bit 20 promotion
+SQUARE_MASK = 0x7F
+TARGET_SHIFT = 7
+MOVED_SHIFT = 14
+CAPTURED_SHIFT = 17
+TYPE_MASK = 0x7
+PROMOTION_FLAG = 1 << 20
+# The bits that are set for captures and promotions
+CAPTURE_OR_PROMOTION_MASK = TYPE_MASK << CAPTURED_SHIFT | PROMOTION_FLAG
+
+# Piece type numbers, 0 is reserved for "no piece" in the captured type field
+PIECE_TYPES = {'p': 1, 'n': 2, 'b': 3, 'r': 4, 'q': 5, 'k': 6,
+               'P': 1, 'N': 2, 'B': 3, 'R': 4, 'Q': 5, 'K': 6}
+
+PROMOTION_INDICES = frozenset(POS_IDX[position] for position in PAWN_PROMOTION_HEXAGONS)
+
+def encode_move(initial_index, target_index, moved_type, captured_type=0, promotion=False):
+    """
+    Packs a move into an int.
+
+    Args:
+        initial_index (int): The POS_IDX index of the initial hexagon.
+        target_index (int): The POS_IDX index of the target hexagon.
+        moved_type (int): The PIECE_TYPES number of the moving piece.
+        captured_type (int): The PIECE_TYPES number of the captured piece, 0 if none (default: 0).
+        promotion (bool): Whether the move promotes a pawn (default: False).
+
+    Returns:
+        int: The move code.
+    """
+    code = initial_index | target_index << TARGET_SHIFT | moved_type << MOVED_SHIFT | captured_type << CAPTURED_SHIFT
+    return code | PROMOTION_FLAG if promotion else code
+
+def packed_move(piece, code, enemy_piece=None, _new=object.__new__):
+    """
+    Creates a Move from a move code without going through the coordinates, used by the move generators.
+
+    Args:
+        piece (Piece): The piece being moved.
+        code (int): The move code, see encode_move.
+        enemy_piece (Piece): The enemy piece that is captured, if any.
+
+    Returns:
+        Move: The move.
+    """
+    move = _new(Move)
+    move.piece = piece
+    move.code = code
+    move.enemy_piece = enemy_piece
+    return move
+
 class Move:
     """
     Represents a move in the game of Hexagonal Chess.
 
+    The hexagons, piece types and promotion flag are packed into a single int, see encode_move.
+    Moves compare equal when they share the initial and target hexagon.
+
     Attributes:
         piece (Piece): The piece being moved.
-        initial (Hexagon): The initial hexagon from which the piece is moved.
-        target (Hexagon): The target hexagon to which the piece is moved.
+        code (int): The packed move code.
         enemy_piece (Piece): The enemy piece that is captured, if any.
+        initial (tuple): The (row, col) of the initial hexagon.
+        target (tuple): The (row, col) of the target hexagon.
     """
+    __slots__ = ('piece', 'code', 'enemy_piece')
 
     def __init__(self, piece, initial, target, enemy_piece=None):
+        moved_type = PIECE_TYPES[piece.name]
+        target_index = POS_IDX[target]
         self.piece = piece
-        self.initial = initial
-        self.target = target
+        self.code = encode_move(POS_IDX[initial], target_index, moved_type,
+                                PIECE_TYPES[enemy_piece.name] if enemy_piece is not None else 0,
+                                moved_type == 1 and target_index in PROMOTION_INDICES)
         self.enemy_piece = enemy_piece
 
+    @property
+    def initial(self):
+        return POSITIONS[self.code & SQUARE_MASK]
+
+    @property
+    def target(self):
+        return POSITIONS[self.code >> TARGET_SHIFT & SQUARE_MASK]
+
+    @property
+    def initial_index(self):
+        return self.code & SQUARE_MASK
+
+    @property
+    def target_index(self):
+        return self.code >> TARGET_SHIFT & SQUARE_MASK
+
+    @property
+    def moved_type(self):
+        return self.code >> MOVED_SHIFT & TYPE_MASK
+
+    @property
+    def captured_type(self):
+        return self.code >> CAPTURED_SHIFT & TYPE_MASK
+
+    @property
+    def is_promotion(self):
+        return bool(self.code & PROMOTION_FLAG)
+
     def __eq__(self, other):
-        return self.initial == other.initial and self.target == other.target
-    
+        return not (self.code ^ other.code) & (SQUARE_MASK | SQUARE_MASK << TARGET_SHIFT)
+
     def __str__(self):
         piece_str = f"Piece: {self.piece.color} {self.piece.name}" if self.piece else "Piece: None"
         initial_str = f"Initial hexagon: {self.initial}" if self.initial else "Initial hexagon: None"
         target_str = f"Target hexagon: {self.target}" if self.target else "Target hexagon: None"
         enemy_piece_str = f"Enemy piece: {self.enemy_piece.color} {self.enemy_piece.name}" if self.enemy_piece else "Enemy piece: None"
-        
+
         return f"{piece_str}, {initial_str}, {target_str}, {enemy_piece_str}"
@@ -0,0 +1,124 @@
+"""
+Move ordering for the alpha-beta searches, so the moves most likely to cause a cutoff are searched first.
+
+The order is: the transposition table move, captures and promotions by MVV-LVA (most valuable victim, least valuable
+attacker), the killer moves of the ply, and the other quiet moves by their history score. Everything is read from
+the move codes, so no pieces are compared.
+"""
+from Move import SQUARE_MASK, TARGET_SHIFT, MOVED_SHIFT, CAPTURED_SHIFT, TYPE_MASK, PROMOTION_FLAG
+
+# Ordering values by PIECE_TYPES number, index 0 is "no piece"
+TYPE_VALUES = (0, 1, 3, 3, 5, 9, 20)
+
+CAPTURE_SCORE = 1 << 24
+KILLER_SCORE = 1 << 22
+# History scores are halved when one reaches this, which keeps them below KILLER_SCORE
+HISTORY_LIMIT = 1 << 20
+KILLERS_PER_PLY = 2
+MAX_PLY = 128
+
+def mvv_lva_score(code):
+    """
+    Returns the ordering score of a capture or promotion, 0 for other moves.
+
+    Args:
+        code (int): The move code.
+
+    Returns:
+        int: CAPTURE_SCORE plus 16 times the value of the victim minus the value of the attacker, or 0.
+    """
+    victim = code >> CAPTURED_SHIFT & TYPE_MASK
+    if victim:
+        score = CAPTURE_SCORE + TYPE_VALUES[victim] * 16 - TYPE_VALUES[code >> MOVED_SHIFT & TYPE_MASK]
+        return score + TYPE_VALUES[5] * 16 if code & PROMOTION_FLAG else score
+    if code & PROMOTION_FLAG:
+        return CAPTURE_SCORE + TYPE_VALUES[5] * 16 - TYPE_VALUES[1]
+    return 0
+
+def order_captures_first(moves):
+    """
+    Returns the moves with the captures and promotions first by MVV-LVA, and the other moves in their order.
+
+    Args:
+        moves (list): The moves.
+
+    Returns:
+        list: The ordered moves.
+    """
+    return sorted(moves, key=lambda move: mvv_lva_score(move.code), reverse=True)
+
+class MoveOrderer():
+    """
+    Orders the moves of the nodes of one search, and learns from its cutoffs.
+
+    Attributes:
+        killers (list): Per ply, the codes of the last KILLERS_PER_PLY quiet moves that caused a cutoff.
+        history (dict): Per color, a list indexed by initial * 128 + target hexagon, which adds up depth * depth
+                        for every cutoff of a quiet move.
+    """
+
+    def __init__(self):
+        self.killers = [[None] * KILLERS_PER_PLY for _ in range(MAX_PLY)]
+        self.history = {'white': [0] * (128 * 128), 'black': [0] * (128 * 128)}
+
+    def new_search(self):
+        """
+        Forgets the killers, and halves the history scores so the last searches count the most.
+        """
+        self.killers = [[None] * KILLERS_PER_PLY for _ in range(MAX_PLY)]
+        for scores in self.history.values():
+            scores[:] = [score >> 1 for score in scores]
+
+    def order(self, moves, ply, color, table_move=None):
+        """
+        Sorts the moves of a node in place, best first.
+
+        Args:
+            moves (list): The legal moves of the node.
+            ply (int): The distance of the node to the root.
+            color (str): The color to move.
+            table_move (int): The code of the transposition table move, searched first, or None.
+        """
+        killers = self.killers[ply]
+        first_killer, second_killer = killers[0], killers[1]
+        history = self.history[color]
+
+        def score(move):
+            code = move.code
+            if code == table_move:
+                return CAPTURE_SCORE << 1
+            capture_score = mvv_lva_score(code)
+            if capture_score:
+                return capture_score
+            if code == first_killer:
+                return KILLER_SCORE + 1
+            if code == second_killer:
+                return KILLER_SCORE
+            return history[(code & SQUARE_MASK) << 7 | code >> TARGET_SHIFT & SQUARE_MASK]
+
+        moves.sort(key=score, reverse=True)
+
+    def record_cutoff(self, move, ply, color, depth):
+        """
+        Remembers a quiet move that caused a cutoff as a killer of its ply and in the history. Captures and
+        promotions are ordered by MVV-LVA and are not recorded.
+
+        Args:
+            move (Move): The move.
+            ply (int): The distance of the node to the root.
+            color (str): The color that played the move.
+            depth (int): The remaining depth of the node.
+        """
+        code = move.code
+        if mvv_lva_score(code):
+            return
+        killers = self.killers[ply]
+        if killers[0] != code:
+            killers[1] = killers[0]
+            killers[0] = code
+        history = self.history[color]
+        index = (code & SQUARE_MASK) << 7 | code >> TARGET_SHIFT & SQUARE_MASK
+        history[index] += depth * depth
+        if history[index] >= HISTORY_LIMIT:
+            for scores in self.history.values():
+                scores[:] = [score >> 1 for score in scores]
@@ -0,0 +1,102 @@
+"""
+Text notation of hexagonal chess positions, in the style of FEN.
+
+A notation has three fields separated by spaces:
+- The 91 hexagons in POSITIONS order. A piece is written as its name, lower case for white and upper case for black
+  as in Piece.name, and a run of empty hexagons as its length. A pawn is followed by "!" if it has not moved yet
+  (the first move flag of the puzzle files) and by "~" if its first_move is cleared.
+- The side to move, "w" or "b".
+- The piece indices used by the action space, in the order of the pieces in the first field, separated by commas.
+  A piece without an index is written as "-".
+
+For example puzzle 3, a white king and knight against a black king and pawn, is "38P16k3K12n18 w 1,1,0,9".
+"""
+from CONST import POSITIONS
+from Piece import Pawn, Knight, Bishop, Rook, Queen, King
+
+PIECE_CLASSES = {'p': Pawn, 'n': Knight, 'b': Bishop, 'r': Rook, 'q': Queen, 'k': King}
+SIDES = {'w': 'white', 'b': 'black'}
+SIDE_LETTERS = {'white': 'w', 'black': 'b'}
+
+def format_notation(squares, side_to_move):
+    """
+    Writes the notation of a position.
+
+    Args:
+        squares (list): The pieces on the board indexed by POS_IDX, None for empty hexagons.
+        side_to_move (str): The color to move.
+
+    Returns:
+        str: The notation.
+    """
+    parts = []
+    indices = []
+    empty = 0
+    for piece in squares:
+        if piece is None:
+            empty += 1
+            continue
+        if empty:
+            parts.append(str(empty))
+            empty = 0
+        parts.append(piece.name)
+        if piece.name == 'p' or piece.name == 'P':
+            if not piece.has_moved:
+                parts.append('!')
+            if not piece.first_move:
+                parts.append('~')
+        indices.append('-' if piece.index is None else str(piece.index))
+    if empty:
+        parts.append(str(empty))
+    return f"{''.join(parts)} {SIDE_LETTERS[side_to_move]} {','.join(indices)}"
+
+def parse_notation(notation):
+    """
+    Reads the pieces and the side to move from a notation.
+
+    Args:
+        notation (str): The notation, see format_notation.
+
+    Returns:
+        tuple: A list of (POS_IDX index, piece) tuples and the color to move.
+
+    Raises:
+        ValueError: If the notation is malformed.
+    """
+    fields = notation.split(' ')
+    if len(fields) != 3 or fields[1] not in SIDES:
+        raise ValueError(f"Invalid notation: {notation!r}")
+    cells, side, index_field = fields
+    indices = index_field.split(',') if index_field else []
+
+    pieces = []
+    index = 0
+    empty = 0
+    for char in cells:
+        if char.isdigit():
+            empty = empty * 10 + int(char)
+            continue
+        index += empty
+        empty = 0
+        if char == '!' or char == '~':
+            if not pieces or pieces[-1][0] != index - 1 or not isinstance(pieces[-1][1], Pawn):
+                raise ValueError(f"Invalid notation: {char!r} does not follow a pawn")
+            if char == '!':
+                pieces[-1][1].has_moved = False
+            else:
+                pieces[-1][1].set_first_move(False)
+            continue
+        piece_class = PIECE_CLASSES.get(char.lower())
+        if piece_class is None or len(pieces) == len(indices):
+            raise ValueError(f"Invalid notation: {notation!r}")
+        piece = piece_class('white' if char.islower() else 'black')
+        piece_index = indices[len(pieces)]
+        piece.index = None if piece_index == '-' else int(piece_index)
+        if piece_class is Pawn:
+            piece.has_moved = True
+        pieces.append((index, piece))
+        index += 1
+    index += empty
+    if index != len(POSITIONS) or len(pieces) != len(indices):
+        raise ValueError(f"Invalid notation: {notation!r}")
+    return pieces, SIDES[side]
@@ -0,0 +1,399 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from CONST import *
+from HexBoard import HexBoard
+from BitBoard import BitBoard
+from Reference import ReferenceHexBoard
+
+FIXTURES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perft_fixtures.json")
+FIXTURE_POSITIONS = ["default"] + [str(puzzle) for puzzle in range(1, 13)]
+BOARD_CLASSES = {"hexboard": HexBoard, "bitboard": BitBoard, "reference": ReferenceHexBoard}
+
+def opponent(color):
+    """
+    Returns the color of the opponent of the specified color.
+    """
+    return 'black' if color == 'white' else 'white'
+
+def load_position(position, board_class=HexBoard):
+    """
+    Creates a board set up with a named position.
+
+    Args:
+        position (str): Either "default" for the setup from HexBoard._setup_pieces, a puzzle number, or the path of a
+                        puzzle file such as "Puzzles/3.xlsx".
+        board_class (type): The board class to instantiate (default: HexBoard).
+
+    Returns:
+        HexBoard: The board with the position set up.
+    """
+    return board_class.for_position(str(position))
+
+def perft(hexboard, color, depth):
+    """
+    Counts the leaf nodes of the legal move tree of the given depth.
+
+    Args:
+        hexboard (HexBoard): The board to count the nodes on, left unchanged.
+        color (str): The color to move.
+        depth (int): The number of plies to search.
+
+    Returns:
+        int: The number of leaf nodes.
+    """
+    if depth == 0:
+        return 1
+    nodes = 0
+    next_color = opponent(color)
+    for move in hexboard.get_legal_moves(color):
+        hexboard.move_piece(move)
+        nodes += perft(hexboard, next_color, depth - 1)
+        hexboard.undo_move(move)
+    return nodes
+
+def compare_with_reference(hexboard, reference_board, color, depth, ordered=True):
+    """
+    Walks the move trees of two boards in lockstep and checks that they agree at every node.
+
+    At each node the check state of both colors and the list of legal moves must be identical.
+    Both boards are left unchanged.
+
+    Args:
+        hexboard (HexBoard): The board under test, a HexBoard or a BitBoard.
+        reference_board (HexBoard): A board with the same position, usually a Reference.ReferenceHexBoard.
+        color (str): The color to move.
+        depth (int): The number of plies to walk.
+        ordered (bool): Whether the moves must also be generated in the same order (default: True).
+
+    Returns:
+        int: The number of leaf nodes, as perft would count them.
+
+    Raises:
+        AssertionError: If the boards disagree at any node.
+    """
+    for side in ('white', 'black'):
+        if hexboard.in_check(side) != reference_board.in_check(side):
+            raise AssertionError(f"in_check('{side}') differs from the reference")
+    if depth == 0:
+        return 1
+
+    moves = hexboard.get_legal_moves(color)
+    reference_moves = reference_board.get_legal_moves(color)
+    if not ordered:
+        moves = sorted(moves, key=lambda move: (move.initial, move.target))
+        reference_moves = sorted(reference_moves, key=lambda move: (move.initial, move.target))
+    if [(move.initial, move.target) for move in moves] != [(move.initial, move.target) for move in reference_moves]:
+        raise AssertionError(f"Legal moves of {color} differ from the reference")
+
+    nodes = 0
+    for move, reference_move in zip(moves, reference_moves):
+        hexboard.move_piece(move)
+        reference_board.move_piece(reference_move)
+        try:
+            nodes += compare_with_reference(hexboard, reference_board, opponent(color), depth - 1, ordered)
+        except AssertionError as error:
+            raise AssertionError(f"{move.initial}->{move.target}: {error}") from None
+        finally:
+            reference_board.undo_move(reference_move)
+            hexboard.undo_move(move)
+    return nodes
+
+def move_squares(moves):
+    """
+    Returns the (initial, target) squares of moves in board order, to compare moves of different boards.
+    """
+    return sorted((move.initial, move.target) for move in moves)
+
+def check_reference_game(position, seed, max_plies=20):
+    """
+    Plays a random game on a board and on a Reference.ReferenceHexBoard in lockstep, and checks that the game state
+    queries agree after every move: is_game_over, has_legal_move, iter_legal_moves, get_capture_moves and
+    get_evasion_moves, for both colors.
+
+    Args:
+        position (str): The starting position, see load_position.
+        seed (int): The seed of the random moves.
+        max_plies (int): The longest game to play (default: 20).
+
+    Returns:
+        int: The number of positions checked.
+
+    Raises:
+        AssertionError: If the boards disagree in any position.
+    """
+    rng = random.Random(seed)
+    hexboard = load_position(position)
+    reference_board = load_position(position, ReferenceHexBoard)
+    color = 'white'
+    for ply in range(max_plies + 1):
+        for side in ('white', 'black'):
+            for query in ('is_game_over', 'has_legal_move'):
+                result = getattr(hexboard, query)(side)
+                assert getattr(reference_board, query)(side) == result, f"ply {ply}: {query}('{side}') differs from the reference"
+            for query in ('iter_legal_moves', 'get_capture_moves'):
+                squares = move_squares(getattr(hexboard, query)(side))
+                assert move_squares(getattr(reference_board, query)(side)) == squares, f"ply {ply}: {query}('{side}') differs from the reference"
+            evasions = hexboard.get_evasion_moves(side)
+            reference_evasions = reference_board.get_evasion_moves(side)
+            assert (evasions is None) == (reference_evasions is None), f"ply {ply}: get_evasion_moves('{side}') differs from the reference"
+            if evasions is not None:
+                assert move_squares(reference_evasions) == move_squares(evasions), f"ply {ply}: get_evasion_moves('{side}') differs from the reference"
+
+        if hexboard.is_game_over(color)[0] or ply == max_plies:
+            return ply + 1
+        squares = rng.choice(move_squares(hexboard.get_legal_moves(color)))
+        hexboard.move_piece(next(move for move in hexboard.get_legal_moves(color) if (move.initial, move.target) == squares), final=True)
+        reference_board.move_piece(next(move for move in reference_board.get_legal_moves(color) if (move.initial, move.target) == squares), final=True)
+        color = opponent(color)
+
+def perft_stats(hexboard, color, depth):
+    """
+    Counts the leaf nodes of the legal move tree of the given depth, with the captures, checks and promotions among
+    the moves that lead to the leaves.
+
+    Args:
+        hexboard (HexBoard): The board to count the nodes on, left unchanged.
+        color (str): The color to move.
+        depth (int): The number of plies to search.
+
+    Returns:
+        dict: The counts of 'nodes', 'captures', 'checks' and 'promotions'.
+    """
+    stats = {'nodes': 0, 'captures': 0, 'checks': 0, 'promotions': 0}
+    if depth == 0:
+        stats['nodes'] = 1
+        return stats
+
+    next_color = opponent(color)
+    for move in hexboard.get_legal_moves(color):
+        hexboard.move_piece(move)
+        if depth == 1:
+            stats['nodes'] += 1
+            if move.enemy_piece is not None:
+                stats['captures'] += 1
+            if move.piece.name in ('p', 'P') and move.target in PAWN_PROMOTION_HEXAGONS:
+                stats['promotions'] += 1
+            if hexboard.in_check(next_color):
+                stats['checks'] += 1
+        else:
+            for key, value in perft_stats(hexboard, next_color, depth - 1).items():
+                stats[key] += value
+        hexboard.undo_move(move)
+    return stats
+
+def _divide_worker(args):
+    """
+    Runs perft_stats below one root move, in a worker process.
+
+    Args:
+        args (tuple): The board, the code of the root move, the color to move and the depth.
+
+    Returns:
+        dict: The stats below the root move.
+    """
+    hexboard, code, color, depth = args
+    move = hexboard.decode_move(code)
+    hexboard.move_piece(move)
+    if depth == 1:
+        stats = {'nodes': 1, 'captures': int(move.enemy_piece is not None), 'checks': int(hexboard.in_check(opponent(color))),
+                 'promotions': int(move.piece.name in ('p', 'P') and move.target in PAWN_PROMOTION_HEXAGONS)}
+    else:
+        stats = perft_stats(hexboard, opponent(color), depth - 1)
+    hexboard.undo_move(move)
+    return stats
+
+def divide(hexboard, color, depth, processes=1):
+    """
+    Runs perft_stats below every root move.
+
+    Args:
+        hexboard (HexBoard): The board to count the nodes on, left unchanged.
+        color (str): The color to move.
+        depth (int): The number of plies to search, at least 1.
+        processes (int): The number of worker processes to split the root moves over (default: 1, no workers).
+
+    Returns:
+        list: A list of (move, stats) tuples, one per legal root move.
+    """
+    moves = hexboard.get_legal_moves(color)
+    args = [(hexboard, move.code, color, depth) for move in moves]
+    if processes > 1:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(_divide_worker, args)
+    else:
+        results = [_divide_worker(arg) for arg in args]
+    return list(zip(moves, results))
+
+def run_perft(position, depth, color='white', board_class=HexBoard, processes=1):
+    """
+    Runs a timed divide on a named position.
+
+    Args:
+        position (str): The position, see load_position.
+        depth (int): The number of plies to search, 0 counts the position itself.
+        color (str): The color to move (default: 'white').
+        board_class (type): The board class to use (default: HexBoard).
+        processes (int): The number of worker processes (default: 1).
+
+    Returns:
+        tuple: The divide, the summed stats and the elapsed wall time in seconds.
+    """
+    hexboard = load_position(position, board_class)
+    start_time = time.perf_counter()
+    # divide expands the root moves, at depth 0 the only node is the position itself
+    results = divide(hexboard, color, depth, processes) if depth > 0 else []
+    elapsed_time = time.perf_counter() - start_time
+    totals = {'nodes': 0 if depth > 0 else 1, 'captures': 0, 'checks': 0, 'promotions': 0}
+    for _, stats in results:
+        for key, value in stats.items():
+            totals[key] += value
+    return results, totals, elapsed_time
+
+def load_fixtures():
+    """
+    Loads the known perft results.
+
+    Returns:
+        dict: A dictionary from position to a dictionary from depth (as a string) to stats.
+    """
+    with open(FIXTURES_FILE) as file:
+        return json.load(file)
+
+def update_fixtures(max_depth, board_class=HexBoard, processes=1):
+    """
+    Recomputes the perft results of every fixture position up to max_depth and writes them to FIXTURES_FILE.
+    Only run this after the move generator has been checked against the reference.
+    """
+    fixtures = {}
+    for position in FIXTURE_POSITIONS:
+        fixtures[position] = {}
+        for depth in range(1, max_depth + 1):
+            _, totals, _ = run_perft(position, depth, board_class=board_class, processes=processes)
+            fixtures[position][str(depth)] = totals
+    with open(FIXTURES_FILE, "w") as file:
+        json.dump(fixtures, file, indent=4)
+
+def check_notation(position):
+    """
+    Checks that the text notation of a position, and of every position one legal move away, reads back into the same
+    position: the same notation, Zobrist key and legal moves.
+
+    Args:
+        position (str): The position to check, see load_position.
+
+    Returns:
+        int: The number of positions checked.
+
+    Raises:
+        AssertionError: If a position does not read back into the same position.
+    """
+    def check(hexboard):
+        notation = hexboard.to_notation()
+        copy = HexBoard.from_notation(notation)
+        assert copy.to_notation() == notation, f"{notation!r} reads back as {copy.to_notation()!r}"
+        assert copy.zobrist_key == hexboard.zobrist_key, f"{notation!r} reads back with another Zobrist key"
+        for color in ('white', 'black'):
+            codes = [move.code for move in hexboard.get_legal_moves(color)]
+            assert [move.code for move in copy.get_legal_moves(color)] == codes, f"{notation!r} reads back with other {color} moves"
+
+    hexboard = load_position(position)
+    check(hexboard)
+    checked = 1
+    for move in hexboard.get_legal_moves(hexboard.side_to_move):
+        hexboard.move_piece(move)
+        check(hexboard)
+        checked += 1
+        hexboard.undo_move(move)
+    return checked
+
+def run_suite(max_depth, board_class=HexBoard, processes=1):
+    """
+    Runs perft on every fixture position up to max_depth and compares the results with the fixtures.
+
+    Args:
+        max_depth (int): The deepest depth to run.
+        board_class (type): The board class to use (default: HexBoard).
+        processes (int): The number of worker processes (default: 1).
+
+    Returns:
+        bool: True if every result matches its fixture.
+    """
+    fixtures = load_fixtures()
+    passed = True
+    total_nodes = 0
+    total_time = 0
+    print(f"{'position':>8} {'depth':>5} {'nodes':>10} {'time (s)':>9} {'nodes/sec':>10}  result")
+    for position in FIXTURE_POSITIONS:
+        for depth in range(1, max_depth + 1):
+            expected = fixtures.get(position, {}).get(str(depth))
+            if expected is None:
+                continue
+            _, totals, elapsed_time = run_perft(position, depth, board_class=board_class, processes=processes)
+            total_nodes += totals['nodes']
+            total_time += elapsed_time
+            result = "ok" if totals == expected else f"MISMATCH, expected {expected}"
+            passed = passed and totals == expected
+            print(f"{position:>8} {depth:>5} {totals['nodes']:>10} {elapsed_time:>9.3f} {totals['nodes'] / max(elapsed_time, 1e-9):>10.0f}  {result}")
+    print(f"total: {total_nodes} nodes in {total_time:.3f}s, {total_nodes / max(total_time, 1e-9):.0f} nodes/sec")
+
+    checked = 0
+    for position in FIXTURE_POSITIONS:
+        try:
+            checked += check_notation(position)
+        except AssertionError as error:
+            print(f"{position:>8} notation MISMATCH: {error}")
+            passed = False
+    print(f"notation: {checked} positions read back from their notation")
+
+    checked = 0
+    for seed, position in enumerate(FIXTURE_POSITIONS):
+        try:
+            checked += check_reference_game(position, seed)
+        except AssertionError as error:
+            print(f"{position:>8} reference game MISMATCH: {error}")
+            passed = False
+    print(f"reference games: {checked} positions agree with the reference board")
+    return passed
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Counts the legal move tree of a position, or runs the perft regression suite.")
+    parser.add_argument("--position", default="default", help='"default", a puzzle number or a puzzle file (default: default)')
+    parser.add_argument("--depth", type=int, default=3, help="the perft depth, or the deepest depth of the suite (default: 3)")
+    parser.add_argument("--color", default="white", choices=["white", "black"], help="the color to move (default: white)")
+    parser.add_argument("--board", default="hexboard", choices=sorted(BOARD_CLASSES), help="the board backend (default: hexboard)")
+    parser.add_argument("--processes", type=int, default=1, help="the number of processes to split the root moves over (default: 1)")
+    parser.add_argument("--divide", action="store_true", help="print the stats below every root move")
+    parser.add_argument("--suite", action="store_true", help="check every fixture position up to --depth")
+    parser.add_argument("--update-fixtures", action="store_true", help="rewrite the fixtures up to --depth")
+    args = parser.parse_args(arguments)
+    if args.depth < 0:
+        parser.error("--depth must be at least 0")
+    board_class = BOARD_CLASSES[args.board]
+
+    if args.update_fixtures:
+        update_fixtures(args.depth, board_class, args.processes)
+        return 0
+    if args.suite:
+        return 0 if run_suite(args.depth, board_class, args.processes) else 1
+
+    results, totals, elapsed_time = run_perft(args.position, args.depth, args.color, board_class, args.processes)
+    if args.divide:
+        for move, stats in results:
+            print(f"{move.initial}->{move.target}: {stats['nodes']}")
+    print(f"position {args.position}, depth {args.depth}, {args.color} to move, {args.board}")
+    print(f"nodes:      {totals['nodes']}")
+    print(f"captures:   {totals['captures']}")
+    print(f"checks:     {totals['checks']}")
+    print(f"promotions: {totals['promotions']}")
+    print(f"time:       {elapsed_time:.3f}s")
+    print(f"nodes/sec:  {totals['nodes'] / max(elapsed_time, 1e-9):.0f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,56 @@
-from Move import Move
+from collections import namedtuple
+
+from Move import *
+from CONST import *
+from Tables import *
+from Zobrist import KEY_TABLES
+from PieceSquare import SQUARE_TABLES
+
+# The constants of a piece type in one color. One instance per type and color is shared by all its pieces.
+PieceKind = namedtuple('PieceKind', ['name', 'value', 'type_code', 'zobrist_keys', 'square_scores'])
+
+def piece_kinds(name, value, type_code):
+    """
+    Creates the PieceKind of a piece type for both colors.
+
+    Args:
+        name (str): The lower case name of the piece type.
+        value (int): The value of a white piece, black pieces get the negated value.
+        type_code (int): The type number of the piece type, see Move.PIECE_TYPES.
+
+    Returns:
+        dict: The PieceKind per color.
+    """
+    return {
+        'white': PieceKind(name, value, type_code, KEY_TABLES[name, True], SQUARE_TABLES[name]),
+        'black': PieceKind(name.upper(), -value, type_code, KEY_TABLES[name.upper(), True], SQUARE_TABLES[name.upper()])
+    }
 
 class Piece():
     """
     Represents a chess piece.
 
+    The per-type constants live in the class: the directions and, per color, a shared PieceKind in KINDS.
+    The name and value of the kind are also kept on the piece, as they are read in the hot loops.
+
     Attributes:
         color (str): The color of the piece.
+        kind (PieceKind): The constants of the piece's type and color.
+        name (str): The name of the piece, lower case for white and upper case for black.
         value (int): The value of the piece.
         index (int): The index of the piece.
+        zobrist_keys (tuple): The Zobrist keys of the piece per hexagon, see Zobrist.py.
+        square_scores (tuple): The positional bonus of the piece per hexagon, see PieceSquare.py.
 
     Methods:
         set_color(color): Sets the color of the piece.
         get_color(): Returns the color of the piece.
     """
+    __slots__ = ('color', 'kind', 'name', 'value', 'index', 'zobrist_keys', 'square_scores')
+
+    KINDS = {'white': PieceKind(None, 0, 0, None, None), 'black': PieceKind(None, 0, 0, None, None)}
+    directions = ()
+    first_move = True
 
     def __init__(self, color, index=None):
         """
@@ -22,9 +60,27 @@ class Piece():
             color (str): The color of the piece.
             index (int, optional): The index of the piece. Defaults to None.
         """
+        kind = self.KINDS[color]
         self.color = color
-        self.value = 0
+        self.kind = kind
+        self.name = kind.name
+        self.value = kind.value
         self.index = index
+        self.zobrist_keys = kind.zobrist_keys
+        self.square_scores = kind.square_scores
+
+    def __getstate__(self):
+        """
+        Returns the state to pickle. The kind and the Zobrist keys are looked up again when unpickling.
+        """
+        return self.color, self.index
+
+    def __setstate__(self, state):
+        """
+        Restores a pickled piece, see __getstate__.
+        """
+        color, index = state
+        Piece.__init__(self, color, index)
 
     def set_color(self, color):
         """
@@ -33,7 +89,13 @@ class Piece():
         Args:
             color (str): The color of the piece.
         """
+        kind = self.KINDS[color]
         self.color = color
+        self.kind = kind
+        self.name = kind.name
+        self.value = kind.value
+        self.zobrist_keys = KEY_TABLES[kind.name, self.first_move]
+        self.square_scores = kind.square_scores
     
     def get_color(self):
         """
@@ -100,14 +162,107 @@ class Piece():
             return self.value >= other.value
         return NotImplemented
 
+    def _get_slider_moves(self, index, rays, hexboard):
+        """
+        Get the moves along the precomputed rays of a sliding piece.
+
+        Args:
+            index (int): The POS_IDX index of the piece's hexagon.
+            rays (tuple): The rays of the piece's hexagon, see Tables.
+            hexboard (HexBoard): The hexagonal board object.
+
+        Returns:
+            list: A list of Move objects representing the legal moves for the piece.
+        """
+        moves = []
+        base = index | self.kind.type_code << MOVED_SHIFT
+        cells = hexboard.cells
+        for ray in rays:
+            for target in ray:
+                piece_on_target = cells[target].piece
+                if piece_on_target is None:
+                    moves.append(packed_move(self, base | target << TARGET_SHIFT, None))
+                else:
+                    if piece_on_target.color != self.color:
+                        code = base | target << TARGET_SHIFT | piece_on_target.kind.type_code << CAPTURED_SHIFT
+                        moves.append(packed_move(self, code, piece_on_target))
+                    break
+        return moves
+
+    def _get_leaper_moves(self, index, targets, hexboard):
+        """
+        Get the moves to the precomputed single step targets of a piece.
+
+        Args:
+            index (int): The POS_IDX index of the piece's hexagon.
+            targets (tuple): The target indices of the piece's hexagon, see Tables.
+            hexboard (HexBoard): The hexagonal board object.
+
+        Returns:
+            list: A list of Move objects representing the legal moves for the piece.
+        """
+        moves = []
+        base = index | self.kind.type_code << MOVED_SHIFT
+        cells = hexboard.cells
+        for target in targets:
+            piece_on_target = cells[target].piece
+            if piece_on_target is None:
+                moves.append(packed_move(self, base | target << TARGET_SHIFT, None))
+            elif piece_on_target.color != self.color:
+                code = base | target << TARGET_SHIFT | piece_on_target.kind.type_code << CAPTURED_SHIFT
+                moves.append(packed_move(self, code, piece_on_target))
+        return moves
+
+    def _get_slider_captures(self, index, rays, hexboard):
+        """
+        Get the captures along the precomputed rays of a sliding piece, see _get_slider_moves.
+        """
+        moves = []
+        base = index | self.kind.type_code << MOVED_SHIFT
+        cells = hexboard.cells
+        for ray in rays:
+            for target in ray:
+                piece_on_target = cells[target].piece
+                if piece_on_target is not None:
+                    if piece_on_target.color != self.color:
+                        code = base | target << TARGET_SHIFT | piece_on_target.kind.type_code << CAPTURED_SHIFT
+                        moves.append(packed_move(self, code, piece_on_target))
+                    break
+        return moves
+
+    def _get_leaper_captures(self, index, targets, hexboard):
+        """
+        Get the captures on the precomputed single step targets of a piece, see _get_leaper_moves.
+        """
+        moves = []
+        base = index | self.kind.type_code << MOVED_SHIFT
+        cells = hexboard.cells
+        for target in targets:
+            piece_on_target = cells[target].piece
+            if piece_on_target is not None and piece_on_target.color != self.color:
+                code = base | target << TARGET_SHIFT | piece_on_target.kind.type_code << CAPTURED_SHIFT
+                moves.append(packed_move(self, code, piece_on_target))
+        return moves
+
 class Pawn(Piece):
-    def __init__(self, color):
-        super().__init__(color)
+    __slots__ = ('first_move', 'en_passant', 'has_moved', 'total_moves')
+
+    KINDS = piece_kinds('p', 10, 1)
+
+    def __init__(self, color, index=None):
         self.first_move = True
         self.en_passant = False
-        self.value = 10 if self.color == "white" else -10
-        self.name = "p" if self.color == "white" else "P"
+        self.has_moved = False
         self.total_moves = 0
+        super().__init__(color, index)
+
+    def __getstate__(self):
+        return self.color, self.index, self.first_move, self.en_passant, self.has_moved, self.total_moves
+
+    def __setstate__(self, state):
+        color, index, first_move, self.en_passant, self.has_moved, self.total_moves = state
+        Piece.__init__(self, color, index)
+        self.set_first_move(first_move)
     
     def _get_legal_moves(self, row, col, hexboard):
         """
@@ -122,39 +277,62 @@ class Pawn(Piece):
             list: A list of Move objects representing the legal moves for the piece.
         """
         moves = []
-
-        # Check if there is an empty space two rows above (for white) or two rows below (for black)
-        target = (row - 2, col) if self.color == "white" else (row + 2, col)
-        if 0 <= target[0] < 21 and 0 <= target[1] < 11 and hexboard.get_hexagon(target[0], target[1]) is not None:
-            piece_on_target = hexboard.get_piece(target[0], target[1])
+        index = POS_IDX[(row, col)]
+        base = index | self.kind.type_code << MOVED_SHIFT
+        cells = hexboard.cells
+
+        # Push to the empty hexagon two rows above (for white) or two rows below (for black)
+        single, double = PAWN_PUSHES[self.color][index]
+        if single is not None:
+            piece_on_target = cells[single].piece
             if piece_on_target is None:
-                move = Move(self, (row, col), target, None)
-                moves.append(move)
-        
-        # Check if it's the first move and there are empty spaces four rows above (for white) or four rows below (for black)
-        if self.first_move:
-            target_first_move = (row - 4, col) if self.color == "white" else (row + 4, col)
-            if 0 <= target_first_move[0] < 21 and 0 <= target_first_move[1] < 11 and hexboard.get_hexagon(target_first_move[0], target_first_move[1]) is not None:
-                piece_on_target_first_move = hexboard.get_piece(target_first_move[0], target_first_move[1])
-                if piece_on_target is None and piece_on_target_first_move is None:
-                    move = Move(self, (row, col), target, None)
-                    moves.append(move)
-        
-        # Check if there is an opponent's piece one row above and one column to the left (for white) or one row below and one column to the right (for black)
-        target = (row - 1, col - 1) if self.color == "white" else (row + 1, col + 1)
-        if 0 <= target[0] < 21 and 0 <= target[1] < 11 and hexboard.get_hexagon(target[0], target[1]) is not None:
-            piece_on_target = hexboard.get_piece(target[0], target[1])
+                code = base | single << TARGET_SHIFT
+                if single in PROMOTION_INDICES:
+                    code |= PROMOTION_FLAG
+                moves.append(packed_move(self, code, None))
+
+                # On the first move the push is offered again when the hexagon beyond is empty as well
+                if self.first_move and double is not None and cells[double].piece is None:
+                    moves.append(packed_move(self, code, None))
+
+        # Capture an opponent's piece diagonally forward
+        for target in PAWN_CAPTURES[self.color][index]:
+            piece_on_target = cells[target].piece
             if piece_on_target is not None and piece_on_target.color != self.color:
-                move = Move(self, (row, col), target, piece_on_target)
-                moves.append(move)
-        
-        # Check if there is an opponent's piece one row above and one column to the right (for white) or one row below and one column to the left (for black)
-        target = (row - 1, col + 1) if self.color == "white" else (row + 1, col - 1)
-        if 0 <= target[0] < 21 and 0 <= target[1] < 11 and hexboard.get_hexagon(target[0], target[1]) is not None:
-            piece_on_target = hexboard.get_piece(target[0], target[1])
+                code = base | target << TARGET_SHIFT | piece_on_target.kind.type_code << CAPTURED_SHIFT
+                if target in PROMOTION_INDICES:
+                    code |= PROMOTION_FLAG
+                moves.append(packed_move(self, code, piece_on_target))
+
+        return moves
+
+    def _get_capture_moves(self, index, hexboard):
+        """
+        Get the captures and promotions of the pawn, in the order of _get_legal_moves.
+        The first move push is not offered again, as it never promotes.
+
+        Args:
+            index (int): The POS_IDX index of the piece's hexagon.
+            hexboard (HexBoard): The hexagonal board object.
+
+        Returns:
+            list: A list of Move objects.
+        """
+        moves = []
+        base = index | self.kind.type_code << MOVED_SHIFT
+        cells = hexboard.cells
+
+        single = PAWN_PUSHES[self.color][index][0]
+        if single is not None and single in PROMOTION_INDICES and cells[single].piece is None:
+            moves.append(packed_move(self, base | single << TARGET_SHIFT | PROMOTION_FLAG, None))
+
+        for target in PAWN_CAPTURES[self.color][index]:
+            piece_on_target = cells[target].piece
             if piece_on_target is not None and piece_on_target.color != self.color:
-                move = Move(self, (row, col), target, piece_on_target)
-                moves.append(move)
+                code = base | target << TARGET_SHIFT | piece_on_target.kind.type_code << CAPTURED_SHIFT
+                if target in PROMOTION_INDICES:
+                    code |= PROMOTION_FLAG
+                moves.append(packed_move(self, code, piece_on_target))
 
         return moves
 
@@ -166,22 +344,17 @@ class Pawn(Piece):
     
     def set_first_move(self, first_move):
         self.first_move = first_move
+        self.zobrist_keys = KEY_TABLES[self.name, self.first_move]
     
     def get_first_move(self):
         return self.first_move
 
 class Knight(Piece):
-    def __init__(self, color):
-        super().__init__(color)
-        self.first_move = True
-        self.value = 30 if self.color == "white" else -30
-        self.name = "n" if self.color == "white" else "N"
-        self.directions = [
-            (-5, -1), (-4, -2), (-5, 1), (-4, 2),
-            (-1, 3), (1, 3), (1, -3), (-1, -3),
-            (5, -1), (4, -2), (5, 1), (4, 2)
-        ]
-    
+    __slots__ = ()
+
+    KINDS = piece_kinds('n', 30, 2)
+    directions = KNIGHT_DIRECTIONS
+
     def _get_legal_moves(self, row, col, hexboard):
         """
         Get the legal moves for the piece at the specified position on the hexagonal board.
@@ -194,25 +367,18 @@ class Knight(Piece):
         Returns:
             list: A list of Move objects representing the legal moves for the piece.
         """
-        moves = []
-        for direction in self.directions:
-            target = (row + direction[0], col + direction[1])
-            if 0 <= target[0] < 21 and 0 <= target[1] < 11 and hexboard.get_hexagon(target[0], target[1]) is not None:
-                piece_on_target = hexboard.get_piece(target[0], target[1])
-                if piece_on_target is None or piece_on_target.color != self.color:
-                    move = Move(self, (row, col), target, piece_on_target)
-                    moves.append(move)
+        index = POS_IDX[(row, col)]
+        return self._get_leaper_moves(index, KNIGHT_LEAPS[index], hexboard)
 
-        return moves
+    def _get_capture_moves(self, index, hexboard):
+        return self._get_leaper_captures(index, KNIGHT_LEAPS[index], hexboard)
 
 class Bishop(Piece):
-    def __init__(self, color):
-        super().__init__(color)
-        self.first_move = True
-        self.value = 30 if self.color == "white" else -30
-        self.name = "b" if self.color == "white" else "B"
-        self.directions = [(-3, -1), (-3, 1), (3, -1), (3,1), (0,2), (0,-2)]
-    
+    __slots__ = ()
+
+    KINDS = piece_kinds('b', 30, 3)
+    directions = BISHOP_DIRECTIONS
+
     def _get_legal_moves(self, row, col, hexboard):
         """
         Get the legal moves for the piece at the specified position on the hexagonal board.
@@ -225,35 +391,18 @@ class Bishop(Piece):
         Returns:
             list: A list of Move objects representing the legal moves for the piece.
         """
-        moves = []
+        index = POS_IDX[(row, col)]
+        return self._get_slider_moves(index, BISHOP_RAYS[index], hexboard)
 
-        for direction in self.directions:
-            counter = 1
-            while True:
-                target = (row + counter * direction[0], col + counter * direction[1])
-                if 0 <= target[0] < 21 and 0 <= target[1] < 11 and hexboard.get_hexagon(target[0], target[1]) is not None:
-                    piece_on_target = hexboard.get_piece(target[0], target[1])
-                    if piece_on_target is None:
-                        move = Move(self, (row, col), target, piece_on_target)
-                        moves.append(move)
-                    else:
-                        if piece_on_target.color != self.color:
-                            move = Move(self, (row, col), target, piece_on_target)
-                            moves.append(move)
-                        break   
-                    counter += 1
-                else:
-                    break
-        return moves
+    def _get_capture_moves(self, index, hexboard):
+        return self._get_slider_captures(index, BISHOP_RAYS[index], hexboard)
 
 class Rook(Piece):
-    def __init__(self, color):
-        super().__init__(color)
-        self.first_move = True
-        self.value = 50 if self.color == "white" else -50
-        self.name = "r" if self.color == "white" else "R"
-        self.directions = [(-1, -1), (2,0), (1, 1), (-1,1), (-2,0), (1,-1)]
-    
+    __slots__ = ()
+
+    KINDS = piece_kinds('r', 50, 4)
+    directions = ROOK_DIRECTIONS
+
     def _get_legal_moves(self, row, col, hexboard):
         """
         Get the legal moves for the piece at the specified position on the hexagonal board.
@@ -266,37 +415,18 @@ class Rook(Piece):
         Returns:
             list: A list of Move objects representing the legal moves for the piece.
         """
-        moves = []
+        index = POS_IDX[(row, col)]
+        return self._get_slider_moves(index, ROOK_RAYS[index], hexboard)
 
-        for direction in self.directions:
-            counter = 1
-            while True:
-                target = (row + counter * direction[0], col + counter * direction[1])
-                if 0 <= target[0] < 21 and 0 <= target[1] < 11 and hexboard.get_hexagon(target[0], target[1]) is not None:
-                    piece_on_target = hexboard.get_piece(target[0], target[1])
-                    if piece_on_target is None:
-                        move = Move(self, (row, col), target, piece_on_target)
-                        moves.append(move)
-                    else:
-                        if piece_on_target.color != self.color:
-                            move = Move(self, (row, col), target, piece_on_target)
-                            moves.append(move)
-                        break   
-                    counter += 1
-                else:
-                    break
-
-        return moves
+    def _get_capture_moves(self, index, hexboard):
+        return self._get_slider_captures(index, ROOK_RAYS[index], hexboard)
 
 class Queen(Piece):
-    def __init__(self, color):
-        super().__init__(color)
-        self.first_move = True
-        self.value = 90 if self.color == "white" else -90
-        self.name = "q" if self.color == "white" else "Q"
-        self.directions = [(-1, -1), (2,0), (1, 1), (-1,1), (-2,0), (1,-1), (-3, -1), (-3, 1), (3, -1), (3,1), (0,2), (0,-2)]
-        
-    
+    __slots__ = ()
+
+    KINDS = piece_kinds('q', 90, 5)
+    directions = QUEEN_DIRECTIONS
+
     def _get_legal_moves(self, row, col, hexboard):
         """
         Get the legal moves for the piece at the specified position on the hexagonal board.
@@ -309,35 +439,18 @@ class Queen(Piece):
         Returns:
             list: A list of Move objects representing the legal moves for the piece.
         """
-        moves = []
+        index = POS_IDX[(row, col)]
+        return self._get_slider_moves(index, QUEEN_RAYS[index], hexboard)
 
-        for direction in self.directions:
-            counter = 1
-            while True:
-                target = (row + counter * direction[0], col + counter * direction[1])
-                if 0 <= target[0] < 21 and 0 <= target[1] < 11 and hexboard.get_hexagon(target[0], target[1]) is not None:
-                    piece_on_target = hexboard.get_piece(target[0], target[1])
-                    if piece_on_target is None:
-                        move = Move(self, (row, col), target, piece_on_target)
-                        moves.append(move)
-                    else:
-                        if piece_on_target.color != self.color:
-                            move = Move(self, (row, col), target, piece_on_target)
-                            moves.append(move)
-                        break   
-                    counter += 1
-                else:
-                    break
-        return moves
+    def _get_capture_moves(self, index, hexboard):
+        return self._get_slider_captures(index, QUEEN_RAYS[index], hexboard)
 
 class King(Piece):
-    def __init__(self, color):
-        super().__init__(color)
-        self.first_move = True
-        self.value = 1000 if self.color == "white" else -1000
-        self.name = "k" if self.color == "white" else "K"
-        self.directions = [(-1, -1), (2,0), (1, 1), (-1,1), (-2,0), (1,-1), (-3, -1), (-3, 1), (3, -1), (3,1), (0,2), (0,-2)]
- 
+    __slots__ = ()
+
+    KINDS = piece_kinds('k', 1000, 6)
+    directions = KING_DIRECTIONS
+
     def _get_legal_moves(self, row, col, hexboard):
         """
         Get the legal moves for the piece at the specified position on the hexagonal board.
@@ -350,15 +463,8 @@ class King(Piece):
         Returns:
             list: A list of Move objects representing the legal moves for the piece.
         """
-        moves = []
-
-        for direction in self.directions:
-            target = (row + direction[0], col + direction[1])
-            if 0 <= target[0] < 21 and 0 <= target[1] < 11 and hexboard.get_hexagon(target[0], target[1]) is not None:
-                piece_on_target = hexboard.get_piece(target[0], target[1])
-                if piece_on_target is None or piece_on_target.color != self.color:
-                    move = Move(self, (row, col), target, piece_on_target)
-                    moves.append(move)
-
-        return moves
+        index = POS_IDX[(row, col)]
+        return self._get_leaper_moves(index, KING_STEPS[index], hexboard)
 
+    def _get_capture_moves(self, index, hexboard):
+        return self._get_leaper_captures(index, KING_STEPS[index], hexboard)
@@ -0,0 +1,87 @@
+"""
+Piece-square tables for the evaluation, indexed by POS_IDX.
+
+A table holds the positional bonus of a piece on every hexagon, in Evaluate's piece values (a pawn is 10):
+- Knights, bishops and queens get CENTER_WEIGHTS per hexagon closer to the center than the edge of the board.
+- Pawns get PAWN_ADVANCE_BONUS per step closer than PAWN_ADVANCE_STEPS to their promotion hexagon.
+- Rooks and kings have no bonus.
+The tables of black pieces are negated, so a score is relative to white, like the piece values.
+The board keeps the material and positional sums up to date in move_piece and undo_move, see compute_scores.
+"""
+from CONST import *
+
+CENTER = (10, 5)
+# The hex distance of the edge of the board to the center
+BOARD_RADIUS = 5
+
+CENTER_WEIGHTS = {'p': 0, 'n': 2, 'b': 1, 'r': 0, 'q': 1, 'k': 0}
+PAWN_ADVANCE_STEPS = 6
+PAWN_ADVANCE_BONUS = 1
+
+def hex_distance(first, second):
+    """
+    Returns the number of king steps between two hexagons.
+
+    Args:
+        first (tuple): The (row, col) position of the first hexagon.
+        second (tuple): The (row, col) position of the second hexagon.
+
+    Returns:
+        int: The distance, rows count half as the board has two rows per hexagon in a file.
+    """
+    rows = abs(first[0] - second[0])
+    cols = abs(first[1] - second[1])
+    return max(cols, (rows + cols) // 2)
+
+def promotion_steps(position, color):
+    """
+    Returns the number of pushes a pawn of a color needs from a hexagon to its promotion hexagon in the same file.
+    White pawns move to the top rows and black pawns to the bottom rows.
+    """
+    row, col = position
+    if color == 'white':
+        return (row - abs(col - 5)) // 2
+    return (20 - abs(col - 5) - row) // 2
+
+def square_table(name, color):
+    """
+    Returns the positional bonus of a piece type and color per hexagon, negated for black.
+
+    Args:
+        name (str): The lower case name of the piece type.
+        color (str): The color of the piece.
+
+    Returns:
+        tuple: The bonuses indexed by POS_IDX.
+    """
+    sign = 1 if color == 'white' else -1
+    bonuses = []
+    for position in POSITIONS:
+        bonus = CENTER_WEIGHTS[name] * (BOARD_RADIUS - hex_distance(position, CENTER))
+        if name == 'p':
+            bonus += PAWN_ADVANCE_BONUS * max(0, PAWN_ADVANCE_STEPS - promotion_steps(position, color))
+        bonuses.append(sign * bonus)
+    return tuple(bonuses)
+
+SQUARE_TABLES = {}
+for _name in CENTER_WEIGHTS:
+    SQUARE_TABLES[_name] = square_table(_name, 'white')
+    SQUARE_TABLES[_name.upper()] = square_table(_name, 'black')
+
+def compute_scores(squares):
+    """
+    Computes the material and positional sums of a position from scratch.
+
+    Args:
+        squares (list): The pieces on the board indexed by POS_IDX, None for empty hexagons.
+
+    Returns:
+        tuple: The sum of the piece values and the sum of the piece-square bonuses, both relative to white.
+    """
+    material = 0
+    positional = 0
+    for index, piece in enumerate(squares):
+        if piece is not None:
+            material += piece.value
+            positional += piece.square_scores[index]
+    return material, positional
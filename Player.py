@@ -1,6 +1,12 @@
 import random
-import multiprocessing
 from Evaluate import Evaluate
+from Search import Search, MAX_SEARCH_DEPTH
+from TranspositionTable import TranspositionTable
+from EvalCache import EvalCache, PawnHashTable
+from EnginePool import EnginePool
+from MoveOrdering import MoveOrderer, order_captures_first
+from HexBoard import HexBoard
+from BitBoard import BitBoard
 from CONST import *
 
 class Player():
@@ -11,10 +17,19 @@ class Player():
         pass
 
 class Agent(Player):
-    def _init_(self, color, agent_type):
+    def _init_(self, color, agent_type, use_bitboard=False):
         super()._init_(color)
         self.agent_type = agent_type
+        self.use_bitboard = use_bitboard
         self.nodes_explored = 0
+        # Kept between moves, old entries are replaced by age
+        self.transposition_table = TranspositionTable()
+        # Kept between moves, the killers are forgotten and the history is halved at every move
+        self.move_orderer = MoveOrderer()
+        self.eval_cache = EvalCache()
+        self.pawn_table = PawnHashTable()
+        # Started by the first multiprocessing search and kept for the game, see EnginePool.py
+        self.engine_pool = None
     
     class Player:
         def get_random_move(self, hexboard):
@@ -41,39 +56,94 @@ class Agent(Player):
         Executes the Min-Max algorithm on a given move and returns the evaluation.
 
         Args:
-            args (tuple): A tuple containing the move, hexboard, maximizing flag, depth, alpha, beta, and use_alpha_beta.
+            args (tuple): A tuple containing the move code, hexboard, maximizing flag, depth, alpha, beta, and use_alpha_beta.
 
         Returns:
-            tuple: A tuple containing the move and its evaluation.
+            tuple: A tuple containing the move code and its evaluation.
         """
-        move, hexboard, maximizing, depth, alpha, beta, use_alpha_beta = args
+        code, hexboard, maximizing, depth, alpha, beta, use_alpha_beta = args
+        move = hexboard.decode_move(code)
         hexboard.move_piece(move)
         evaluation = self.min_max(hexboard, not maximizing, depth, alpha, beta, use_alpha_beta)
         hexboard.undo_move(move)
-        return (move, evaluation)
+        return (code, evaluation)
+
+    def start_engine_pool(self, processes=None):
+        """
+        Starts the worker processes of the multiprocessing min_max search, kept until close_engine_pool.
+
+        Args:
+            processes (int): The number of worker processes, None for the number of cores (default: None).
+        """
+        self.close_engine_pool()
+        # The workers get their own agent, as the pool cannot be copied to them
+        worker_agent = Agent()
+        worker_agent._init_(self.color, self.agent_type, self.use_bitboard)
+        self.engine_pool = EnginePool(worker_agent, processes)
+
+    def close_engine_pool(self):
+        """
+        Stops the worker processes of the multiprocessing min_max search, if they run.
+        """
+        if self.engine_pool is not None:
+            self.engine_pool.close()
+            self.engine_pool = None
 
     def find_min_max_move(self, hexboard, color, use_multiprocessing=True, use_alpha_beta=True):
+        # The engine pool gets the position as its notation, which only a HexBoard has
+        position = hexboard
+        if self.use_bitboard and isinstance(hexboard, HexBoard):
+            # Search on a bitboard copy, the moves share their pieces with the original board
+            hexboard = BitBoard.from_hexboard(hexboard)
+
         if self.agent_type == "min_max":
             moves = hexboard.get_legal_moves(self.color)
-            moves = sorted(moves, key=lambda move: (move.enemy_piece is None, move.enemy_piece))
+            moves = order_captures_first(moves)
             maximize = True if color == "white" else False
 
         self.nodes_explored = 0  # Reset node counter
 
         if use_multiprocessing:
-            with multiprocessing.Pool() as pool:
-                args = [(move, hexboard, maximize, DEPTH, float("-inf"), float("inf"), use_alpha_beta) for move in moves]
-                results = pool.map(self.min_max_worker, args)
+            # The engine pool is started once and searches the first move before the others, see EnginePool.py
+            if self.engine_pool is None:
+                self.start_engine_pool()
+            results, self.nodes_explored = self.engine_pool.search(position, moves, maximize, DEPTH, use_alpha_beta)
         else:
-            args = [(move, hexboard, maximize, DEPTH, float("-inf"), float("inf"), use_alpha_beta) for move in moves]
-            results = [self.min_max_worker(arg) for arg in args]
+            args = [(move.code, hexboard, maximize, DEPTH, float("-inf"), float("inf"), use_alpha_beta) for move in moves]
+            results = [self.min_max_worker(arg) + (True,) for arg in args]
 
-        # Find the move with the best evaluation
-        best_move = max(results, key=lambda x: x[1]) if maximize else min(results, key=lambda x: x[1])
+        # Find the move with the best evaluation, an exact score wins a tie with a bound of the engine pool
+        if maximize:
+            best_move = max(results, key=lambda x: (x[1], x[2]))
+        else:
+            best_move = min(results, key=lambda x: (x[1], not x[2]))
         
         #print(f"Total nodes explored: {self.nodes_explored}")
         
-        return best_move[0]
+        moves_by_code = {move.code: move for move in moves}
+        return moves_by_code[best_move[0]]
+
+    def find_move(self, hexboard, color, time_ms=1000, max_depth=MAX_SEARCH_DEPTH):
+        """
+        Finds a move with an iterative deepening search that stops when the time budget runs out, see Search.py.
+        The transposition table, the move ordering and the pawn hash table of the agent are kept between moves.
+
+        Args:
+            hexboard (HexBoard): The hexagonal chess board, left unchanged.
+            color (str): The color to move.
+            time_ms (float): The time budget in milliseconds, None for no limit (default: 1000).
+            max_depth (int): The deepest depth to search, in plies (default: MAX_SEARCH_DEPTH).
+
+        Returns:
+            SearchResult: The best move (None without legal moves), its score for color, the depth reached,
+                          the number of nodes, the elapsed time in seconds and the number of quiescence nodes.
+        """
+        if self.use_bitboard and isinstance(hexboard, HexBoard):
+            hexboard = BitBoard.from_hexboard(hexboard)
+        search = Search(hexboard, self.transposition_table, pawn_table=self.pawn_table, orderer=self.move_orderer)
+        result = search.iterative_deepening(color, time_ms, max_depth)
+        self.nodes_explored = result.nodes
+        return result
 
     def min_max(self, hexboard, maximizing, depth=DEPTH, alpha=float("-inf"), beta=float("inf"), use_alpha_beta=True):
         """
@@ -98,11 +168,11 @@ class Agent(Player):
 
             if depth == 0:
                 color = "white" if maximizing else "black"
-                return Evaluate(hexboard).evaluate(color)
+                return Evaluate(hexboard, self.eval_cache, self.pawn_table).evaluate(color)
             
             if maximizing:
                 max_evaluation = float("-inf")
-                for move in hexboard.get_legal_moves(self.color):
+                for move in order_captures_first(hexboard.get_legal_moves(self.color)):
                     hexboard.move_piece(move)
                     evaluation = self.min_max(hexboard, False, depth-1, alpha, beta, use_alpha_beta)
                     hexboard.undo_move(move)
@@ -118,7 +188,7 @@ class Agent(Player):
             else:
                 min_evaluation = float("inf")
                 opponent_color = "white" if self.color == "black" else "black"
-                for move in hexboard.get_legal_moves(opponent_color):
+                for move in order_captures_first(hexboard.get_legal_moves(opponent_color)):
                     hexboard.move_piece(move)
                     evaluation = self.min_max(hexboard, True, depth-1, alpha, beta, use_alpha_beta)
                     hexboard.undo_move(move)
@@ -0,0 +1,88 @@
+"""
+Bounded least-recently-used cache for results that only depend on the position, such as the legal moves.
+"""
+from collections import OrderedDict
+
+class PositionCache():
+    """
+    A bounded least-recently-used cache of per-position results.
+
+    Entries are stored by a kind, such as 'legal_moves', 'in_check' or 'game_over', and a key that identifies the
+    position, see HexBoard.position_key. When the cache is full the least recently used entry is dropped.
+
+    Attributes:
+        max_entries (int): The maximum number of entries.
+        entries (OrderedDict): The entries by (kind, key), least recently used first.
+        hits (dict): Per kind, the number of lookups that found an entry.
+        misses (dict): Per kind, the number of lookups that did not.
+    """
+
+    def __init__(self, max_entries):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries (int): The maximum number of entries.
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = {}
+        self.misses = {}
+
+    def lookup(self, kind, key):
+        """
+        Returns the cached result of a kind for a key, and marks it as recently used.
+
+        Args:
+            kind (str): The kind of result.
+            key (hashable): The key of the position.
+
+        Returns:
+            object or None: The cached result, or None if it is not in the cache.
+        """
+        value = self.entries.get((kind, key))
+        if value is None:
+            self.misses[kind] = self.misses.get(kind, 0) + 1
+            return None
+        self.entries.move_to_end((kind, key))
+        self.hits[kind] = self.hits.get(kind, 0) + 1
+        return value
+
+    def store(self, kind, key, value):
+        """
+        Stores a result, dropping the least recently used entry if the cache is full.
+
+        Args:
+            kind (str): The kind of result.
+            key (hashable): The key of the position.
+            value (object): The result, not None.
+        """
+        self.entries[(kind, key)] = value
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters.
+        """
+        self.entries.clear()
+        self.hits.clear()
+        self.misses.clear()
+
+    def stats(self):
+        """
+        Returns the hit and miss counters.
+
+        Returns:
+            dict: The number of entries, the total hits and misses, the hit rate, and per kind a (hits, misses) tuple.
+        """
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        kinds = sorted(set(self.hits) | set(self.misses))
+        return {
+            'entries': len(self.entries),
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'kinds': {kind: (self.hits.get(kind, 0), self.misses.get(kind, 0)) for kind in kinds}
+        }
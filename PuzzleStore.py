@@ -0,0 +1,127 @@
+"""
+Compiled store of the puzzles in Puzzles/*.xlsx.
+
+The Excel files are compiled once into Puzzles/puzzles.json, with one record per piece: the piece class name, the
+color, the POS_IDX index of its hexagon and its first move flag. The records are kept in memory after the first load,
+so boards are set up without opening a spreadsheet. Puzzles that are missing from the store, or whose Excel file is
+newer than the store, are read from their Excel file instead.
+
+Run this module to recompile the store after changing a puzzle:
+    python PuzzleStore.py
+"""
+import glob
+import json
+import os
+
+from openpyxl import load_workbook
+
+from CONST import POS_IDX, PUZZLE_DIRECTORY
+
+PUZZLE_STORE_PATH = os.path.join(PUZZLE_DIRECTORY, "puzzles.json")
+
+_records = None
+
+def puzzle_path(puzzle):
+    """
+    Returns the path of the Excel file of a puzzle.
+
+    Args:
+        puzzle (str): The name of the puzzle.
+
+    Returns:
+        str: The path of the Excel file.
+    """
+    return os.path.join(PUZZLE_DIRECTORY, f"{puzzle}.xlsx")
+
+def read_workbook(puzzle):
+    """
+    Reads the records of a puzzle from its Excel file.
+
+    Args:
+        puzzle (str): The name of the puzzle.
+
+    Returns:
+        list: A list of (piece, color, cell, first_move) tuples in the order of the rows of the file.
+    """
+    return read_puzzle_file(puzzle_path(puzzle))
+
+def read_puzzle_file(filepath):
+    """
+    Reads the records of a puzzle from an Excel file.
+
+    Args:
+        filepath (str): The path of the Excel file.
+
+    Returns:
+        list: A list of (piece, color, cell, first_move) tuples in the order of the rows of the file.
+    """
+    workbook = load_workbook(filepath, data_only=True)
+    records = []
+    for piece, color, row, col, first_move in list(workbook.active.iter_rows(values_only=True))[1:]:
+        records.append((piece, color, POS_IDX[(row, col)], first_move == 'True'))
+    return records
+
+def compile_puzzles(path=PUZZLE_STORE_PATH):
+    """
+    Compiles every puzzle in the puzzle directory into the store, and resets the in-memory records.
+
+    Args:
+        path (str): The path of the store (default: PUZZLE_STORE_PATH).
+
+    Returns:
+        int: The number of compiled puzzles.
+    """
+    global _records
+    puzzles = sorted((os.path.splitext(os.path.basename(filepath))[0]
+                      for filepath in glob.glob(os.path.join(PUZZLE_DIRECTORY, "*.xlsx"))),
+                     key=lambda puzzle: (not puzzle.isdigit(), int(puzzle) if puzzle.isdigit() else 0, puzzle))
+    # One line per puzzle, so a changed puzzle shows up as a one line diff
+    lines = [f" {json.dumps(puzzle)}: {json.dumps(read_workbook(puzzle))}" for puzzle in puzzles]
+    with open(path, "w") as file:
+        file.write("{\n" + ",\n".join(lines) + "\n}\n")
+    _records = None
+    return len(puzzles)
+
+def _load_store():
+    """
+    Loads the store into memory, skipping the puzzles whose Excel file was changed after the store was compiled.
+
+    Returns:
+        dict: The records by puzzle name.
+    """
+    if not os.path.exists(PUZZLE_STORE_PATH):
+        return {}
+    compiled_time = os.path.getmtime(PUZZLE_STORE_PATH)
+    with open(PUZZLE_STORE_PATH) as file:
+        store = json.load(file)
+    records = {}
+    for puzzle, puzzle_records in store.items():
+        filepath = puzzle_path(puzzle)
+        if os.path.exists(filepath) and os.path.getmtime(filepath) > compiled_time:
+            continue
+        records[puzzle] = tuple(tuple(record) for record in puzzle_records)
+    return records
+
+def puzzle_records(puzzle):
+    """
+    Returns the records of a puzzle, from memory after the first call. A puzzle given as the path of an Excel file is
+    read from that file on every call, as it is not part of the store.
+
+    Args:
+        puzzle (str): The name of the puzzle, or the path of a puzzle file ending in ".xlsx".
+
+    Returns:
+        tuple: A tuple of (piece, color, cell, first_move) tuples, see read_workbook.
+    """
+    global _records
+    if puzzle.endswith(".xlsx"):
+        return tuple(read_puzzle_file(puzzle))
+    if _records is None:
+        _records = _load_store()
+    records = _records.get(puzzle)
+    if records is None:
+        records = _records[puzzle] = tuple(read_workbook(puzzle))
+    return records
+
+if __name__ == "__main__":
+    print(f"compiled {compile_puzzles()} puzzles into {PUZZLE_STORE_PATH}")
@@ -0,0 +1,272 @@
+from HexBoard import HexBoard
+from Move import Move, CAPTURE_OR_PROMOTION_MASK
+from Piece import *
+from CONST import *
+
+def reference_piece_moves(piece, row, col, hexboard):
+    """
+    Generates the pseudo-legal moves of a piece by walking its directions on the 2D grid.
+
+    This is the original coordinate based generator, kept as the reference for perft parity checks and benchmarks.
+
+    Args:
+        piece (Piece): The piece to generate the moves for.
+        row (int): The row index of the piece.
+        col (int): The column index of the piece.
+        hexboard (HexBoard): The hexagonal board object.
+
+    Returns:
+        list: A list of Move objects representing the pseudo-legal moves for the piece.
+    """
+    moves = []
+
+    if isinstance(piece, Pawn):
+        target = (row - 2, col) if piece.color == "white" else (row + 2, col)
+        if 0 <= target[0] < 21 and 0 <= target[1] < 11 and hexboard.get_hexagon(target[0], target[1]) is not None:
+            piece_on_target = hexboard.get_piece(target[0], target[1])
+            if piece_on_target is None:
+                moves.append(Move(piece, (row, col), target, None))
+
+        if piece.first_move:
+            target_first_move = (row - 4, col) if piece.color == "white" else (row + 4, col)
+            if 0 <= target_first_move[0] < 21 and 0 <= target_first_move[1] < 11 and hexboard.get_hexagon(target_first_move[0], target_first_move[1]) is not None:
+                piece_on_target_first_move = hexboard.get_piece(target_first_move[0], target_first_move[1])
+                if piece_on_target is None and piece_on_target_first_move is None:
+                    moves.append(Move(piece, (row, col), target, None))
+
+        for d_col in (-1, 1):
+            target = (row - 1, col + d_col) if piece.color == "white" else (row + 1, col - d_col)
+            if 0 <= target[0] < 21 and 0 <= target[1] < 11 and hexboard.get_hexagon(target[0], target[1]) is not None:
+                piece_on_target = hexboard.get_piece(target[0], target[1])
+                if piece_on_target is not None and piece_on_target.color != piece.color:
+                    moves.append(Move(piece, (row, col), target, piece_on_target))
+        return moves
+
+    sliding = isinstance(piece, (Bishop, Rook, Queen))
+    for direction in piece.directions:
+        counter = 1
+        while True:
+            target = (row + counter * direction[0], col + counter * direction[1])
+            if 0 <= target[0] < 21 and 0 <= target[1] < 11 and hexboard.get_hexagon(target[0], target[1]) is not None:
+                piece_on_target = hexboard.get_piece(target[0], target[1])
+                if piece_on_target is None or piece_on_target.color != piece.color:
+                    moves.append(Move(piece, (row, col), target, piece_on_target))
+                if piece_on_target is not None or not sliding:
+                    break
+                counter += 1
+            else:
+                break
+    return moves
+
+class ReferenceHexBoard(HexBoard):
+    """
+    A HexBoard that generates moves with the original, unoptimized algorithms.
+
+    Used as the baseline for perft parity checks and for the benchmarks in Benchmark.py.
+    The moves only update the grid, not the piece index sets, so every method that HexBoard answers from the index
+    sets is overridden here with a formulation on the full list of legal moves.
+    The moves keep no Zobrist key, so the position cache is disabled, and no material or positional sums, so its
+    positions are not meant for Evaluate.
+    """
+    position_cache_size = 0
+
+    def get_pieces_locations(self, color):
+        """
+        Returns a list of locations (row, col) of all pieces of the specified color, by scanning the full grid.
+
+        Parameters:
+        - color (str): The color of the pieces to search for.
+
+        Returns:
+        - list: A list of tuples representing the locations of the pieces.
+        """
+        locations = []
+        for row in self.hexboard:
+            for hexagon in row:
+                if hexagon is not None:
+                    if hexagon.piece is not None:
+                        if hexagon.piece.color == color:
+                            locations.append((hexagon.row, hexagon.col))
+        return locations
+
+    def get_king_location(self, color):
+        """
+        Returns the location of the king of the specified color, by scanning the full grid.
+
+        Parameters:
+        - color (str): The color of the king ('white' or 'black').
+
+        Returns:
+        - tuple: A tuple containing the row and column coordinates of the king's location.
+        """
+        for row in self.hexboard:
+            for hexagon in row:
+                if hexagon is not None:
+                    if hexagon.piece is not None:
+                        if hexagon.piece.color == color and isinstance(hexagon.piece, King):
+                            return (hexagon.row, hexagon.col)
+
+    def get_pseudo_legal_moves(self, color):
+        """
+        Returns a list of pseudo-legal moves for the specified color, using the reference generator.
+
+        Parameters:
+        - color (str): The color of the pieces to consider.
+
+        Returns:
+        - list: A list of pseudo-legal moves for the specified color.
+        """
+        legal_moves = []
+        for location in self.get_pieces_locations(color):
+            row, col = location
+            legal_moves += reference_piece_moves(self.get_piece(row, col), row, col, self)
+        return legal_moves
+
+    def get_legal_moves(self, color):
+        """
+        Returns a list of legal moves for the specified color, by playing every pseudo-legal move and testing in_check.
+
+        Parameters:
+        - color (str): The color of the player whose legal moves are to be determined.
+
+        Returns:
+        - list: A list of legal moves for the specified color.
+        """
+        legal_moves = []
+        for move in self.get_pseudo_legal_moves(color):
+            self.move_piece(move)
+            if not self.in_check(color):
+                legal_moves.append(move)
+            self.undo_move(move)
+        return legal_moves
+
+    def move_piece(self, move, final=False):
+        """
+        Moves a chess piece on the grid, without any incremental state.
+
+        Args:
+            move (Move): The move to make.
+            final (bool, optional): Indicates if this is the final move of the piece. Defaults to False.
+        """
+        piece = move.piece
+        initial_row, initial_col = move.initial
+        target_row, target_col = move.target
+
+        self.hexboard[initial_row][initial_col].piece = None
+        self.hexboard[target_row][target_col].piece = piece
+
+        if piece.name == 'p' or piece.name == 'P':
+            if final:
+                piece.has_moved = True
+            if move.target in PAWN_PROMOTION_HEXAGONS:
+                self.hexboard[target_row][target_col].piece = Queen(piece.color)
+                self.hexboard[target_row][target_col].piece.index = piece.index
+            piece.total_moves += 1
+
+    def undo_move(self, move):
+        """
+        Undoes a move on the grid, without any incremental state.
+
+        Args:
+            move (Move): The move to be undone.
+        """
+        piece = move.piece
+        initial_row, initial_col = move.initial
+        target_row, target_col = move.target
+
+        self.hexboard[initial_row][initial_col].piece = piece
+        self.hexboard[target_row][target_col].piece = move.enemy_piece
+
+        if piece.name == 'p' or piece.name == 'P':
+            piece.total_moves -= 1
+            if piece.total_moves == 0:
+                piece.has_moved = False
+
+    def in_check(self, color):
+        """
+        Checks if the specified color is in check by generating every move of the opponent.
+
+        Args:
+            color (str): The color of the player to check for check.
+
+        Returns:
+            bool: True if the specified color is in check, False otherwise.
+        """
+        king_location = self.get_king_location(color)
+
+        opponent_color = 'black' if color == 'white' else 'white'
+        for location in self.get_pieces_locations(opponent_color):
+            piece = self.get_piece(*location)
+            for move in reference_piece_moves(piece, *location, self):
+                if move.target == king_location:
+                    return True
+        return False
+
+    def iter_legal_moves(self, color):
+        """
+        Yields the legal moves for the specified color, from the full list of legal moves.
+
+        Parameters:
+        - color (str): The color of the player whose legal moves are to be determined.
+
+        Yields:
+        - Move: The legal moves for the specified color.
+        """
+        yield from self.get_legal_moves(color)
+
+    def has_legal_move(self, color):
+        """
+        Checks if the specified color has a legal move, by generating all of them.
+
+        Parameters:
+        - color (str): The color of the player to move.
+
+        Returns:
+        - bool: True if the color has at least one legal move, False otherwise.
+        """
+        return bool(self.get_legal_moves(color))
+
+    def get_capture_moves(self, color):
+        """
+        Returns the legal captures and promotions of the specified color, by filtering the full list of legal moves.
+
+        Parameters:
+        - color (str): The color of the player to move.
+
+        Returns:
+        - list: The legal captures and promotions.
+        """
+        return [move for move in self.get_legal_moves(color) if move.code & CAPTURE_OR_PROMOTION_MASK]
+
+    def get_evasion_moves(self, color):
+        """
+        Returns the legal moves of the specified color if its king is in check.
+
+        Parameters:
+        - color (str): The color of the player to move.
+
+        Returns:
+        - list or None: The legal moves, or None if the color is not in check.
+        """
+        if not self.in_check(color):
+            return None
+        return self.get_legal_moves(color)
+
+    def is_game_over(self, color):
+        """
+        Checks if the game is over for the specified color, with full move lists and no position cache.
+
+        Args:
+            color (str): The color of the player to check for game over. Can be 'white' or 'black'.
+
+        Returns:
+            tuple: (True, 'black') if white is checkmated, (True, 'white') if black is checkmated, (True, 'remise') if
+                   the color has no legal move, and (False, "") otherwise.
+        """
+        if self.in_check('white') and len(self.get_legal_moves('white')) == 0:
+            return (True, 'black')
+        if self.in_check('black') and len(self.get_legal_moves('black')) == 0:
+            return (True, 'white')
+        if len(self.get_legal_moves(color)) == 0:
+            return (True, 'remise')
+        return (False, "")
@@ -0,0 +1,532 @@
+"""
+Iterative deepening alpha-beta search with a wall-clock time budget.
+
+The search is a negamax over the legal moves: every score is from the point of view of the side to move, and the
+white relative static scores of Evaluate are negated for black. Checkmates score MATE_SCORE minus the number of plies
+to the mate, so a faster mate scores higher. The search finds the end of the game itself, from the moves it generates,
+so the leaves only pay for the static score. At the leaves a quiescence search plays out the captures and promotions,
+so a position is not scored in the middle of an exchange.
+
+The search is a principal variation search: the first move of a node is searched with the full window, and the other
+moves with a null window that only tells whether they beat it, re-searched with the full window when they do. Every
+iteration after the first searches the root with an aspiration window around the score of the last iteration, widened
+on the failing side until the score falls inside it.
+
+The search can be selective: null move pruning, late move reductions, and futility and reverse futility pruning
+search the moves that are unlikely to matter less deeply, or not at all, see _negamax. With a TranspositionTable the results are stored by position, and mate scores
+are stored relative to the position rather than to the root.
+"""
+import time
+from collections import namedtuple
+
+from Evaluate import static_score, pawn_structure_score
+from Zobrist import BLACK_TO_MOVE_KEY
+from TranspositionTable import EXACT, LOWER, UPPER
+from MoveOrdering import MoveOrderer, mvv_lva_score
+from Move import CAPTURED_SHIFT, TYPE_MASK, PROMOTION_FLAG
+
+MATE_SCORE = 100000
+# The deepest ply of any node, main or quiescence search, so every mate score is within MAX_SEARCH_DEPTH of MATE_SCORE
+MAX_SEARCH_DEPTH = 64
+# The clock is read once every TIME_CHECK_INTERVAL nodes, a power of two
+TIME_CHECK_INTERVAL = 64
+# The deepest ply of the quiescence search, after which the position is scored as it is. It may not exceed
+# MAX_SEARCH_DEPTH, which the mate score thresholds are based on
+MAX_QUIESCENCE_PLY = MAX_SEARCH_DEPTH
+
+# The material a capture wins by captured PIECE_TYPES number, and a promotion, in Evaluate's piece values
+CAPTURE_GAINS = (0, 10, 30, 30, 50, 90, 1000)
+PROMOTION_GAIN = 90 - 10
+# A capture is skipped in the quiescence search when even winning its material and this margin cannot raise alpha
+DELTA_MARGIN = 20
+# The half width of the first aspiration window, in Evaluate's piece values, multiplied by ASPIRATION_GROWTH per fail
+ASPIRATION_WINDOW = 25
+ASPIRATION_GROWTH = 4
+
+# Null move pruning: the depth reduction of the null move search, and the least depth it is tried at
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_MIN_DEPTH = 3
+# Late move reductions: the moves before LATE_MOVE_INDEX and the nodes below LATE_MOVE_MIN_DEPTH are not reduced,
+# the moves from LATE_MOVE_DEEP_INDEX on are reduced by two plies instead of one
+LATE_MOVE_INDEX = 3
+LATE_MOVE_DEEP_INDEX = 8
+LATE_MOVE_MIN_DEPTH = 3
+# Futility pruning: the margins by remaining depth, in Evaluate's piece values, for the depths up to FUTILITY_DEPTH
+FUTILITY_MARGINS = (0, 40, 90)
+FUTILITY_DEPTH = 2
+
+SearchResult = namedtuple('SearchResult', ['move', 'score', 'depth', 'nodes', 'elapsed_time', 'quiescence_nodes'])
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget runs out, to unwind it.
+    """
+
+def opponent(color):
+    return 'black' if color == 'white' else 'white'
+
+def score_to_table(score, ply):
+    """
+    Converts a mate score from the distance to the root to the distance to the position, for storing.
+    """
+    if score >= MATE_SCORE - MAX_SEARCH_DEPTH:
+        return score + ply
+    if score <= -(MATE_SCORE - MAX_SEARCH_DEPTH):
+        return score - ply
+    return score
+
+def score_from_table(score, ply):
+    """
+    Converts a stored mate score back to the distance to the root, see score_to_table.
+    """
+    if score >= MATE_SCORE - MAX_SEARCH_DEPTH:
+        return score - ply
+    if score <= -(MATE_SCORE - MAX_SEARCH_DEPTH):
+        return score + ply
+    return score
+
+class Search():
+    """
+    Searches the best move of a position with iterative deepening.
+
+    Every iteration searches one ply deeper than the last, starting with the best move of the last iteration.
+    When the time runs out the unfinished iteration is abandoned, and the best move of the deepest finished iteration
+    is returned. If not even the first iteration finished, the best move found so far in it is returned.
+
+    Attributes:
+        hexboard (HexBoard): The board to search on, left unchanged.
+        table (TranspositionTable): The transposition table, or None.
+        orderer (MoveOrderer): The move ordering of the search, or None to search the moves in generation order.
+        quiescence (bool): Whether the leaves are scored with the quiescence search.
+        pvs (bool): Whether the moves after the first are searched with a null window.
+        aspiration (bool): Whether the iterations after the first search the root with an aspiration window.
+        null_move (bool): Whether null move pruning is used.
+        reductions (bool): Whether late quiet moves are searched with a reduced depth.
+        futility (bool): Whether futility and reverse futility pruning are used near the leaves.
+        pawn_table (PawnHashTable): The cache of pawn structure scores, or None to score the leaves without the pawn
+                                    structure.
+        nodes (int): The number of nodes searched by the main search.
+        quiescence_nodes (int): The number of nodes searched by the quiescence search.
+        null_window_searches (int): The number of null window searches of the principal variation search.
+        researches (int): The number of those that beat the null window and were searched again.
+        aspiration_researches (int): The number of root searches repeated because the score fell outside the
+                                     aspiration window.
+        null_move_cutoffs (int): The number of nodes cut off by a null move search.
+        reduced_searches (int): The number of late moves searched with a reduced depth.
+        reduction_researches (int): The number of those that beat alpha and were searched again to the full depth.
+        futility_prunes (int): The number of nodes and moves cut off by futility and reverse futility pruning.
+        deadline (float): The time.perf_counter() time to stop at, or None for no time limit.
+    """
+
+    def __init__(self, hexboard, table=None, ordering=True, quiescence=True, pvs=True, aspiration=True,
+                 null_move=True, reductions=True, futility=True, pawn_table=None, orderer=None):
+        """
+        Initializes a search on a board.
+
+        Args:
+            hexboard (HexBoard): The board to search on, HexBoard or BitBoard.
+            table (TranspositionTable): The transposition table to use, kept between searches by the caller
+                                        (default: None).
+            ordering (bool): Whether to order the moves with a MoveOrderer (default: True).
+            quiescence (bool): Whether to score the leaves with the quiescence search (default: True).
+            pvs (bool): Whether to search the moves after the first with a null window (default: True).
+            aspiration (bool): Whether to search the root with aspiration windows (default: True).
+            null_move (bool): Whether to use null move pruning (default: True).
+            reductions (bool): Whether to use late move reductions (default: True).
+            futility (bool): Whether to use futility and reverse futility pruning (default: True).
+            pawn_table (PawnHashTable): The pawn hash table to add the pawn structure to the static scores with, kept
+                                        between searches by the caller (default: None).
+            orderer (MoveOrderer): The move ordering to use when ordering is set, kept between searches by the caller
+                                   so its killers and history carry over, or None for a new one (default: None).
+        """
+        self.hexboard = hexboard
+        self.table = table
+        if ordering:
+            self.orderer = orderer if orderer is not None else MoveOrderer()
+        else:
+            self.orderer = None
+        self.quiescence = quiescence
+        self.pvs = pvs
+        self.aspiration = aspiration
+        self.null_move = null_move
+        self.reductions = reductions
+        self.futility = futility
+        self.pawn_table = pawn_table
+        self._reset_counters()
+        self.deadline = None
+
+    def _reset_counters(self):
+        """
+        Sets the node and pruning counters to zero.
+        """
+        self.nodes = 0
+        self.quiescence_nodes = 0
+        self.null_window_searches = 0
+        self.researches = 0
+        self.aspiration_researches = 0
+        self.null_move_cutoffs = 0
+        self.reduced_searches = 0
+        self.reduction_researches = 0
+        self.futility_prunes = 0
+
+    def _key(self, color):
+        """
+        Returns the transposition table key of the position with color to move.
+        """
+        key = self.hexboard.position_key()
+        return key ^ BLACK_TO_MOVE_KEY if color == 'black' else key
+
+    def iterative_deepening(self, color, time_ms=None, max_depth=MAX_SEARCH_DEPTH):
+        """
+        Searches successive depths until max_depth is searched or the time runs out.
+
+        Args:
+            color (str): The color to move.
+            time_ms (float): The time budget in milliseconds, None for no limit (default: None).
+            max_depth (int): The deepest depth to search, in plies, at most MAX_SEARCH_DEPTH (default: MAX_SEARCH_DEPTH).
+
+        Returns:
+            SearchResult: The best move (None without legal moves), its score for color, the deepest finished depth,
+                          the number of nodes, the elapsed time in seconds and the number of quiescence nodes.
+        """
+        max_depth = min(max_depth, MAX_SEARCH_DEPTH)
+        start_time = time.perf_counter()
+        self._reset_counters()
+        self.deadline = start_time + time_ms / 1000 if time_ms is not None else None
+        if self.table is not None:
+            self.table.new_search()
+        if self.orderer is not None:
+            self.orderer.new_search()
+
+        moves = self.hexboard.get_legal_moves(color)
+        if not moves:
+            score = -MATE_SCORE if self.hexboard.in_check(color) else 0
+            return SearchResult(None, score, 0, 0, time.perf_counter() - start_time, 0)
+
+        if self.orderer is not None:
+            self.orderer.order(moves, 0, color)
+        best_move, best_score, finished_depth = moves[0], None, 0
+        for depth in range(1, max_depth + 1):
+            try:
+                move, score = self._search_aspiration(moves, color, depth, best_score)
+            except SearchTimeout as timeout:
+                if finished_depth == 0 and timeout.args:
+                    best_move, best_score = timeout.args
+                break
+            best_move, best_score, finished_depth = move, score, depth
+            # Search the best move first in the next iteration
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(score) >= MATE_SCORE - depth:
+                break
+
+        return SearchResult(best_move, best_score, finished_depth, self.nodes, time.perf_counter() - start_time,
+                            self.quiescence_nodes)
+
+    def _search_aspiration(self, moves, color, depth, previous_score):
+        """
+        Searches the root to a depth, within an aspiration window around the score of the last iteration if there is
+        one. A window the score falls outside of is widened on that side and the root is searched again.
+
+        Returns:
+            tuple: The best move and its exact score.
+
+        Raises:
+            SearchTimeout: If the time runs out, see _search_root.
+        """
+        if not self.aspiration or previous_score is None or abs(previous_score) >= MATE_SCORE - MAX_SEARCH_DEPTH:
+            return self._search_root(moves, color, depth, -MATE_SCORE - 1, MATE_SCORE + 1)
+
+        window = ASPIRATION_WINDOW
+        alpha, beta = previous_score - window, previous_score + window
+        while True:
+            move, score = self._search_root(moves, color, depth, alpha, beta)
+            if alpha < score < beta:
+                return move, score
+            self.aspiration_researches += 1
+            window *= ASPIRATION_GROWTH
+            if score <= alpha:
+                alpha = max(score - window, -MATE_SCORE - 1)
+            else:
+                beta = min(score + window, MATE_SCORE + 1)
+
+    def _search_root(self, moves, color, depth, alpha, beta):
+        """
+        Searches every root move to a depth within a window.
+
+        Returns:
+            tuple: The best move and its fail-soft score.
+
+        Raises:
+            SearchTimeout: If the time runs out, with the best move and score so far as arguments if any.
+        """
+        hexboard = self.hexboard
+        best_move, best_score = None, -MATE_SCORE - 1
+        next_color = opponent(color)
+        for move in moves:
+            hexboard.move_piece(move)
+            try:
+                score = self._search_move(next_color, depth - 1, alpha, beta, 1, best_move is None)
+            except SearchTimeout:
+                raise SearchTimeout(best_move, best_score) if best_move is not None else SearchTimeout()
+            finally:
+                hexboard.undo_move(move)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_move, best_score
+
+    def _search_move(self, color, depth, alpha, beta, ply, first, reduction=0):
+        """
+        Returns the score of a move for the color that played it, searched with _negamax from the position after it.
+        The first move of a node is searched with the full window. The other moves are searched with a null window
+        around alpha, and again with the full window if they beat it. A reduced move is first searched with a null
+        window to the reduced depth, and only searched as usual if it beats alpha there.
+
+        Args:
+            color (str): The color to move after the move.
+            depth (int): The remaining depth in plies after the move.
+            alpha (int): The lower bound of the window, for the color that played the move.
+            beta (int): The upper bound of the window, for the color that played the move.
+            ply (int): The distance to the root in plies after the move.
+            first (bool): Whether the move is the first move searched in its node.
+            reduction (int): The number of plies to reduce the first search of the move by (default: 0).
+
+        Raises:
+            SearchTimeout: If the time runs out.
+        """
+        if reduction:
+            self.reduced_searches += 1
+            score = -self._negamax(color, depth - reduction, -alpha - 1, -alpha, ply)
+            if score <= alpha:
+                return score
+            self.reduction_researches += 1
+        if first or not self.pvs or beta - alpha <= 1:
+            return -self._negamax(color, depth, -beta, -alpha, ply)
+        self.null_window_searches += 1
+        score = -self._negamax(color, depth, -alpha - 1, -alpha, ply)
+        if alpha < score < beta:
+            self.researches += 1
+            score = -self._negamax(color, depth, -beta, -alpha, ply)
+        return score
+
+    def _negamax(self, color, depth, alpha, beta, ply, null_allowed=True):
+        """
+        Returns the score of the position for the color to move, searched with alpha-beta pruning to a depth.
+        The score is fail-soft: below alpha it is an upper bound, above beta a lower bound.
+
+        Outside the principal variation (null window nodes) and out of check, the search is selective:
+        - Reverse futility pruning: near the leaves a position whose static score beats beta by a margin per ply
+          returns the static score.
+        - Null move pruning: the color passes, and if the opponent cannot get below beta in a search reduced by
+          NULL_MOVE_REDUCTION, the position fails high. There is no null move right after a null move, or for a color
+          with only its king and pawns, where passing may be better than any move (zugzwang).
+        - Futility pruning: near the leaves, if the static score plus a margin cannot reach alpha, the quiet moves
+          that do not give check are skipped.
+        - Late move reductions: the quiet moves that do not give check late in the move order are searched less deep
+          first, see _search_move.
+
+        Args:
+            color (str): The color to move.
+            depth (int): The remaining depth in plies.
+            alpha (int): The lower bound of the window.
+            beta (int): The upper bound of the window.
+            ply (int): The distance to the root in plies.
+            null_allowed (bool): Whether the color may pass, False right after a null move (default: True).
+
+        Raises:
+            SearchTimeout: If the time runs out.
+        """
+        self.nodes += 1
+        if self.deadline is not None and not self.nodes & (TIME_CHECK_INTERVAL - 1) \
+                and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+
+        hexboard = self.hexboard
+        table = self.table
+        table_move = None
+        if table is not None:
+            key = self._key(color)
+            entry = table.probe(key)
+            if entry is not None:
+                table_move = entry[4]
+                if entry[1] >= depth:
+                    score = score_from_table(entry[2], ply)
+                    bound = entry[3]
+                    if bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha):
+                        table.cutoffs += 1
+                        return score
+
+        if depth == 0:
+            if not self.quiescence:
+                if hexboard.has_legal_move(color):
+                    score = self._evaluate(color)
+                else:
+                    score = -(MATE_SCORE - ply) if hexboard.in_check(color) else 0
+                bound = EXACT
+            else:
+                score = self._quiesce(color, alpha, beta, ply)
+                bound = LOWER if score >= beta else UPPER if score <= alpha else EXACT
+            if table is not None:
+                table.store(key, 0, score_to_table(score, ply), bound, None)
+            return score
+
+        moves = hexboard.get_legal_moves(color)
+        if not moves:
+            return -(MATE_SCORE - ply) if hexboard.in_check(color) else 0
+        next_color = opponent(color)
+
+        static = None
+        if beta - alpha == 1 and abs(beta) < MATE_SCORE - MAX_SEARCH_DEPTH and not hexboard.in_check(color):
+            static = self._evaluate(color)
+        if static is not None:
+            if self.futility and depth <= FUTILITY_DEPTH and static - FUTILITY_MARGINS[depth] >= beta:
+                self.futility_prunes += 1
+                return static
+            if self.null_move and null_allowed and depth >= NULL_MOVE_MIN_DEPTH and static >= beta \
+                    and self._has_pieces(color):
+                # The board is not changed for the null move: the search takes the color to move as an argument, and
+                # the board caches and the table keys follow that color
+                score = -self._negamax(next_color, depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + 1, ply + 1, False)
+                if score >= beta:
+                    self.null_move_cutoffs += 1
+                    return beta if score >= MATE_SCORE - MAX_SEARCH_DEPTH else score
+        futility_score = None
+        if self.futility and static is not None and depth <= FUTILITY_DEPTH \
+                and static + FUTILITY_MARGINS[depth] <= alpha:
+            futility_score = static + FUTILITY_MARGINS[depth]
+        reduce = self.reductions and static is not None and depth >= LATE_MOVE_MIN_DEPTH
+
+        orderer = self.orderer
+        if orderer is not None:
+            orderer.order(moves, ply, color, table_move)
+        elif table_move is not None:
+            for index, move in enumerate(moves):
+                if move.code == table_move:
+                    moves[0], moves[index] = move, moves[0]
+                    break
+
+        original_alpha = alpha
+        best_score = -MATE_SCORE - 1
+        best_move = None
+        killers = orderer.killers[ply] if orderer is not None else ()
+        for index, move in enumerate(moves):
+            quiet = (futility_score is not None or reduce and index >= LATE_MOVE_INDEX) \
+                and not mvv_lva_score(move.code) and move.code not in killers
+            hexboard.move_piece(move)
+            try:
+                if quiet and hexboard.in_check(next_color):
+                    quiet = False
+                if quiet and futility_score is not None:
+                    self.futility_prunes += 1
+                    if futility_score > best_score:
+                        best_score = futility_score
+                    continue
+                reduction = 0
+                if quiet and reduce and index >= LATE_MOVE_INDEX:
+                    reduction = 2 if index >= LATE_MOVE_DEEP_INDEX and depth > 3 else 1
+                score = self._search_move(next_color, depth - 1, alpha, beta, ply + 1, best_move is None, reduction)
+            finally:
+                hexboard.undo_move(move)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if orderer is not None:
+                            orderer.record_cutoff(move, ply, color, depth)
+                        break
+
+        if table is not None:
+            if best_score >= beta:
+                bound = LOWER
+            elif best_score <= original_alpha:
+                bound = UPPER
+            else:
+                bound = EXACT
+            table.store(key, depth, score_to_table(best_score, ply), bound,
+                        best_move.code if best_move is not None else None)
+        return best_score
+
+    def _quiesce(self, color, alpha, beta, ply):
+        """
+        Returns the score of the position for the color to move once the captures and promotions are played out.
+
+        The color can stand pat on the static score instead of capturing. Captures that cannot raise alpha even with
+        DELTA_MARGIN are skipped (delta pruning). In check there is no standing pat and every evasion is searched.
+        The score is fail-soft, as in _negamax.
+
+        Raises:
+            SearchTimeout: If the time runs out.
+        """
+        self.quiescence_nodes += 1
+        if self.deadline is not None and not self.quiescence_nodes & (TIME_CHECK_INTERVAL - 1) \
+                and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+
+        hexboard = self.hexboard
+        if ply >= MAX_QUIESCENCE_PLY:
+            return self._evaluate(color)
+
+        if hexboard.in_check(color):
+            moves = hexboard.get_legal_moves(color)
+            if not moves:
+                return -(MATE_SCORE - ply)
+            stand_pat = None
+            best_score = -MATE_SCORE - 1
+        else:
+            stand_pat = self._evaluate(color)
+            if stand_pat >= beta:
+                return stand_pat
+            if stand_pat > alpha:
+                alpha = stand_pat
+            best_score = stand_pat
+            moves = hexboard.get_capture_moves(color)
+        moves.sort(key=lambda move: mvv_lva_score(move.code), reverse=True)
+
+        next_color = opponent(color)
+        for move in moves:
+            if stand_pat is not None:
+                code = move.code
+                gain = CAPTURE_GAINS[code >> CAPTURED_SHIFT & TYPE_MASK]
+                if code & PROMOTION_FLAG:
+                    gain += PROMOTION_GAIN
+                if stand_pat + gain + DELTA_MARGIN <= alpha:
+                    continue
+            hexboard.move_piece(move)
+            try:
+                score = -self._quiesce(next_color, -beta, -alpha, ply + 1)
+            finally:
+                hexboard.undo_move(move)
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
+
+    def _has_pieces(self, color):
+        """
+        Returns whether a color has a piece other than its king and pawns.
+        """
+        hexboard = self.hexboard
+        for row, col in hexboard.get_pieces_locations(color):
+            if hexboard.get_piece(row, col).name.lower() not in ('k', 'p'):
+                return True
+        return False
+
+    def _evaluate(self, color):
+        """
+        Returns the static score of the position for the color to move, with the pawn structure if the search has
+        a pawn table.
+        """
+        score = static_score(self.hexboard)
+        if self.pawn_table is not None:
+            score += pawn_structure_score(self.hexboard, self.pawn_table)
+        return score if color == 'white' else -score
@@ -0,0 +1,132 @@
+"""
+Move tables for every hexagon in POSITIONS, built once at import.
+
+Every table is indexed by the POS_IDX index of the origin hexagon and holds POS_IDX indices of the
+target hexagons, so move generation never has to do coordinate arithmetic or bounds checks.
+
+Tables:
+- ROOK_RAYS, BISHOP_RAYS, QUEEN_RAYS: For each hexagon, a tuple of rays (one per direction that leaves
+  the hexagon), each ray being the ordered tuple of hexagons walked away from the origin.
+- KNIGHT_LEAPS, KING_STEPS: For each hexagon, the tuple of hexagons one leap or step away.
+- PAWN_PUSHES: Per color, for each hexagon a (single, double) tuple of push targets, None if off the board.
+- PAWN_CAPTURES: Per color, for each hexagon the tuple of capture targets.
+- TARGET_ORDER: Per piece type number of the knight and the sliders (see Move.PIECE_TYPES), for each hexagon a dict
+  from every hexagon the piece could move to on an empty board to its position in the piece's generation order.
+- BETWEEN: For each hexagon, a dict from every hexagon on one of its queen lines to the tuple of hexagons in between.
+"""
+from CONST import *
+
+def _target(index, direction, distance=1):
+    """
+    Returns the index of the hexagon reached from a hexagon by moving in a direction.
+
+    Args:
+        index (int): The index of the origin hexagon.
+        direction (tuple): The (row, col) step.
+        distance (int): The number of steps to take (default: 1).
+
+    Returns:
+        int or None: The index of the target hexagon, or None if it is not on the board.
+    """
+    row, col = POSITIONS[index]
+    return POS_IDX.get((row + distance * direction[0], col + distance * direction[1]))
+
+def _build_rays(directions):
+    """
+    Builds the slider rays for every hexagon.
+
+    Args:
+        directions (list): The (row, col) steps of the slider.
+
+    Returns:
+        tuple: For each hexagon, a tuple of non-empty rays in the order of the directions.
+    """
+    rays = []
+    for index in range(len(POSITIONS)):
+        hexagon_rays = []
+        for direction in directions:
+            ray = []
+            target = _target(index, direction)
+            while target is not None:
+                ray.append(target)
+                target = _target(target, direction)
+            if ray:
+                hexagon_rays.append(tuple(ray))
+        rays.append(tuple(hexagon_rays))
+    return tuple(rays)
+
+def _build_leaps(directions):
+    """
+    Builds the single step targets for every hexagon.
+
+    Args:
+        directions (list): The (row, col) steps of the piece.
+
+    Returns:
+        tuple: For each hexagon, a tuple of the target indices in the order of the directions.
+    """
+    leaps = []
+    for index in range(len(POSITIONS)):
+        targets = (_target(index, direction) for direction in directions)
+        leaps.append(tuple(target for target in targets if target is not None))
+    return tuple(leaps)
+
+def _build_pawn_pushes(forward):
+    """
+    Builds the single and double push targets of a pawn for every hexagon.
+
+    Args:
+        forward (int): The row step of a single push, -2 for white and 2 for black.
+
+    Returns:
+        tuple: For each hexagon, a (single, double) tuple of target indices, None if off the board.
+    """
+    pushes = []
+    for index in range(len(POSITIONS)):
+        single = _target(index, (forward, 0))
+        double = _target(index, (forward, 0), 2) if single is not None else None
+        pushes.append((single, double))
+    return tuple(pushes)
+
+def _number_targets(targets):
+    """
+    Numbers the targets of every hexagon in generation order.
+
+    Args:
+        targets (tuple): For each hexagon, the ordered tuple of targets.
+
+    Returns:
+        tuple: For each hexagon, a dict from target index to its position.
+    """
+    return tuple({target: order for order, target in enumerate(hexagon_targets)} for hexagon_targets in targets)
+
+def _flatten_rays(rays):
+    """
+    Joins the rays of every hexagon into one tuple of targets, in ray order.
+    """
+    return tuple(tuple(target for ray in hexagon_rays for target in ray) for hexagon_rays in rays)
+
+ROOK_RAYS = _build_rays(ROOK_DIRECTIONS)
+BISHOP_RAYS = _build_rays(BISHOP_DIRECTIONS)
+QUEEN_RAYS = _build_rays(QUEEN_DIRECTIONS)
+KNIGHT_LEAPS = _build_leaps(KNIGHT_DIRECTIONS)
+KING_STEPS = _build_leaps(KING_DIRECTIONS)
+
+PAWN_PUSHES = {
+    'white': _build_pawn_pushes(-2),
+    'black': _build_pawn_pushes(2)
+}
+
+PAWN_CAPTURES = {
+    'white': _build_leaps([(-1, -1), (-1, 1)]),
+    'black': _build_leaps([(1, 1), (1, -1)])
+}
+
+TARGET_ORDER = {
+    2: _number_targets(KNIGHT_LEAPS),
+    3: _number_targets(_flatten_rays(BISHOP_RAYS)),
+    4: _number_targets(_flatten_rays(ROOK_RAYS)),
+    5: _number_targets(_flatten_rays(QUEEN_RAYS))
+}
+
+BETWEEN = tuple({target: ray[:distance] for ray in rays for distance, target in enumerate(ray)} for rays in QUEEN_RAYS)
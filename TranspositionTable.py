@@ -0,0 +1,146 @@
+"""
+Transposition table for the search, with a memory cap and a replacement policy.
+
+An entry is a (key, depth, score, bound, move code, age) tuple. The bound tells how the score relates to the true
+score of the position: EXACT, LOWER (the search failed high, the score is at least this) or UPPER (the search failed
+low, the score is at most this).
+"""
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Bytes per slot: the tuple with its ints, measured with tracemalloc, and the pointer in the slot list
+ENTRY_BYTES = 160
+
+REPLACEMENT_POLICIES = ('depth', 'always')
+
+class TranspositionTable():
+    """
+    A hash table of search results by position key, with buckets of slots.
+
+    With the 'depth' policy a bucket has two slots: a depth-preferred slot that keeps the deepest result of the current
+    search, and an always-replace slot for everything else. With the 'always' policy a bucket has one slot, which is
+    always replaced. Entries of an older search, see new_search, are replaced regardless of their depth.
+
+    Attributes:
+        policy (str): The replacement policy, 'depth' or 'always'.
+        bucket_size (int): The number of slots per bucket.
+        mask (int): The bucket count minus one, the bucket count is a power of two.
+        slots (list): The entries, None for empty slots.
+        age (int): The number of the current search.
+        filled (int): The number of used slots.
+        probes, hits, cutoffs, stores (int): The counters of probe, found entries, cutoffs and store calls.
+    """
+
+    def __init__(self, size_mb=16, policy='depth'):
+        """
+        Creates an empty table.
+
+        Args:
+            size_mb (float): The memory cap in megabytes (default: 16).
+            policy (str): The replacement policy, 'depth' or 'always' (default: 'depth').
+
+        Raises:
+            ValueError: If the policy is unknown.
+        """
+        if policy not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        self.policy = policy
+        self.bucket_size = 2 if policy == 'depth' else 1
+        buckets = 1
+        while buckets * 2 * self.bucket_size * ENTRY_BYTES <= size_mb * 2 ** 20:
+            buckets *= 2
+        self.mask = buckets - 1
+        self.slots = [None] * (buckets * self.bucket_size)
+        self.age = 0
+        self.filled = 0
+        self.probes = 0
+        self.hits = 0
+        self.cutoffs = 0
+        self.stores = 0
+
+    def new_search(self):
+        """
+        Starts a new search, which makes the entries of the previous searches replaceable.
+        """
+        self.age += 1
+
+    def probe(self, key):
+        """
+        Returns the entry of a position.
+
+        Args:
+            key (int): The 64-bit key of the position.
+
+        Returns:
+            tuple or None: The (key, depth, score, bound, move code, age) entry, or None if there is none.
+        """
+        self.probes += 1
+        index = (key & self.mask) * self.bucket_size
+        slots = self.slots
+        for slot in range(index, index + self.bucket_size):
+            entry = slots[slot]
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry
+        return None
+
+    def store(self, key, depth, score, bound, move_code):
+        """
+        Stores a search result according to the replacement policy.
+
+        Args:
+            key (int): The 64-bit key of the position.
+            depth (int): The depth the position was searched to.
+            score (int): The score for the color to move.
+            bound (int): EXACT, LOWER or UPPER.
+            move_code (int): The code of the best move, None if there is none.
+        """
+        self.stores += 1
+        entry = (key, depth, score, bound, move_code, self.age)
+        slots = self.slots
+        index = (key & self.mask) * self.bucket_size
+        if self.bucket_size == 2:
+            kept = slots[index]
+            if kept is not None and kept[0] != key and kept[5] == self.age and kept[1] > depth:
+                # The depth-preferred slot keeps a deeper result of this search
+                index += 1
+            elif kept is not None and kept[0] != key:
+                # Move the replaced result to the always-replace slot
+                if slots[index + 1] is None:
+                    self.filled += 1
+                slots[index + 1] = kept
+            elif kept is None and slots[index + 1] is not None and slots[index + 1][0] == key:
+                slots[index + 1] = None
+                self.filled -= 1
+        if slots[index] is None:
+            self.filled += 1
+        slots[index] = entry
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters.
+        """
+        self.slots = [None] * len(self.slots)
+        self.age = 0
+        self.filled = 0
+        self.probes = 0
+        self.hits = 0
+        self.cutoffs = 0
+        self.stores = 0
+
+    def stats(self):
+        """
+        Returns the counters of the table.
+
+        Returns:
+            dict: The probes, hits, hit rate, cutoffs, stores, and the fill level as a fraction of the slots.
+        """
+        return {
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+            'cutoffs': self.cutoffs,
+            'stores': self.stores,
+            'fill': self.filled / len(self.slots)
+        }
@@ -0,0 +1,80 @@
+"""
+Zobrist keys for hashing hexagonal chess positions.
+
+A position key is the XOR of one random 64-bit key per piece on the board (by piece name, which encodes type and
+color, and POS_IDX index), a key per pawn that still has its first move, and a key when black is to move.
+A pawn key is the XOR of the piece keys of the pawns only, for the pawn hash table of the evaluation.
+The keys are drawn from a fixed seed, so position keys are the same in every process.
+"""
+import random
+
+from CONST import *
+
+ZOBRIST_SEED = 2024
+
+_random = random.Random(ZOBRIST_SEED)
+
+PIECE_KEYS = {
+    name: tuple(_random.getrandbits(64) for _ in POSITIONS)
+    for name in ('p', 'n', 'b', 'r', 'q', 'k', 'P', 'N', 'B', 'R', 'Q', 'K')
+}
+FIRST_MOVE_KEYS = tuple(_random.getrandbits(64) for _ in POSITIONS)
+BLACK_TO_MOVE_KEY = _random.getrandbits(64)
+
+# Key tuples by (piece name, first_move), so the key of a piece is KEY_TABLES[piece.name, piece.first_move][index]
+KEY_TABLES = {}
+for _name, _keys in PIECE_KEYS.items():
+    KEY_TABLES[_name, False] = _keys
+    if _name == 'p' or _name == 'P':
+        KEY_TABLES[_name, True] = tuple(key ^ first_move_key for key, first_move_key in zip(_keys, FIRST_MOVE_KEYS))
+    else:
+        KEY_TABLES[_name, True] = _keys
+
+# The piece keys of the pawns by name, without the first move keys, as the pawn structure does not depend on them
+PAWN_KEYS = {'p': PIECE_KEYS['p'], 'P': PIECE_KEYS['P']}
+
+def piece_key(piece, index):
+    """
+    Returns the key of a piece on a hexagon.
+
+    Args:
+        piece (Piece): The piece.
+        index (int): The POS_IDX index of the hexagon.
+
+    Returns:
+        int: The 64-bit key.
+    """
+    return KEY_TABLES[piece.name, piece.first_move][index]
+
+def compute_key(cells, side_to_move):
+    """
+    Computes the key of a position from scratch.
+
+    Args:
+        cells (list): The Hex objects of the board, indexed by POS_IDX.
+        side_to_move (str): The color to move.
+
+    Returns:
+        int: The 64-bit position key.
+    """
+    key = BLACK_TO_MOVE_KEY if side_to_move == 'black' else 0
+    for index, hexagon in enumerate(cells):
+        if hexagon.piece is not None:
+            key ^= piece_key(hexagon.piece, index)
+    return key
+
+def compute_pawn_key(squares):
+    """
+    Computes the pawn key of a position from scratch.
+
+    Args:
+        squares (list): The pieces on the board indexed by POS_IDX, None for empty hexagons.
+
+    Returns:
+        int: The 64-bit pawn key.
+    """
+    key = 0
+    for index, piece in enumerate(squares):
+        if piece is not None and piece.name in PAWN_KEYS:
+            key ^= PAWN_KEYS[piece.name][index]
+    return key